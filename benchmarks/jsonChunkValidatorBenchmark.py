@@ -0,0 +1,92 @@
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Optional
+
+from context_logger import setup_logging
+from pydantic import BaseModel, field_validator
+
+from common_utility.fileUtility import create_file
+from common_utility.jsonChunkValidator import JsonChunkValidator
+from common_utility.jsonLoader import JsonLoader, JsonEngine
+
+ITEM_COUNT = int(os.environ.get('BENCHMARK_ITEM_COUNT', 300000))
+ROUNDS = 3
+VERSION = re.compile(r'^(\d+):?([\w.+~-]*)$')
+DEPENDENCY = re.compile(r'^([a-z0-9][a-z0-9+.-]+)(?: \((<<|<=|=|>=|>>) ([\w.:+~-]+)\))?$')
+
+
+class Package(BaseModel):
+    id: int
+    name: str
+    version: str
+    architecture: str
+    size: int
+    digest: str
+    depends: list[str] = []
+    maintainer: Optional[str] = None
+
+    @field_validator('version')
+    @classmethod
+    def validate_version(cls, version: str) -> str:
+        if not all(VERSION.match(part) for part in version.split('.')):
+            raise ValueError(f'Invalid version: {version}')
+        return version
+
+    @field_validator('depends')
+    @classmethod
+    def validate_depends(cls, depends: list[str]) -> list[str]:
+        for dependency in depends:
+            if not DEPENDENCY.match(dependency):
+                raise ValueError(f'Invalid dependency: {dependency}')
+        return depends
+
+
+def create_packages(file_path: str) -> None:
+    packages = [
+        Package(
+            id=index,
+            name=f'package-{index}',
+            version=f'{index % 7}.{index % 13}.{index % 101}',
+            architecture='arm64' if index % 2 else 'amd64',
+            size=index * 1024,
+            digest=f'{index:064x}',
+            depends=[f'package-{dependency} (>= 1.{dependency})' for dependency in range(index % 5)],
+            maintainer=f'maintainer-{index % 50}@example.com' if index % 3 else None,
+        ).model_dump()
+        for index in range(ITEM_COUNT)
+    ]
+    create_file(file_path, json.dumps(packages))
+
+
+def measure(json_loader: JsonLoader, file_path: str) -> float:
+    durations = []
+
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        json_loader.load_list(file_path, Package)
+        durations.append(time.perf_counter() - start)
+
+    return min(durations)
+
+
+def main() -> None:
+    setup_logging('python-common-utility', 'INFO', warn_on_overwrite=False)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file_path = f'{directory}/packages.json'
+        create_packages(file_path)
+
+        native = measure(JsonLoader(JsonEngine.NATIVE), file_path)
+        chunked = measure(JsonLoader(JsonEngine.NATIVE, chunk_validator=JsonChunkValidator()), file_path)
+
+        print(f'file: {os.path.getsize(file_path) / 1024 / 1024:.1f} MiB, items: {ITEM_COUNT}, cpus: {os.cpu_count()}')
+
+    print(f'native:  {native:.2f}s')
+    print(f'chunked: {chunked:.2f}s ({native / chunked:.2f}x)')
+
+
+if __name__ == '__main__':
+    main()
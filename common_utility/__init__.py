@@ -1,4 +1,16 @@
 from .fileUtility import *
+from .templateRenderer import *
 from .reusableTimer import *
+from .timerService import *
+from .debouncer import *
+from .asyncReusableTimer import *
+from .periodicTimer import *
+from .fileMonitor import *
 from .sessionProvider import *
+from .contentStore import *
+from .downloadScheduler import *
+from .downloadIndex import *
+from .downloadCache import *
+from .streamDecompressor import *
 from .fileDownloader import *
+from .asyncFileDownloader import *
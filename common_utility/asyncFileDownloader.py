@@ -0,0 +1,250 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import os
+import ssl
+from typing import Optional, AsyncIterator, Awaitable
+from urllib.parse import urlparse, urljoin
+
+from context_logger import get_logger
+
+log = get_logger('AsyncFileDownloader')
+
+
+class AsyncHttpResponse(object):
+
+    def __init__(
+        self,
+        status_code: int,
+        reason: str,
+        headers: dict[str, str],
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self.status_code = status_code
+        self.reason = reason
+        self.headers = headers
+        self._reader = reader
+        self._writer = writer
+        self._timeout = timeout
+
+    async def iter_content(self, chunk_size: int) -> AsyncIterator[bytes]:
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            async for chunk in self._iter_chunked(chunk_size):
+                yield chunk
+        elif 'content-length' in self.headers:
+            remaining = int(self.headers['content-length'])
+            while remaining > 0:
+                chunk = await self._read(self._reader.read(min(chunk_size, remaining)))
+                if not chunk:
+                    raise ConnectionError('Connection closed before end of response body')
+                remaining -= len(chunk)
+                yield chunk
+        else:
+            while chunk := await self._read(self._reader.read(chunk_size)):
+                yield chunk
+
+    async def close(self) -> None:
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except (ConnectionError, ssl.SSLError):
+            pass
+
+    async def _iter_chunked(self, chunk_size: int) -> AsyncIterator[bytes]:
+        while True:
+            size_line = await self._read(self._reader.readline())
+            remaining = int(size_line.split(b';')[0].strip(), 16)
+
+            if remaining == 0:
+                while (await self._read(self._reader.readline())).strip():
+                    pass
+                return
+
+            while remaining > 0:
+                chunk = await self._read(self._reader.read(min(chunk_size, remaining)))
+                if not chunk:
+                    raise ConnectionError('Connection closed before end of response body')
+                remaining -= len(chunk)
+                yield chunk
+
+            await self._read(self._reader.readexactly(2))
+
+    async def _read(self, read: Awaitable[bytes]) -> bytes:
+        return await asyncio.wait_for(read, self._timeout)
+
+
+class IAsyncHttpTransport(object):
+
+    async def get(self, url: str, headers: dict[str, str]) -> AsyncHttpResponse:
+        raise NotImplementedError()
+
+
+class AsyncHttpTransport(IAsyncHttpTransport):
+    REDIRECT_STATUS_CODES = (301, 302, 303, 307, 308)
+
+    def __init__(
+        self, timeout: float = 30.0, max_redirects: int = 10, ssl_context: Optional[ssl.SSLContext] = None
+    ) -> None:
+        self._timeout = timeout
+        self._max_redirects = max_redirects
+        self._ssl_context = ssl_context if ssl_context else ssl.create_default_context()
+
+    async def get(self, url: str, headers: dict[str, str]) -> AsyncHttpResponse:
+        for _ in range(self._max_redirects + 1):
+            response = await self._send_request(url, headers)
+
+            if response.status_code not in self.REDIRECT_STATUS_CODES or 'location' not in response.headers:
+                return response
+
+            await response.close()
+            url = urljoin(url, response.headers['location'])
+            log.debug('Following redirect', url=url, status_code=response.status_code)
+
+        raise ValueError('Too many redirects')
+
+    async def _send_request(self, url: str, headers: dict[str, str]) -> AsyncHttpResponse:
+        parsed_url = urlparse(url)
+        use_ssl = parsed_url.scheme == 'https'
+        port = parsed_url.port if parsed_url.port else (443 if use_ssl else 80)
+        target = f'{parsed_url.path or "/"}{f"?{parsed_url.query}" if parsed_url.query else ""}'
+
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parsed_url.hostname, port, ssl=self._ssl_context if use_ssl else None),
+            self._timeout,
+        )
+
+        request_headers = {
+            'Host': parsed_url.netloc,
+            'Accept-Encoding': 'identity',
+            'Connection': 'close',
+            **headers,
+        }
+        request_lines = [f'GET {target} HTTP/1.1'] + [f'{key}: {value}' for key, value in request_headers.items()]
+        writer.write(('\r\n'.join(request_lines) + '\r\n\r\n').encode('latin-1'))
+
+        try:
+            await writer.drain()
+            return await asyncio.wait_for(self._read_response(reader, writer), self._timeout)
+        except Exception:
+            writer.close()
+            raise
+
+    async def _read_response(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> AsyncHttpResponse:
+        status_line = (await reader.readline()).decode('latin-1').rstrip('\r\n')
+        parts = status_line.split(' ', 2)
+
+        if len(parts) < 2 or not parts[0].startswith('HTTP/'):
+            raise ConnectionError(f'Invalid HTTP status line: {status_line}')
+
+        response_headers: dict[str, str] = {}
+        while header_line := (await reader.readline()).decode('latin-1').rstrip('\r\n'):
+            key, _, value = header_line.partition(':')
+            response_headers[key.strip().lower()] = value.strip()
+
+        return AsyncHttpResponse(
+            int(parts[1]), parts[2] if len(parts) > 2 else '', response_headers, reader, writer, self._timeout
+        )
+
+
+class IAsyncFileDownloader(object):
+
+    async def download(
+        self,
+        file_url: str,
+        file_name: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+        skip_if_exists: bool = True,
+        chunk_size: int = 1000 * 1000,
+    ) -> str:
+        raise NotImplementedError()
+
+
+class AsyncFileDownloader(IAsyncFileDownloader):
+
+    def __init__(
+        self,
+        download_location: str,
+        transport: Optional[IAsyncHttpTransport] = None,
+        max_concurrency: int = 1000,
+    ) -> None:
+        self._download_location = download_location
+        self._transport = transport if transport else AsyncHttpTransport()
+        self._concurrency_limit = asyncio.Semaphore(max_concurrency)
+
+    async def download(
+        self,
+        file_url: str,
+        file_name: Optional[str] = None,
+        headers: Optional[dict[str, str]] = None,
+        skip_if_exists: bool = True,
+        chunk_size: int = 1000 * 1000,
+    ) -> str:
+        if not urlparse(file_url).scheme:
+            return self._check_local_file(file_url)
+
+        file_path = self._get_download_path(file_url, file_name)
+
+        if skip_if_exists and os.path.isfile(file_path):
+            log.info('File already exists, skipping download', file=file_path)
+            return file_path
+
+        headers = headers if headers else dict()
+
+        log.info('Downloading file', url=file_url, file_name=file_name, headers=list(headers.keys()))
+
+        async with self._concurrency_limit:
+            response = await self._transport.get(file_url, headers)
+
+            try:
+                if response.status_code != 200:
+                    log.error(
+                        'Failed to download file',
+                        url=file_url,
+                        status_code=response.status_code,
+                        reason=response.reason,
+                    )
+                    raise ValueError('Failed to download file')
+
+                await self._download_file(response, file_path, chunk_size)
+            finally:
+                await response.close()
+
+        log.info('Downloaded file', file=file_path)
+
+        return file_path
+
+    def _check_local_file(self, file_url: str) -> str:
+        file_path = os.path.abspath(file_url)
+        if os.path.isfile(file_path):
+            log.info('Local file path provided, skipping download', file=file_path)
+            return file_path
+        else:
+            log.error('Local file does not exist', file=file_path)
+            raise ValueError('Local file does not exist')
+
+    def _get_download_path(self, file_url: str, file_name: Optional[str]) -> str:
+        if not file_name and '/' in file_url:
+            file_name = file_url.split('/')[-1]
+
+        return f'{self._download_location}/{file_name}'
+
+    async def _download_file(self, response: AsyncHttpResponse, file_path: str, chunk_size: int) -> None:
+        await asyncio.to_thread(os.makedirs, self._download_location, exist_ok=True)
+
+        part_path = f'{file_path}.part'
+        asset_file = await asyncio.to_thread(open, part_path, 'wb')
+
+        try:
+            async for chunk in response.iter_content(chunk_size):
+                await asyncio.to_thread(asset_file.write, chunk)
+        except BaseException:
+            await asyncio.to_thread(asset_file.close)
+            await asyncio.to_thread(os.remove, part_path)
+            raise
+
+        await asyncio.to_thread(asset_file.close)
+        await asyncio.to_thread(os.replace, part_path, file_path)
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import asyncio
+from threading import Lock
+from typing import Any, Iterable, Optional, Mapping, Callable
+
+from context_logger import get_logger
+
+from common_utility.reusableTimer import IReusableTimer
+
+log = get_logger('AsyncReusableTimer')
+
+
+class AsyncReusableTimer(IReusableTimer):
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None) -> None:
+        self._loop = loop if loop else asyncio.get_running_loop()
+        self._timer_lock = Lock()
+        self._interval = 0.0
+        self._function: Any = None
+        self._args: Iterable[Any] = []
+        self._kwargs: Mapping[str, Any] = {}
+        self._generation = 0
+        self._is_armed = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task[Any]] = set()
+
+    def start(
+        self,
+        interval: float,
+        function: Any,
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[Mapping[str, Any]] = None,
+    ) -> IReusableTimer:
+        with self._timer_lock:
+            log.debug('Starting timer', interval=interval, function=function, args=args, kwargs=kwargs)
+            self._interval = interval
+            self._function = function
+            self._args = args if args is not None else []
+            self._kwargs = kwargs if kwargs is not None else {}
+            generation = self._arm()
+
+        self._run_on_loop(self._schedule, generation)
+        return self
+
+    def restart(self) -> None:
+        with self._timer_lock:
+            if self._function is None:
+                return
+            log.debug('Restarting timer', interval=self._interval, function=self._function)
+            generation = self._arm()
+
+        self._run_on_loop(self._schedule, generation)
+
+    def cancel(self) -> None:
+        with self._timer_lock:
+            if self._is_armed:
+                log.debug('Cancelling timer', interval=self._interval, function=self._function)
+            self._function = None
+            self._generation += 1
+            self._is_armed = False
+            generation = self._generation
+
+        self._run_on_loop(self._schedule, generation)
+
+    def is_alive(self) -> bool:
+        with self._timer_lock:
+            return self._is_armed or any(not task.done() for task in self._tasks)
+
+    def _arm(self) -> int:
+        self._generation += 1
+        self._is_armed = True
+        return self._generation
+
+    def _run_on_loop(self, callback: Callable[[int], None], generation: int) -> None:
+        try:
+            is_loop_thread = asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            is_loop_thread = False
+
+        if is_loop_thread:
+            callback(generation)
+        else:
+            self._loop.call_soon_threadsafe(callback, generation)
+
+    def _schedule(self, generation: int) -> None:
+        with self._timer_lock:
+            if generation != self._generation:
+                return
+
+            if self._handle:
+                self._handle.cancel()
+                self._handle = None
+
+            if self._is_armed:
+                self._handle = self._loop.call_later(self._interval, self._fire, generation)
+
+    def _fire(self, generation: int) -> None:
+        with self._timer_lock:
+            if generation != self._generation or not self._is_armed:
+                return
+
+            self._is_armed = False
+            self._handle = None
+            function, args, kwargs = self._function, self._args, self._kwargs
+
+        try:
+            result = function(*args, **kwargs)
+        except Exception as error:
+            log.error('Timer function failed', function=function, error=error)
+            return
+
+        if asyncio.iscoroutine(result):
+            task = self._loop.create_task(result)
+            with self._timer_lock:
+                self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: 'asyncio.Task[Any]') -> None:
+        with self._timer_lock:
+            self._tasks.discard(task)
+
+        if not task.cancelled() and task.exception():
+            log.error('Timer coroutine failed', error=task.exception())
@@ -0,0 +1,149 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+from threading import Lock
+from typing import Any, Callable, Optional, Type
+
+from context_logger import get_logger
+from pydantic import BaseModel
+
+from common_utility.fileMonitor import IFileMonitor, create_file_monitor, get_file_identity, FileIdentity
+from common_utility.jsonLoader import IJsonLoader, JsonLoader
+from common_utility.reusableTimer import IReusableTimer, ReusableTimer
+
+log = get_logger('ConfigWatcher')
+
+
+class WatchedConfig(object):
+
+    def __init__(self, file_path: str, model: Type[BaseModel], is_list: bool) -> None:
+        self.file_path = file_path
+        self.model = model
+        self.is_list = is_list
+        self.identity: FileIdentity = None
+        self.value: Any = None
+        self.callbacks: list[Callable[[Any], None]] = []
+
+
+class IConfigWatcher(object):
+
+    def subscribe(
+        self, json_file_path: str, model: Type[BaseModel], callback: Callable[[Any], None], is_list: bool = False
+    ) -> Any:
+        raise NotImplementedError()
+
+    def unsubscribe(self, json_file_path: str, callback: Callable[[Any], None]) -> None:
+        raise NotImplementedError()
+
+    def start(self) -> None:
+        raise NotImplementedError()
+
+    def stop(self) -> None:
+        raise NotImplementedError()
+
+
+class ConfigWatcher(IConfigWatcher):
+
+    def __init__(
+        self,
+        json_loader: Optional[IJsonLoader] = None,
+        file_monitor: Optional[IFileMonitor] = None,
+        reload_timer: Optional[IReusableTimer] = None,
+        debounce_interval: float = 0.5,
+    ) -> None:
+        self._json_loader = json_loader if json_loader else JsonLoader()
+        self._file_monitor = file_monitor if file_monitor else create_file_monitor()
+        self._reload_timer = reload_timer if reload_timer else ReusableTimer()
+        self._debounce_interval = debounce_interval
+        self._configs: dict[tuple[str, Type[BaseModel], bool], WatchedConfig] = {}
+        self._changed_files: set[str] = set()
+        self._configs_lock = Lock()
+
+    def subscribe(
+        self, json_file_path: str, model: Type[BaseModel], callback: Callable[[Any], None], is_list: bool = False
+    ) -> Any:
+        file_path = os.path.abspath(json_file_path)
+        key = (file_path, model, is_list)
+
+        with self._configs_lock:
+            config = self._configs.get(key)
+
+            if config is None:
+                config = WatchedConfig(file_path, model, is_list)
+                config.identity = get_file_identity(file_path)
+                config.value = self._load(config)
+                self._configs[key] = config
+                self._file_monitor.watch(file_path)
+
+            config.callbacks.append(callback)
+
+            return config.value
+
+    def unsubscribe(self, json_file_path: str, callback: Callable[[Any], None]) -> None:
+        file_path = os.path.abspath(json_file_path)
+
+        with self._configs_lock:
+            for key, config in list(self._configs.items()):
+                if config.file_path == file_path and callback in config.callbacks:
+                    config.callbacks.remove(callback)
+                    if not config.callbacks:
+                        del self._configs[key]
+
+            if not any(config.file_path == file_path for config in self._configs.values()):
+                self._file_monitor.unwatch(file_path)
+
+    def start(self) -> None:
+        self._file_monitor.start(self._on_change)
+
+    def stop(self) -> None:
+        self._file_monitor.stop()
+        self._reload_timer.cancel()
+
+    def _on_change(self, file_path: str) -> None:
+        with self._configs_lock:
+            self._changed_files.add(file_path)
+
+        self._reload_timer.start(self._debounce_interval, self._reload_changed)
+
+    def _reload_changed(self) -> None:
+        notifications = []
+
+        with self._configs_lock:
+            changed_files, self._changed_files = self._changed_files, set()
+
+            for config in self._configs.values():
+                if config.file_path in changed_files and self._reload(config):
+                    notifications.append((list(config.callbacks), config.value))
+
+        for callbacks, value in notifications:
+            for callback in callbacks:
+                try:
+                    callback(value)
+                except Exception as error:
+                    log.error('Config change subscriber failed', callback=callback, error=error)
+
+    def _reload(self, config: WatchedConfig) -> bool:
+        identity = get_file_identity(config.file_path)
+
+        if identity is None or identity == config.identity:
+            return False
+
+        config.identity = identity
+
+        try:
+            config.value = self._load(config)
+        except Exception as error:
+            log.warning('Failed to reload config, keeping previous version', file=config.file_path, error=error)
+            return False
+
+        log.info('Reloaded config', file=config.file_path, model=config.model.__name__)
+
+        return True
+
+    def _load(self, config: WatchedConfig) -> Any:
+        if config.is_list:
+            return self._json_loader.load_list(config.file_path, config.model)
+        else:
+            return self._json_loader.load(config.file_path, config.model)
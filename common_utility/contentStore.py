@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+
+from context_logger import get_logger
+
+log = get_logger('ContentStore')
+
+
+class IContentStore(object):
+
+    def store(self, file_path: str, digest: str) -> None:
+        raise NotImplementedError()
+
+    def release(self, digest: str) -> None:
+        raise NotImplementedError()
+
+    def get_object_path(self, digest: str) -> str:
+        raise NotImplementedError()
+
+
+class ContentStore(IContentStore):
+
+    def __init__(self, store_location: str, hash_algorithm: str = 'sha256') -> None:
+        self._store_location = store_location
+        self._hash_algorithm = hash_algorithm
+
+    def store(self, file_path: str, digest: str) -> None:
+        object_path = self.get_object_path(digest)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+
+        try:
+            os.link(file_path, object_path)
+            log.debug('Stored new content', file=file_path, digest=digest)
+            return
+        except FileExistsError:
+            pass
+
+        if not os.path.samefile(file_path, object_path):
+            link_path = f'{file_path}.link'
+            if os.path.lexists(link_path):
+                os.remove(link_path)
+            os.link(object_path, link_path)
+            os.replace(link_path, file_path)
+            log.info('Deduplicated file with stored content', file=file_path, digest=digest)
+
+    def release(self, digest: str) -> None:
+        object_path = self.get_object_path(digest)
+
+        try:
+            if os.stat(object_path).st_nlink <= 1:
+                os.remove(object_path)
+                log.debug('Removed unreferenced content', digest=digest)
+        except FileNotFoundError:
+            pass
+
+    def get_object_path(self, digest: str) -> str:
+        return f'{self._store_location}/{self._hash_algorithm}/{digest[:2]}/{digest}'
@@ -0,0 +1,145 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from enum import Enum
+from threading import Lock
+from typing import Any, Iterable, Optional, Mapping, Callable
+
+from context_logger import get_logger
+
+from common_utility.reusableTimer import IReusableTimer, ReusableTimer
+
+log = get_logger('Debouncer')
+
+Call = tuple[Iterable[Any], Mapping[str, Any]]
+
+
+class DebounceMode(Enum):
+    LEADING = 'leading'
+    TRAILING = 'trailing'
+    BOTH = 'both'
+
+
+class Debouncer(IReusableTimer):
+
+    def __init__(
+        self,
+        mode: DebounceMode = DebounceMode.TRAILING,
+        max_wait: Optional[float] = None,
+        coalesce: Optional[Callable[[list[Call]], Call]] = None,
+        timer: Optional[IReusableTimer] = None,
+    ) -> None:
+        self._mode = mode
+        self._max_wait = max_wait
+        self._coalesce = coalesce
+        self._timer = timer if timer else ReusableTimer()
+        self._lock = Lock()
+        self._interval = 0.0
+        self._function: Any = None
+        self._call: Call = ([], {})
+        self._pending: list[Call] = []
+        self._deadline: Optional[float] = None
+        self._max_deadline: Optional[float] = None
+        self._is_armed = False
+
+    def start(
+        self,
+        interval: float,
+        function: Any,
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[Mapping[str, Any]] = None,
+    ) -> IReusableTimer:
+        with self._lock:
+            self._interval = interval
+            self._function = function
+            self._call = (args if args is not None else [], kwargs if kwargs is not None else {})
+
+        self.trigger(*self._call)
+        return self
+
+    def restart(self) -> None:
+        self.trigger(*self._call)
+
+    def trigger(self, args: Optional[Iterable[Any]] = None, kwargs: Optional[Mapping[str, Any]] = None) -> None:
+        call = (args if args is not None else [], kwargs if kwargs is not None else {})
+
+        with self._lock:
+            if self._function is None:
+                return
+
+            now = time.monotonic()
+            is_leading = self._deadline is None and self._mode != DebounceMode.TRAILING
+            self._deadline = now + self._interval
+
+            if self._max_wait is not None and self._max_deadline is None:
+                self._max_deadline = now + self._max_wait
+
+            if not is_leading and self._mode != DebounceMode.LEADING:
+                self._add_pending(call)
+
+            if not self._is_armed:
+                self._is_armed = True
+                self._timer.start(self._interval, self._on_timer)
+
+        if is_leading:
+            self._execute(self._function, call)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._function = None
+            self._deadline = self._max_deadline = None
+            self._pending = []
+            self._is_armed = False
+            self._timer.cancel()
+
+    def is_alive(self) -> bool:
+        with self._lock:
+            return self._deadline is not None
+
+    def _on_timer(self) -> None:
+        with self._lock:
+            if self._deadline is None:
+                return
+
+            now = time.monotonic()
+            due = min(self._deadline, self._max_deadline) if self._max_deadline is not None else self._deadline
+
+            if now < due:
+                self._timer.start(due - now, self._on_timer)
+                return
+
+            function, call = self._function, self._take_pending()
+            self._max_deadline = None
+
+            if self._deadline <= now or self._mode == DebounceMode.LEADING:
+                self._deadline = None
+                self._is_armed = False
+            else:
+                self._timer.start(self._deadline - now, self._on_timer)
+
+        if call:
+            self._execute(function, call)
+
+    def _add_pending(self, call: Call) -> None:
+        if self._coalesce:
+            self._pending.append(call)
+        else:
+            self._pending = [call]
+
+    def _take_pending(self) -> Optional[Call]:
+        pending, self._pending = self._pending, []
+
+        if not pending:
+            return None
+
+        return self._coalesce(pending) if self._coalesce else pending[-1]
+
+    def _execute(self, function: Any, call: Call) -> None:
+        args, kwargs = call
+
+        try:
+            function(*args, **kwargs)
+        except Exception as error:
+            log.error('Debounced function failed', function=function, error=error)
@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+import time
+from contextlib import contextmanager
+from enum import Enum
+from threading import Lock
+from typing import Optional, Iterator
+
+from context_logger import get_logger
+from pydantic import BaseModel, ValidationError
+
+from common_utility.contentStore import IContentStore
+from common_utility.downloadIndex import IDownloadIndex
+
+log = get_logger('DownloadCache')
+
+
+class EvictionPolicy(Enum):
+    LRU = 'lru'
+    LFU = 'lfu'
+
+
+class CacheEntry(BaseModel):
+    size: int
+    last_access: int
+    access_count: int = 1
+    digest: Optional[str] = None
+
+
+class DownloadCacheContent(BaseModel):
+    access_sequence: int = 0
+    files: dict[str, CacheEntry] = {}
+
+
+class IDownloadCache(object):
+
+    def touch(self, file_name: str) -> None:
+        raise NotImplementedError()
+
+    def add(self, file_name: str, digest: Optional[str] = None) -> None:
+        raise NotImplementedError()
+
+    def pin(self, file_name: str) -> None:
+        raise NotImplementedError()
+
+    def unpin(self, file_name: str) -> None:
+        raise NotImplementedError()
+
+    def get_size(self) -> int:
+        raise NotImplementedError()
+
+    def flush(self) -> None:
+        raise NotImplementedError()
+
+    @contextmanager
+    def pinned(self, file_name: str) -> Iterator[None]:
+        self.pin(file_name)
+        try:
+            yield
+        finally:
+            self.unpin(file_name)
+
+
+class DownloadCache(IDownloadCache):
+
+    def __init__(
+        self,
+        download_location: str,
+        max_size: int,
+        policy: EvictionPolicy = EvictionPolicy.LRU,
+        download_index: Optional[IDownloadIndex] = None,
+        index_file: str = '.download-cache.json',
+        content_store: Optional[IContentStore] = None,
+        flush_interval: float = 0.0,
+    ) -> None:
+        self._download_location = download_location
+        self._max_size = max_size
+        self._policy = policy
+        self._download_index = download_index
+        self._index_path = f'{download_location}/{index_file}'
+        self._content_store = content_store
+        self._flush_interval = flush_interval
+        self._cache_lock = Lock()
+        self._pins: dict[str, int] = {}
+        self._content = self._load_index()
+        self._size = sum(entry.size for entry in self._content.files.values())
+        self._dirty = False
+        self._last_save = time.monotonic()
+
+    def touch(self, file_name: str) -> None:
+        with self._cache_lock:
+            entry = self._content.files.get(file_name)
+
+            if entry:
+                entry.last_access = self._next_access()
+                entry.access_count += 1
+                self._dirty = True
+                if time.monotonic() - self._last_save >= self._flush_interval:
+                    self._save_index()
+            else:
+                self._add_entry(file_name)
+                self._evict(file_name)
+
+    def add(self, file_name: str, digest: Optional[str] = None) -> None:
+        with self._cache_lock:
+            self._add_entry(file_name, digest)
+            self._evict()
+
+    def pin(self, file_name: str) -> None:
+        with self._cache_lock:
+            self._pins[file_name] = self._pins.get(file_name, 0) + 1
+
+    def unpin(self, file_name: str) -> None:
+        with self._cache_lock:
+            count = self._pins.pop(file_name, 0) - 1
+            if count > 0:
+                self._pins[file_name] = count
+
+    def get_size(self) -> int:
+        with self._cache_lock:
+            return self._size
+
+    def flush(self) -> None:
+        with self._cache_lock:
+            if self._dirty:
+                self._save_index()
+
+    def _add_entry(self, file_name: str, digest: Optional[str] = None) -> None:
+        file_path = f'{self._download_location}/{file_name}'
+
+        if not os.path.isfile(file_path):
+            return
+
+        previous = self._content.files.get(file_name)
+        entry = CacheEntry(
+            size=os.path.getsize(file_path),
+            last_access=self._next_access(),
+            access_count=previous.access_count + 1 if previous else 1,
+            digest=digest if digest else (previous.digest if previous else None),
+        )
+
+        self._size += entry.size - (previous.size if previous else 0)
+        self._content.files[file_name] = entry
+        self._dirty = True
+
+    def _evict(self, touched: Optional[str] = None) -> None:
+        if self._size > self._max_size:
+            for file_name in self._get_eviction_order():
+                if self._size <= self._max_size:
+                    break
+                if file_name not in self._pins and file_name != touched:
+                    self._remove_entry(file_name)
+
+            if self._size > self._max_size:
+                log.warning('Cache size exceeds limit, remaining files are pinned or in use', size=self._size)
+
+        if self._dirty:
+            self._save_index()
+
+    def _get_eviction_order(self) -> list[str]:
+        files = self._content.files
+
+        if self._policy == EvictionPolicy.LFU:
+            return sorted(files, key=lambda name: (files[name].access_count, files[name].last_access))
+        else:
+            return sorted(files, key=lambda name: files[name].last_access)
+
+    def _remove_entry(self, file_name: str) -> None:
+        entry = self._content.files.pop(file_name)
+        self._size -= entry.size
+        self._dirty = True
+
+        file_path = f'{self._download_location}/{file_name}'
+        if os.path.isfile(file_path):
+            os.remove(file_path)
+
+        if self._content_store and entry.digest:
+            self._content_store.release(entry.digest)
+
+        if self._download_index:
+            self._download_index.remove(file_name)
+
+        log.info('Evicted file from cache', file=file_path, size=entry.size)
+
+    def _next_access(self) -> int:
+        self._content.access_sequence += 1
+        return self._content.access_sequence
+
+    def _load_index(self) -> DownloadCacheContent:
+        if not os.path.isfile(self._index_path):
+            return DownloadCacheContent()
+
+        try:
+            with open(self._index_path, 'rb') as index_file:
+                return DownloadCacheContent.model_validate_json(index_file.read())
+        except (OSError, ValidationError) as error:
+            log.warning('Failed to load download cache index, starting empty', file=self._index_path, error=error)
+            return DownloadCacheContent()
+
+    def _save_index(self) -> None:
+        os.makedirs(os.path.dirname(self._index_path), exist_ok=True)
+
+        temp_path = f'{self._index_path}.tmp'
+        with open(temp_path, 'w') as index_file:
+            index_file.write(self._content.model_dump_json())
+
+        os.replace(temp_path, self._index_path)
+        self._dirty = False
+        self._last_save = time.monotonic()
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+from threading import Lock
+from typing import Optional
+
+from context_logger import get_logger
+from pydantic import BaseModel, ValidationError
+
+log = get_logger('DownloadIndex')
+
+
+class DownloadMetadata(BaseModel):
+    url: str
+    size: int
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    digest: Optional[str] = None
+
+
+class DownloadIndexContent(BaseModel):
+    files: dict[str, DownloadMetadata] = {}
+
+
+class IDownloadIndex(object):
+
+    def get(self, file_name: str) -> Optional[DownloadMetadata]:
+        raise NotImplementedError()
+
+    def put(self, file_name: str, metadata: DownloadMetadata) -> None:
+        raise NotImplementedError()
+
+    def remove(self, file_name: str) -> None:
+        raise NotImplementedError()
+
+
+class DownloadIndex(IDownloadIndex):
+
+    def __init__(self, download_location: str, index_file: str = '.download-index.json') -> None:
+        self._index_path = f'{download_location}/{index_file}'
+        self._index_lock = Lock()
+        self._content = self._load_index()
+
+    def get(self, file_name: str) -> Optional[DownloadMetadata]:
+        with self._index_lock:
+            return self._content.files.get(file_name)
+
+    def put(self, file_name: str, metadata: DownloadMetadata) -> None:
+        with self._index_lock:
+            self._content.files[file_name] = metadata
+            self._save_index()
+
+    def remove(self, file_name: str) -> None:
+        with self._index_lock:
+            if self._content.files.pop(file_name, None):
+                self._save_index()
+
+    def _load_index(self) -> DownloadIndexContent:
+        if not os.path.isfile(self._index_path):
+            return DownloadIndexContent()
+
+        try:
+            with open(self._index_path, 'rb') as index_file:
+                return DownloadIndexContent.model_validate_json(index_file.read())
+        except (OSError, ValidationError) as error:
+            log.warning('Failed to load download index, starting empty', file=self._index_path, error=error)
+            return DownloadIndexContent()
+
+    def _save_index(self) -> None:
+        os.makedirs(os.path.dirname(self._index_path), exist_ok=True)
+
+        temp_path = f'{self._index_path}.tmp'
+        with open(temp_path, 'w') as index_file:
+            index_file.write(self._content.model_dump_json())
+
+        os.replace(temp_path, self._index_path)
@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import heapq
+import itertools
+import time
+from threading import Condition
+from typing import Optional
+
+from context_logger import get_logger
+
+log = get_logger('DownloadScheduler')
+
+
+class IDownloadScheduler(object):
+
+    def acquire(self, size: int, priority: int = 0) -> None:
+        raise NotImplementedError()
+
+    def set_rate(self, bytes_per_second: Optional[float]) -> None:
+        raise NotImplementedError()
+
+
+class DownloadScheduler(IDownloadScheduler):
+
+    def __init__(self, bytes_per_second: Optional[float] = None, burst_size: Optional[int] = None) -> None:
+        self._condition = Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._sequence = itertools.count()
+        self._rate = bytes_per_second
+        self._burst_size = burst_size
+        self._tokens = float(self._get_capacity())
+        self._last_refill = time.monotonic()
+
+    def acquire(self, size: int, priority: int = 0) -> None:
+        with self._condition:
+            waiter = (-priority, next(self._sequence))
+            heapq.heappush(self._waiters, waiter)
+
+            try:
+                while True:
+                    self._refill()
+
+                    if self._waiters[0] == waiter and self._get_wait_time(size) is None:
+                        heapq.heappop(self._waiters)
+                        if self._rate:
+                            self._tokens -= size
+                        self._condition.notify_all()
+                        return
+
+                    self._condition.wait(self._get_wait_time(size) if self._waiters[0] == waiter else None)
+            except BaseException:
+                self._waiters.remove(waiter)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+                raise
+
+    def set_rate(self, bytes_per_second: Optional[float]) -> None:
+        with self._condition:
+            self._refill()
+            self._rate = bytes_per_second
+            self._tokens = min(self._tokens, float(self._get_capacity()))
+            log.info('Download rate changed', bytes_per_second=bytes_per_second)
+            self._condition.notify_all()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+
+        if self._rate:
+            self._tokens = min(self._tokens + (now - self._last_refill) * self._rate, float(self._get_capacity()))
+
+        self._last_refill = now
+
+    def _get_capacity(self) -> float:
+        if self._burst_size:
+            return self._burst_size
+        return self._rate if self._rate else 0
+
+    def _get_wait_time(self, size: int) -> Optional[float]:
+        required = min(float(size), self._get_capacity())
+
+        if not self._rate or self._tokens >= required:
+            return None
+
+        return (required - self._tokens) / self._rate
@@ -2,17 +2,48 @@
 # SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
 # SPDX-License-Identifier: MIT
 
+import ctypes
+import ctypes.util
+import hashlib
 import os
-from typing import Optional
+from http.client import HTTPResponse
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor, Future, as_completed, wait
+from contextlib import nullcontext
+from queue import Queue
+from threading import Lock, Thread, Event
+from typing import Optional, Mapping, NamedTuple, Any, BinaryIO, Callable, ContextManager
 from urllib.parse import urlparse
 
 from context_logger import get_logger
 from requests import Response
 
 from common_utility import ISessionProvider
+from common_utility.contentStore import IContentStore
+from common_utility.downloadCache import IDownloadCache
+from common_utility.downloadIndex import IDownloadIndex, DownloadMetadata
+from common_utility.downloadScheduler import IDownloadScheduler
+from common_utility.streamDecompressor import StreamDecompressor
 
 log = get_logger('FileDownloader')
 
+FALLOC_FL_KEEP_SIZE = 1
+
+
+class DownloadJob(NamedTuple):
+    file_url: str
+    file_name: Optional[str] = None
+    headers: Optional[dict[str, str]] = None
+    expected_digest: Optional[str] = None
+    decompress: bool = False
+    priority: int = 0
+
+
+class DownloadResult(NamedTuple):
+    job: DownloadJob
+    file_path: Optional[str] = None
+    error: Optional[Exception] = None
+
 
 class IFileDownloader(object):
 
@@ -23,15 +54,107 @@ class IFileDownloader(object):
         headers: Optional[dict[str, str]] = None,
         skip_if_exists: bool = True,
         chunk_size: int = 1000 * 1000,
+        expected_digest: Optional[str] = None,
+        decompress: bool = False,
+        priority: int = 0,
     ) -> str:
         raise NotImplementedError()
 
+    def download_many(
+        self,
+        jobs: list[DownloadJob],
+        skip_if_exists: bool = True,
+        chunk_size: int = 1000 * 1000,
+        max_workers: int = 8,
+        max_per_host: int = 4,
+    ) -> list[DownloadResult]:
+        raise NotImplementedError()
+
+
+class _HostDispatcher(object):
+
+    def __init__(self, executor: Executor, max_workers: int, max_per_host: int, run_job: Callable[[int], None]) -> None:
+        self._executor = executor
+        self._max_workers = max_workers
+        self._max_per_host = max_per_host
+        self._run_job = run_job
+        self._lock = Lock()
+        self._queues: dict[str, deque[int]] = {}
+        self._active: dict[str, int] = {}
+        self._total_active = 0
+        self._remaining = 0
+        self._done = Event()
+
+    def run(self, jobs: list[tuple[str, int]]) -> None:
+        with self._lock:
+            self._remaining = len(jobs)
+
+            for host, index in jobs:
+                self._queues.setdefault(host, deque()).append(index)
+                self._active.setdefault(host, 0)
+
+            self._submit_runnable()
+
+        if jobs:
+            self._done.wait()
+
+    def _submit_runnable(self) -> None:
+        for host, queue in self._queues.items():
+            while queue and self._active[host] < self._max_per_host and self._total_active < self._max_workers:
+                self._active[host] += 1
+                self._total_active += 1
+                self._executor.submit(self._execute, host, queue.popleft())
+
+    def _execute(self, host: str, index: int) -> None:
+        try:
+            self._run_job(index)
+        finally:
+            with self._lock:
+                self._active[host] -= 1
+                self._total_active -= 1
+                self._remaining -= 1
+
+                if self._remaining:
+                    self._submit_runnable()
+                else:
+                    self._done.set()
+
 
 class FileDownloader(IFileDownloader):
 
-    def __init__(self, session_provider: ISessionProvider, download_location: str) -> None:
+    def __init__(
+        self,
+        session_provider: ISessionProvider,
+        download_location: str,
+        segment_count: int = 1,
+        segment_min_size: int = 10 * 1000 * 1000,
+        download_index: Optional[IDownloadIndex] = None,
+        hash_algorithm: str = 'sha256',
+        content_store: Optional[IContentStore] = None,
+        preallocate: bool = False,
+        read_into_buffer: bool = False,
+        threaded_writes: bool = False,
+        write_buffer_count: int = 4,
+        scheduler: Optional[IDownloadScheduler] = None,
+        download_cache: Optional[IDownloadCache] = None,
+        max_batch_workers: int = 32,
+    ) -> None:
         self._session_provider = session_provider
         self._download_location = download_location
+        self._segment_count = segment_count
+        self._segment_min_size = segment_min_size
+        self._download_index = download_index
+        self._hash_algorithm = hash_algorithm
+        self._content_store = content_store
+        self._preallocate = preallocate
+        self._read_into_buffer = read_into_buffer
+        self._threaded_writes = threaded_writes
+        self._write_buffer_count = write_buffer_count
+        self._fallocate = self._load_fallocate() if preallocate else None
+        self._scheduler = scheduler
+        self._download_cache = download_cache
+        self._batch_executor = ThreadPoolExecutor(max_batch_workers, thread_name_prefix='FileDownloader')
+        self._segment_executor = ThreadPoolExecutor(max(segment_count, 1), thread_name_prefix='FileDownloader-segment')
 
     def download(
         self,
@@ -40,28 +163,132 @@ class FileDownloader(IFileDownloader):
         headers: Optional[dict[str, str]] = None,
         skip_if_exists: bool = True,
         chunk_size: int = 1000 * 1000,
+        expected_digest: Optional[str] = None,
+        decompress: bool = False,
+        priority: int = 0,
     ) -> str:
         if not urlparse(file_url).scheme:
             return self._check_local_file(file_url)
 
         file_path = self._get_download_path(file_url, file_name)
+        extension = StreamDecompressor.get_extension(file_path) if decompress else None
+
+        if extension:
+            file_path = file_path.removesuffix(extension)
 
-        if skip_if_exists and os.path.isfile(file_path):
+        file_exists = os.path.isfile(file_path) and self._is_expected_content(file_path, expected_digest)
+
+        if skip_if_exists and file_exists:
             log.info('File already exists, skipping download', file=file_path)
+            self._touch_cache(file_path)
             return file_path
 
         headers = headers if headers else dict()
 
         log.info('Downloading file', url=file_url, file_name=file_name, headers=list(headers.keys()))
 
-        response = self._send_request(file_url, headers)
+        response = self._revalidate(file_url, file_path, headers) if file_exists else None
+
+        if response is not None and response.status_code == 304:
+            log.info('File not modified, skipping download', file=file_path)
+            response.close()
+            self._touch_cache(file_path)
+            return file_path
+
+        part_path = f'{file_path}.part'
+        file_hash = self._create_hash(expected_digest)
+        decompressor = StreamDecompressor(extension, chunk_size) if extension else None
+
+        with self._pin_cache(file_path):
+            response_headers = self._fetch(
+                file_url, headers, part_path, chunk_size, response, file_hash, decompressor, priority
+            )
+            digest = file_hash.hexdigest() if file_hash else None
+
+            self._verify_digest(part_path, digest, expected_digest)
+
+            os.replace(part_path, file_path)
+            self._remove_validator(part_path)
 
-        self._download_file(response, file_path, chunk_size)
+            self._publish(file_url, file_path, response_headers, digest)
 
-        log.info('Downloaded file', file=file_path)
+        log.info('Downloaded file', file=file_path, digest=digest)
 
         return file_path
 
+    def download_many(
+        self,
+        jobs: list[DownloadJob],
+        skip_if_exists: bool = True,
+        chunk_size: int = 1000 * 1000,
+        max_workers: int = 8,
+        max_per_host: int = 4,
+    ) -> list[DownloadResult]:
+        if not jobs:
+            return []
+
+        jobs = [DownloadJob(*job) for job in jobs]
+        results: dict[int, DownloadResult] = {}
+        duplicates = self._find_duplicates(jobs, results)
+
+        def run_job(index: int) -> None:
+            job = jobs[index]
+            try:
+                file_path = self.download(
+                    job.file_url,
+                    job.file_name,
+                    job.headers,
+                    skip_if_exists,
+                    chunk_size,
+                    job.expected_digest,
+                    job.decompress,
+                    job.priority,
+                )
+                results[index] = DownloadResult(job, file_path)
+            except Exception as error:
+                log.error('Failed to download file in batch', url=job.file_url, error=error)
+                results[index] = DownloadResult(job, error=error)
+
+        log.info('Downloading files', count=len(jobs), max_workers=max_workers, max_per_host=max_per_host)
+
+        runnable = [
+            (urlparse(job.file_url).netloc, index)
+            for index, job in enumerate(jobs)
+            if index not in results and index not in duplicates
+        ]
+
+        _HostDispatcher(self._batch_executor, max_workers, max_per_host, run_job).run(runnable)
+
+        for index, original in duplicates.items():
+            results[index] = results[original]
+
+        log.info(
+            'Downloaded files', count=len(jobs), failed=len([result for result in results.values() if result.error])
+        )
+
+        return [results[index] for index in range(len(jobs))]
+
+    def _find_duplicates(self, jobs: list[DownloadJob], results: dict[int, DownloadResult]) -> dict[int, int]:
+        targets: dict[str, int] = {}
+        duplicates: dict[int, int] = {}
+
+        for index, job in enumerate(jobs):
+            if not urlparse(job.file_url).scheme:
+                continue
+
+            target_path = self._get_target_path(job.file_url, job.file_name, job.decompress)
+            original = targets.setdefault(target_path, index)
+
+            if original == index:
+                continue
+            elif job == jobs[original]:
+                duplicates[index] = original
+            else:
+                log.error('Conflicting download target in batch', url=job.file_url, file=target_path)
+                results[index] = DownloadResult(job, error=ValueError('Conflicting download target'))
+
+        return duplicates
+
     def _check_local_file(self, file_url: str) -> str:
         file_path = os.path.abspath(file_url)
         if os.path.isfile(file_path):
@@ -71,11 +298,13 @@ class FileDownloader(IFileDownloader):
             log.error('Local file does not exist', file=file_path)
             raise ValueError('Local file does not exist')
 
-    def _send_request(self, file_url: str, headers: dict[str, str]) -> Response:
+    def _send_request(
+        self, file_url: str, headers: dict[str, str], expected_status: tuple[int, ...] = (200,)
+    ) -> Response:
         with self._session_provider.get_session() as session:
             response = session.get(file_url, stream=True, headers=headers)
 
-        if response.status_code != 200:
+        if response.status_code not in expected_status:
             log.error('Failed to download file', url=file_url, status_code=response.status_code, reason=response.reason)
             raise ValueError('Failed to download file')
 
@@ -87,10 +316,461 @@ class FileDownloader(IFileDownloader):
 
         return f'{self._download_location}/{file_name}'
 
-    def _download_file(self, response: Response, file_path: str, chunk_size: int) -> None:
-        if not os.path.exists(self._download_location):
-            os.makedirs(self._download_location)
+    def _get_target_path(self, file_url: str, file_name: Optional[str], decompress: bool) -> str:
+        file_path = self._get_download_path(file_url, file_name)
+        extension = StreamDecompressor.get_extension(file_path) if decompress else None
+        return file_path.removesuffix(extension) if extension else file_path
+
+    def _fetch(
+        self,
+        file_url: str,
+        headers: dict[str, str],
+        part_path: str,
+        chunk_size: int,
+        response: Optional[Response],
+        file_hash: Optional[Any],
+        decompressor: Optional[StreamDecompressor],
+        priority: int,
+    ) -> Mapping[str, str]:
+        if response is None and decompressor is None and self._segment_count > 1:
+            probe = self._probe(file_url, headers)
+
+            if probe is not None:
+                file_size = int(probe.headers['Content-Length'])
+                self._download_segments(file_url, headers, part_path, file_size, chunk_size, priority)
+                if file_hash:
+                    self._hash_file(part_path, file_hash, chunk_size)
+                return probe.headers
+
+        return self._download_stream(
+            file_url, headers, part_path, chunk_size, response, file_hash, decompressor, priority
+        ).headers
+
+    def _create_hash(self, expected_digest: Optional[str]) -> Optional[Any]:
+        if expected_digest or self._content_store or self._download_index:
+            return hashlib.new(self._hash_algorithm)
+        return None
+
+    def _hash_file(self, file_path: str, file_hash: Any, chunk_size: int = 1000 * 1000) -> None:
+        with open(file_path, 'rb') as file:
+            while chunk := file.read(chunk_size):
+                file_hash.update(chunk)
+
+    def _is_expected_content(self, file_path: str, expected_digest: Optional[str]) -> bool:
+        if not expected_digest:
+            return True
+
+        metadata = self._download_index.get(self._get_index_key(file_path)) if self._download_index else None
+
+        if metadata and metadata.digest and metadata.size == os.path.getsize(file_path):
+            digest = metadata.digest
+        else:
+            file_hash = hashlib.new(self._hash_algorithm)
+            self._hash_file(file_path, file_hash)
+            digest = file_hash.hexdigest()
+
+        if digest != expected_digest.lower():
+            log.warning('Existing file does not match expected digest', file=file_path, digest=digest)
+            return False
+
+        return True
+
+    def _verify_digest(self, part_path: str, digest: Optional[str], expected_digest: Optional[str]) -> None:
+        if expected_digest and digest != expected_digest.lower():
+            log.error('Downloaded file digest mismatch', file=part_path, digest=digest, expected=expected_digest)
+            os.remove(part_path)
+            self._remove_validator(part_path)
+            raise ValueError('Downloaded file digest mismatch')
+
+    def _publish(
+        self, file_url: str, file_path: str, response_headers: Mapping[str, str], digest: Optional[str]
+    ) -> None:
+        if self._content_store and digest:
+            self._content_store.store(file_path, digest)
+
+        if self._download_index:
+            self._update_index(self._download_index, file_url, file_path, response_headers, digest)
+
+        if self._download_cache:
+            self._download_cache.add(self._get_index_key(file_path), digest)
+
+    def _touch_cache(self, file_path: str) -> None:
+        if self._download_cache:
+            self._download_cache.touch(self._get_index_key(file_path))
+
+    def _pin_cache(self, file_path: str) -> ContextManager[None]:
+        if self._download_cache:
+            return self._download_cache.pinned(self._get_index_key(file_path))
+        return nullcontext()
+
+    def _revalidate(self, file_url: str, file_path: str, headers: dict[str, str]) -> Optional[Response]:
+        if not self._download_index or not os.path.isfile(file_path):
+            return None
+
+        metadata = self._download_index.get(self._get_index_key(file_path))
+
+        if not metadata or metadata.url != file_url or metadata.size != os.path.getsize(file_path):
+            return None
+
+        conditional_headers = dict(headers)
+        if metadata.etag:
+            conditional_headers['If-None-Match'] = metadata.etag
+        if metadata.last_modified:
+            conditional_headers['If-Modified-Since'] = metadata.last_modified
+
+        if len(conditional_headers) == len(headers):
+            return None
+
+        log.info('Revalidating cached file', url=file_url, file=file_path)
+
+        return self._send_request(file_url, conditional_headers, (200, 304))
+
+    def _update_index(
+        self,
+        download_index: IDownloadIndex,
+        file_url: str,
+        file_path: str,
+        response_headers: Mapping[str, str],
+        digest: Optional[str],
+    ) -> None:
+        metadata = DownloadMetadata(
+            url=file_url,
+            size=os.path.getsize(file_path),
+            etag=response_headers.get('ETag'),
+            last_modified=response_headers.get('Last-Modified'),
+            digest=digest,
+        )
+        download_index.put(self._get_index_key(file_path), metadata)
+
+    def _get_index_key(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self._download_location)
+
+    def _download_stream(
+        self,
+        file_url: str,
+        headers: dict[str, str],
+        part_path: str,
+        chunk_size: int,
+        response: Optional[Response] = None,
+        file_hash: Optional[Any] = None,
+        decompressor: Optional[StreamDecompressor] = None,
+        priority: int = 0,
+    ) -> Response:
+        if response is None:
+            response = self._request_stream(file_url, headers, part_path, decompressor is None)
+
+        append = response.status_code == 206
+
+        if not append and decompressor is None:
+            self._save_validator(part_path, response.headers)
+
+        if append and file_hash:
+            self._hash_file(part_path, file_hash, chunk_size)
+
+        self._download_file(response, part_path, chunk_size, append, file_hash, decompressor, priority)
+
+        return response
+
+    def _request_stream(self, file_url: str, headers: dict[str, str], part_path: str, resume: bool) -> Response:
+        offset = os.path.getsize(part_path) if resume and os.path.isfile(part_path) else 0
+        validator = self._load_validator(part_path) if offset else None
+
+        if not validator:
+            if offset:
+                log.warning('Partial file has no validator, restarting download', url=file_url, offset=offset)
+            return self._send_request(file_url, headers)
+
+        log.info('Resuming partial download', url=file_url, offset=offset)
+        range_headers = {**headers, 'Range': f'bytes={offset}-', 'If-Range': validator, 'Accept-Encoding': 'identity'}
+        response = self._send_request(file_url, range_headers, (200, 206, 416))
+
+        if response.status_code == 416:
+            log.warning('Partial file cannot be resumed, restarting download', url=file_url, offset=offset)
+            os.remove(part_path)
+            response = self._send_request(file_url, headers)
+        elif response.status_code == 200:
+            log.warning('File changed since partial download, restarting download', url=file_url, offset=offset)
+
+        return response
+
+    def _save_validator(self, part_path: str, response_headers: Mapping[str, str]) -> None:
+        etag = response_headers.get('ETag')
+        validator = etag if etag and not etag.startswith('W/') else response_headers.get('Last-Modified')
+        validator_path = self._get_validator_path(part_path)
+
+        if validator:
+            os.makedirs(self._download_location, exist_ok=True)
+            with open(validator_path, 'w') as validator_file:
+                validator_file.write(validator)
+        elif os.path.isfile(validator_path):
+            os.remove(validator_path)
+
+    def _load_validator(self, part_path: str) -> Optional[str]:
+        try:
+            with open(self._get_validator_path(part_path)) as validator_file:
+                return validator_file.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _remove_validator(self, part_path: str) -> None:
+        validator_path = self._get_validator_path(part_path)
+        if os.path.isfile(validator_path):
+            os.remove(validator_path)
+
+    def _get_validator_path(self, part_path: str) -> str:
+        return f'{part_path}.validator'
+
+    def _download_file(
+        self,
+        response: Response,
+        file_path: str,
+        chunk_size: int,
+        append: bool = False,
+        file_hash: Optional[Any] = None,
+        decompressor: Optional[StreamDecompressor] = None,
+        priority: int = 0,
+    ) -> None:
+        os.makedirs(self._download_location, exist_ok=True)
+
+        is_identity = response.headers.get('Content-Encoding', 'identity').lower() == 'identity'
+
+        with open(file_path, 'ab' if append else 'wb') as asset_file:
+            if decompressor is None and 'Content-Length' in response.headers:
+                self._preallocate_file(asset_file, int(response.headers['Content-Length']))
+
+            body = self._get_body(response) if decompressor is None and is_identity and self._read_into_buffer else None
+
+            if body is not None:
+                self._download_body(response, body, asset_file, chunk_size, file_hash, priority)
+                return
 
-        with open(file_path, 'wb') as asset_file:
             for chunk in response.iter_content(chunk_size):
-                asset_file.write(chunk)
+                self._throttle(len(chunk), priority)
+                for data in decompressor.decompress(chunk) if decompressor else (chunk,):
+                    asset_file.write(data)
+                    if file_hash:
+                        file_hash.update(data)
+
+        if decompressor:
+            decompressor.finish()
+
+    def _get_body(self, response: Response) -> Optional[HTTPResponse]:
+        body = getattr(response.raw, '_fp', None)
+
+        if isinstance(body, HTTPResponse) and not body.chunked:
+            return body
+
+        return None
+
+    def _download_body(
+        self,
+        response: Response,
+        body: HTTPResponse,
+        asset_file: BinaryIO,
+        chunk_size: int,
+        file_hash: Optional[Any],
+        priority: int,
+    ) -> None:
+        self._download_raw(body, asset_file, chunk_size, file_hash, priority)
+
+        if body.length:
+            log.error('Incomplete response body', url=response.url, missing=body.length)
+            raise ConnectionError('Connection closed before end of response body')
+
+        response.raw.release_conn()
+
+    def _download_raw(
+        self, reader: HTTPResponse, asset_file: BinaryIO, chunk_size: int, file_hash: Optional[Any], priority: int
+    ) -> None:
+        if self._threaded_writes:
+            self._download_raw_threaded(reader, asset_file, chunk_size, file_hash, priority)
+            return
+
+        buffer = memoryview(bytearray(chunk_size))
+
+        while size := reader.readinto(buffer):
+            self._throttle(size, priority)
+            asset_file.write(buffer[:size])
+            if file_hash:
+                file_hash.update(buffer[:size])
+
+    def _download_raw_threaded(
+        self, reader: HTTPResponse, asset_file: BinaryIO, chunk_size: int, file_hash: Optional[Any], priority: int
+    ) -> None:
+        free_buffers: Queue[memoryview] = Queue()
+        filled_buffers: Queue[Optional[tuple[memoryview, int]]] = Queue()
+        write_errors: list[Exception] = []
+
+        for _ in range(self._write_buffer_count):
+            free_buffers.put(memoryview(bytearray(chunk_size)))
+
+        writer = Thread(
+            target=self._write_buffers,
+            args=(asset_file, file_hash, free_buffers, filled_buffers, write_errors),
+            name='FileDownloader-writer',
+            daemon=True,
+        )
+        writer.start()
+
+        try:
+            while not write_errors:
+                buffer = free_buffers.get()
+                size = reader.readinto(buffer)
+                if not size:
+                    break
+                self._throttle(size, priority)
+                filled_buffers.put((buffer, size))
+        finally:
+            filled_buffers.put(None)
+            writer.join()
+
+        if write_errors:
+            raise write_errors[0]
+
+    def _write_buffers(
+        self,
+        asset_file: BinaryIO,
+        file_hash: Optional[Any],
+        free_buffers: Queue[memoryview],
+        filled_buffers: Queue[Optional[tuple[memoryview, int]]],
+        write_errors: list[Exception],
+    ) -> None:
+        while (item := filled_buffers.get()) is not None:
+            buffer, size = item
+            try:
+                if not write_errors:
+                    asset_file.write(buffer[:size])
+                    if file_hash:
+                        file_hash.update(buffer[:size])
+            except Exception as error:
+                write_errors.append(error)
+            free_buffers.put(buffer)
+
+    def _preallocate_file(self, asset_file: BinaryIO, length: int) -> None:
+        if not self._fallocate or length <= 0:
+            return
+
+        offset = asset_file.tell()
+        if self._fallocate(asset_file.fileno(), FALLOC_FL_KEEP_SIZE, offset, length) != 0:
+            log.debug('Failed to preallocate file', file=asset_file.name, error=os.strerror(ctypes.get_errno()))
+
+    def _load_fallocate(self) -> Optional[Callable[[int, int, int, int], int]]:
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fallocate = libc.fallocate64
+            fallocate.argtypes = [ctypes.c_int, ctypes.c_int, ctypes.c_int64, ctypes.c_int64]
+            fallocate.restype = ctypes.c_int
+            return fallocate
+        except (OSError, AttributeError) as error:
+            log.warning('File preallocation is not supported on this platform', error=error)
+            return None
+
+    def _throttle(self, size: int, priority: int) -> None:
+        if self._scheduler:
+            self._scheduler.acquire(size, priority)
+
+    def _probe(self, file_url: str, headers: dict[str, str]) -> Optional[Response]:
+        with self._session_provider.get_session() as session:
+            response = session.head(file_url, headers=headers, allow_redirects=True)
+
+        if response.status_code != 200:
+            log.warning('Failed to probe file, using single stream', url=file_url, status_code=response.status_code)
+            return None
+
+        accept_ranges = response.headers.get('Accept-Ranges', 'none')
+        content_length = response.headers.get('Content-Length')
+
+        if accept_ranges.lower() != 'bytes' or not content_length or not content_length.isdigit():
+            log.info('Server does not support ranges, using single stream', url=file_url)
+            return None
+
+        if int(content_length) < self._segment_min_size:
+            return None
+
+        return response
+
+    def _download_segments(
+        self, file_url: str, headers: dict[str, str], file_path: str, file_size: int, chunk_size: int, priority: int
+    ) -> None:
+        os.makedirs(self._download_location, exist_ok=True)
+
+        segment_size = -(-file_size // self._segment_count)
+        segments = [(start, min(start + segment_size, file_size) - 1) for start in range(0, file_size, segment_size)]
+
+        log.info('Downloading file in segments', url=file_url, size=file_size, segments=len(segments))
+
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if self._preallocate and hasattr(os, 'posix_fallocate'):
+                os.posix_fallocate(fd, 0, file_size)
+            else:
+                os.ftruncate(fd, file_size)
+            abort = Event()
+            futures = [
+                self._segment_executor.submit(
+                    self._download_segment, file_url, headers, fd, start, end, chunk_size, priority, abort
+                )
+                for start, end in segments
+            ]
+            self._wait_for_segments(futures, abort)
+        except Exception:
+            os.close(fd)
+            os.remove(file_path)
+            raise
+        else:
+            os.close(fd)
+
+    def _wait_for_segments(self, futures: list[Future[None]], abort: Event) -> None:
+        try:
+            for future in as_completed(futures):
+                future.result()
+        except BaseException:
+            abort.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            raise
+
+    def _download_segment(
+        self,
+        file_url: str,
+        headers: dict[str, str],
+        fd: int,
+        start: int,
+        end: int,
+        chunk_size: int,
+        priority: int,
+        abort: Event,
+    ) -> None:
+        if abort.is_set():
+            return
+
+        segment_headers = {**headers, 'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+
+        with self._session_provider.get_session() as session:
+            response = session.get(file_url, stream=True, headers=segment_headers)
+
+        if response.status_code != 206:
+            log.error(
+                'Failed to download file segment',
+                url=file_url,
+                start=start,
+                end=end,
+                status_code=response.status_code,
+                reason=response.reason,
+            )
+            raise ValueError('Failed to download file segment')
+
+        offset = start
+        for chunk in response.iter_content(chunk_size):
+            if abort.is_set():
+                log.debug('Aborting file segment', url=file_url, start=start, end=end)
+                response.close()
+                return
+            self._throttle(len(chunk), priority)
+            os.pwrite(fd, chunk, offset)
+            offset += len(chunk)
+
+        if offset != end + 1:
+            log.error('Incomplete file segment', url=file_url, start=start, end=end, received=offset - start)
+            raise ValueError('Incomplete file segment')
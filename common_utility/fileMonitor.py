@@ -0,0 +1,257 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+from threading import Thread, Event, Lock
+from typing import Callable, Optional
+
+from context_logger import get_logger
+
+log = get_logger('FileMonitor')
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+FILE_EVENTS = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+DIRECTORY_EVENTS = IN_DELETE_SELF | IN_MOVE_SELF
+WATCH_MASK = FILE_EVENTS | DIRECTORY_EVENTS | IN_ONLYDIR
+EVENT_HEADER = struct.Struct('iIII')
+
+FileIdentity = Optional[tuple[int, int, int, int]]
+
+
+def get_file_identity(file_path: str) -> FileIdentity:
+    try:
+        file_stat = os.stat(file_path)
+        return file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size
+    except OSError:
+        return None
+
+
+class IFileMonitor(object):
+
+    def watch(self, file_path: str) -> None:
+        raise NotImplementedError()
+
+    def unwatch(self, file_path: str) -> None:
+        raise NotImplementedError()
+
+    def start(self, on_change: Callable[[str], None]) -> None:
+        raise NotImplementedError()
+
+    def stop(self) -> None:
+        raise NotImplementedError()
+
+
+class PollingFileMonitor(IFileMonitor):
+
+    def __init__(self, poll_interval: float = 2.0) -> None:
+        self._poll_interval = poll_interval
+        self._files: dict[str, FileIdentity] = {}
+        self._files_lock = Lock()
+        self._stop_event = Event()
+        self._thread: Optional[Thread] = None
+
+    def watch(self, file_path: str) -> None:
+        with self._files_lock:
+            self._files[os.path.abspath(file_path)] = get_file_identity(file_path)
+
+    def unwatch(self, file_path: str) -> None:
+        with self._files_lock:
+            self._files.pop(os.path.abspath(file_path), None)
+
+    def start(self, on_change: Callable[[str], None]) -> None:
+        self._stop_event.clear()
+        self._thread = Thread(target=self._poll, args=(on_change,), name='FileMonitor', daemon=True)
+        self._thread.start()
+        log.info('Started polling file monitor', interval=self._poll_interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self, on_change: Callable[[str], None]) -> None:
+        while not self._stop_event.wait(self._poll_interval):
+            with self._files_lock:
+                files = list(self._files.items())
+
+            for file_path, identity in files:
+                current = get_file_identity(file_path)
+                if current != identity:
+                    with self._files_lock:
+                        if file_path in self._files:
+                            self._files[file_path] = current
+                    on_change(file_path)
+
+
+class InotifyFileMonitor(IFileMonitor):
+
+    def __init__(self, retry_interval: float = 1.0) -> None:
+        try:
+            self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError) as error:
+            raise OSError(f'inotify is not available: {error}')
+
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'Failed to initialize inotify')
+
+        self._directories: dict[str, int] = {}
+        self._watches: dict[int, str] = {}
+        self._files: dict[str, set[str]] = {}
+        self._lost_directories: set[str] = set()
+        self._retry_interval = retry_interval
+        self._files_lock = Lock()
+        self._wake_read, self._wake_write = os.pipe()
+        self._thread: Optional[Thread] = None
+
+    def watch(self, file_path: str) -> None:
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+
+        with self._files_lock:
+            if directory not in self._directories:
+                watch = self._libc.inotify_add_watch(self._fd, directory.encode(), WATCH_MASK)
+                if watch < 0:
+                    raise OSError(ctypes.get_errno(), f'Failed to watch directory: {directory}')
+                self._directories[directory] = watch
+                self._watches[watch] = directory
+                self._lost_directories.discard(directory)
+
+            self._files.setdefault(directory, set()).add(file_name)
+
+    def unwatch(self, file_path: str) -> None:
+        directory, file_name = os.path.split(os.path.abspath(file_path))
+
+        with self._files_lock:
+            file_names = self._files.get(directory, set())
+            file_names.discard(file_name)
+
+            if not file_names:
+                self._lost_directories.discard(directory)
+
+            if not file_names and directory in self._directories:
+                watch = self._directories.pop(directory)
+                self._watches.pop(watch, None)
+                self._files.pop(directory, None)
+                self._libc.inotify_rm_watch(self._fd, watch)
+
+    def start(self, on_change: Callable[[str], None]) -> None:
+        self._thread = Thread(target=self._read_events, args=(on_change,), name='FileMonitor', daemon=True)
+        self._thread.start()
+        log.info('Started inotify file monitor')
+
+    def stop(self) -> None:
+        if self._thread:
+            os.write(self._wake_write, b'\0')
+            self._thread.join()
+            self._thread = None
+
+        if self._fd >= 0:
+            for fd in (self._fd, self._wake_read, self._wake_write):
+                os.close(fd)
+            self._fd = -1
+
+    def _read_events(self, on_change: Callable[[str], None]) -> None:
+        while True:
+            timeout = self._retry_interval if self._lost_directories else None
+            readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+
+            if self._wake_read in readable:
+                return
+
+            changed_files = self._restore_watches()
+
+            if self._fd in readable:
+                try:
+                    changed_files.extend(self._get_changed_files(os.read(self._fd, 64 * 1024)))
+                except BlockingIOError:
+                    pass
+
+            for file_path in changed_files:
+                on_change(file_path)
+
+    def _get_changed_files(self, data: bytes) -> list[str]:
+        changed_files: dict[str, None] = {}
+        offset = 0
+
+        with self._files_lock:
+            while offset < len(data):
+                watch, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                name_offset = offset + EVENT_HEADER.size
+                offset = name_offset + length
+                file_name = os.fsdecode(data[name_offset:offset].rstrip(b'\0'))
+
+                for directory in self._get_event_directories(watch, mask):
+                    file_names = self._files.get(directory, set())
+
+                    if not file_name:
+                        changed_files.update(dict.fromkeys(f'{directory}/{name}' for name in file_names))
+                    elif file_name in file_names:
+                        changed_files[f'{directory}/{file_name}'] = None
+
+                if mask & (DIRECTORY_EVENTS | IN_IGNORED):
+                    self._drop_watch(watch, mask)
+
+            return list(changed_files)
+
+    def _drop_watch(self, watch: int, mask: int) -> None:
+        directory = self._watches.pop(watch, None)
+
+        if directory is None:
+            return
+
+        self._directories.pop(directory, None)
+        self._lost_directories.add(directory)
+
+        if mask & IN_MOVE_SELF:
+            self._libc.inotify_rm_watch(self._fd, watch)
+
+        log.warning('Watched directory was removed, waiting for it to reappear', directory=directory)
+
+    def _restore_watches(self) -> list[str]:
+        restored_files: list[str] = []
+
+        with self._files_lock:
+            for directory in list(self._lost_directories):
+                watch = self._libc.inotify_add_watch(self._fd, directory.encode(), WATCH_MASK)
+
+                if watch >= 0:
+                    self._lost_directories.discard(directory)
+                    self._directories[directory] = watch
+                    self._watches[watch] = directory
+                    restored_files.extend(f'{directory}/{name}' for name in self._files.get(directory, set()))
+                    log.info('Restored watch on directory', directory=directory)
+
+        return restored_files
+
+    def _get_event_directories(self, watch: int, mask: int) -> list[str]:
+        if mask & IN_Q_OVERFLOW:
+            return list(self._directories)
+        elif watch in self._watches:
+            return [self._watches[watch]]
+        else:
+            return []
+
+
+def create_file_monitor(poll_interval: float = 2.0) -> IFileMonitor:
+    try:
+        return InotifyFileMonitor()
+    except OSError as error:
+        log.warning('Falling back to polling file monitor', error=error)
+        return PollingFileMonitor(poll_interval)
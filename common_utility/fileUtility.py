@@ -2,13 +2,24 @@
 # SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
 # SPDX-License-Identifier: MIT
 
+import mmap
 import os
 import re
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from os.path import exists
-from typing import Any
+from threading import Lock
+from typing import Any, Iterable, Optional, TextIO
 
-from jinja2 import Environment, FileSystemLoader
+from common_utility.reusableTimer import IReusableTimer, ReusableTimer
+from common_utility.templateRenderer import TemplateRenderer
+
+_template_renderer = TemplateRenderer()
+
+REGEX_SPECIAL_CHARACTERS = re.compile(r'[.^$*+?{}\[\]\\|()\r\n]')
+LINE_SPANNING_CONSTRUCTS = re.compile(r'\\[nsSWDAZxuUN0-9]|\[\^|\(\?[a-zA-Z]*s|\n')
+LINE_BLOCK_SIZE = 64 * 1024
 
 
 def create_directory(directory: str) -> None:
@@ -37,6 +48,92 @@ def append_file(file_path: str, line: str) -> None:
         file.writelines([f'{line}\n'])
 
 
+class IFileAppender(object):
+
+    def append(self, line: str) -> None:
+        raise NotImplementedError()
+
+    def flush(self) -> None:
+        raise NotImplementedError()
+
+    def close(self) -> None:
+        raise NotImplementedError()
+
+    def __enter__(self) -> 'IFileAppender':
+        return self
+
+    def __exit__(self, exc_type: Optional[type], exc_value: Optional[BaseException], traceback: object) -> None:
+        self.close()
+
+
+class FileAppender(IFileAppender):
+
+    def __init__(
+        self,
+        file_path: str,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+        fsync: bool = False,
+        timer: Optional[IReusableTimer] = None,
+    ) -> None:
+        self._buffer_size = buffer_size
+        self._flush_interval = flush_interval
+        self._fsync = fsync
+        self._timer = timer if timer else ReusableTimer()
+        self._buffer: list[str] = []
+        self._buffered_size = 0
+        self._is_timer_armed = False
+        self._is_closed = False
+        self._buffer_lock = Lock()
+        self._write_lock = Lock()
+        create_directory(os.path.dirname(file_path) or '.')
+        self._file: Optional[TextIO] = open(file_path, 'a')
+
+    def append(self, line: str) -> None:
+        with self._buffer_lock:
+            if self._is_closed:
+                raise ValueError('Appender is closed')
+
+            self._buffer.append(f'{line}\n')
+            self._buffered_size += len(line) + 1
+            is_full = self._buffered_size >= self._buffer_size
+
+            if not is_full and not self._is_timer_armed:
+                self._is_timer_armed = True
+                self._timer.start(self._flush_interval, self.flush)
+
+        if is_full:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._buffer_lock:
+                lines, self._buffer = self._buffer, []
+                self._buffered_size = 0
+                self._is_timer_armed = False
+                file = self._file
+
+            if lines and file:
+                file.write(''.join(lines))
+                file.flush()
+                if self._fsync:
+                    os.fsync(file.fileno())
+
+    def close(self) -> None:
+        with self._buffer_lock:
+            if self._is_closed:
+                return
+            self._is_closed = True
+
+        self._timer.cancel()
+        self.flush()
+
+        with self._write_lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
 def delete_file(file_path: str) -> None:
     if exists(file_path):
         if os.path.islink(file_path):
@@ -49,24 +146,80 @@ def is_file_matches_pattern(file_path: str, pattern: str) -> bool:
     if not exists(file_path):
         return False
 
+    text_pattern, literal, is_line_bound = _compile_pattern(pattern)
+
+    if literal is not None:
+        return _find_literal(file_path, literal)
+
+    if is_line_bound:
+        return _search_line_blocks(file_path, text_pattern)
+
     with open(file_path) as file:
-        return re.search(pattern, file.read(), re.MULTILINE) is not None
+        return text_pattern.search(file.read()) is not None
+
+
+def match_files_pattern(file_paths: Iterable[str], pattern: str, max_workers: Optional[int] = None) -> dict[str, bool]:
+    file_paths = list(file_paths)
+
+    with ThreadPoolExecutor(max_workers) as executor:
+        results = executor.map(is_file_matches_pattern, file_paths, [pattern] * len(file_paths))
+        return dict(zip(file_paths, results))
 
 
 def is_file_contains_lines(file: str, expected_lines: list[str]) -> bool:
     if not exists(file):
         return False
 
+    expected_lines_set = set(expected_lines)
+    file_lines_set = set()
+
     with open(file) as f:
-        file_lines = f.read().splitlines()
+        for line in f:
+            for file_line in line.splitlines():
+                if file_line not in expected_lines_set:
+                    return False
+
+                file_lines_set.add(file_line)
 
-    file_lines_set = set(file_lines)
-    expected_lines_set = set(expected_lines)
     return file_lines_set == expected_lines_set
 
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> tuple[re.Pattern[str], Optional[bytes], bool]:
+    text_pattern = re.compile(pattern, re.MULTILINE)
+
+    if pattern.isascii() and not REGEX_SPECIAL_CHARACTERS.search(pattern):
+        return text_pattern, pattern.encode(), True
+
+    return text_pattern, None, not LINE_SPANNING_CONSTRUCTS.search(pattern)
+
+
+def _find_literal(file_path: str, literal: bytes) -> bool:
+    with open(file_path, 'rb') as file:
+        if not os.fstat(file.fileno()).st_size:
+            return not literal
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return data.find(literal) >= 0
+
+
+def _search_line_blocks(file_path: str, pattern: re.Pattern[str]) -> bool:
+    is_end_match = pattern.search('') is not None
+
+    with open(file_path) as file:
+        while block := file.read(LINE_BLOCK_SIZE):
+            if not block.endswith('\n'):
+                block += file.readline()
+
+            match = pattern.search(block)
+
+            if match and match.start() < len(block):
+                return True
+
+            is_end_match = match is not None
+
+    return is_end_match
+
+
 def render_template_file(resource_root: str, template_file: str, context: dict[str, Any]) -> str:
-    template_path = f'{resource_root}/{template_file}'
-    environment = Environment(loader=FileSystemLoader(os.path.dirname(template_path)))
-    template = environment.get_template(os.path.basename(template_path))
-    return f'{template.render(context)}\n'
+    return _template_renderer.render(resource_root, template_file, context)
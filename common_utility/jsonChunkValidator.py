@@ -0,0 +1,212 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import mmap
+import os
+import pickle
+import re
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache
+from threading import Lock
+from typing import TypeVar, Type, List, Any, Optional, NamedTuple
+
+from context_logger import get_logger
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import PydanticCustomError, from_json
+
+log = get_logger('JsonChunkValidator')
+
+TOKEN = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")|([\[{])|([\]}])|(,)')
+WHITESPACE = re.compile(rb'[ \t\n\r]*')
+
+STRING, OPEN, CLOSE, COMMA = 1, 2, 3, 4
+
+T = TypeVar('T', bound=BaseModel)
+
+
+class JsonLayout(NamedTuple):
+    start: int
+    end: int
+    separator: Optional[bytes]
+    comma: int
+
+
+class ChunkResult(NamedTuple):
+    items: Optional[List[Any]]
+    errors: Optional[List[Any]]
+    size: int
+
+
+class IJsonChunkValidator(object):
+
+    def validate_list(self, json_file_path: str, model: Type[T]) -> Optional[List[T]]:
+        raise NotImplementedError()
+
+
+class JsonChunkValidator(IJsonChunkValidator):
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        chunk_size: int = 1024 * 1024,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        self._max_workers = max_workers
+        self._chunk_size = chunk_size
+        self._executor = executor
+        self._executor_lock = Lock()
+
+    def validate_list(self, json_file_path: str, model: Type[T]) -> Optional[List[T]]:
+        if not os.path.getsize(json_file_path):
+            return None
+
+        with open(json_file_path, 'rb') as json_file, mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            layout = self._get_layout(data)
+
+        if layout is None:
+            return None
+
+        results = self._validate_ranges(json_file_path, model, layout)
+
+        if results is None:
+            return None
+
+        if any(result is None for result in results):
+            log.debug('Chunk is not a valid JSON list, falling back to serial load', file=json_file_path)
+            return None
+
+        errors = self._get_errors(results)  # type: ignore
+
+        if errors:
+            raise ValidationError.from_exception_data(f'list[{model.__name__}]', errors)
+
+        return [item for result in results for item in result.items]  # type: ignore
+
+    def _get_layout(self, data: Any) -> Optional[JsonLayout]:
+        start = WHITESPACE.match(data).end()  # type: ignore
+        end = len(data) - 1
+
+        while end > start and data[end] in b' \t\n\r':
+            end -= 1
+
+        if end <= start or data[start] != ord('[') or data[end] != ord(']'):
+            return None
+
+        comma = self._find_first_comma(data, start + 1, end)
+
+        if comma is None:
+            return JsonLayout(start, end, None, 0)
+
+        left, right = comma - 1, WHITESPACE.match(data, comma + 1).end() + 1  # type: ignore
+
+        while left > start and data[left] in b' \t\n\r':
+            left -= 1
+
+        return JsonLayout(start, end, data[left:right], comma - left)
+
+    def _find_first_comma(self, data: Any, position: int, end: int) -> Optional[int]:
+        depth = 0
+
+        for match in TOKEN.finditer(data, position, end):
+            token = match.lastindex
+
+            if token == OPEN:
+                depth += 1
+            elif token == CLOSE:
+                depth -= 1
+            elif token == COMMA and depth == 0:
+                return match.start()
+
+        return None
+
+    def _validate_ranges(
+        self, json_file_path: str, model: Type[T], layout: JsonLayout
+    ) -> Optional[List[Optional[ChunkResult]]]:
+        positions = list(range(layout.start, layout.end, self._chunk_size)) + [layout.end]
+        ranges = list(zip(positions, positions[1:]))
+
+        if layout.separator is None or len(ranges) <= 1:
+            return [validate_range(json_file_path, model, layout, layout.start, layout.end)]
+
+        log.debug('Validating JSON list in parallel', file=json_file_path, chunks=len(ranges))
+
+        executor = self._get_executor()
+        futures = [executor.submit(validate_range, json_file_path, model, layout, start, end) for start, end in ranges]
+
+        try:
+            return [future.result() for future in futures]
+        except (pickle.PicklingError, AttributeError, TypeError) as error:
+            log.warning(
+                'Failed to validate JSON list in workers, falling back to serial load', model=model, error=error
+            )
+            for future in futures:
+                future.cancel()
+            return None
+
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if not self._executor:
+                self._executor = ProcessPoolExecutor(self._max_workers)
+            return self._executor
+
+    def _get_errors(self, results: List[ChunkResult]) -> List[Any]:
+        errors = []
+        first_index = 0
+
+        for result in results:
+            for error in result.errors if result.errors else []:
+                location = error['loc']
+
+                if location and isinstance(location[0], int):
+                    location = (location[0] + first_index, *location[1:])
+
+                errors.append(
+                    {'type': PydanticCustomError(error['type'], error['msg']), 'loc': location, 'input': error['input']}
+                )
+
+            first_index += result.size
+
+        return errors
+
+
+def validate_range(
+    json_file_path: str, model: Type[T], layout: JsonLayout, start: int, end: int
+) -> Optional[ChunkResult]:
+    with open(json_file_path, 'rb') as json_file, mmap.mmap(json_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        first, last = _find_boundary(data, layout, start), _find_boundary(data, layout, end)
+
+        if first == last:
+            return ChunkResult([], None, 0)
+
+        begin = first + 1
+
+        if WHITESPACE.match(data, begin).end() >= last and (first, last) != (layout.start, layout.end):  # type: ignore
+            return None
+
+        chunk_data = b'[' + data[begin:last] + b']'
+
+    try:
+        items = _get_list_adapter(model).validate_json(chunk_data)
+        return ChunkResult(items, None, len(items))
+    except ValidationError as error:
+        errors = error.errors(include_url=False, include_context=False)
+
+    if any(error['type'] == 'json_invalid' for error in errors):
+        return None
+
+    return ChunkResult(None, errors, len(from_json(chunk_data)))
+
+
+def _find_boundary(data: Any, layout: JsonLayout, position: int) -> int:
+    if position <= layout.start or layout.separator is None:
+        return layout.start if position <= layout.start else layout.end
+
+    index = data.find(layout.separator, position, layout.end)
+
+    return index + layout.comma if index >= 0 else layout.end
+
+
+@lru_cache(maxsize=None)
+def _get_list_adapter(model: Type[T]) -> TypeAdapter[Any]:
+    return TypeAdapter(List[model])  # type: ignore
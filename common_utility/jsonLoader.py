@@ -2,18 +2,41 @@
 # SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
 # SPDX-License-Identifier: MIT
 
+import hashlib
+import itertools
 import json
 import os
-from typing import TypeVar, Type, Union, List, Callable, Any
+import pickle
+import re
+from collections import OrderedDict
+from enum import Enum
+from threading import Lock
+from typing import TypeVar, Type, Union, List, Callable, Any, Optional, Hashable, Iterator, TextIO
 
 from context_logger import get_logger
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic.errors import PydanticInvalidForJsonSchema
+
+from common_utility.jsonChunkValidator import IJsonChunkValidator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore
 
 log = get_logger('JsonLoader')
 
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+
 T = TypeVar('T', bound=BaseModel)
 
 
+class JsonEngine(Enum):
+    PYTHON = 'python'
+    ORJSON = 'orjson'
+    NATIVE = 'native'
+
+
 class IJsonLoader(object):
 
     def load(self, json_file_path: str, model: Type[T]) -> T:
@@ -22,26 +45,195 @@ class IJsonLoader(object):
     def load_list(self, json_file_path: str, model: Type[T]) -> List[T]:
         raise NotImplementedError()
 
+    def iter_list(self, json_file_path: str, model: Type[T]) -> Iterator[T]:
+        raise NotImplementedError()
+
+    def iter_batches(self, json_file_path: str, model: Type[T], batch_size: int) -> Iterator[List[T]]:
+        raise NotImplementedError()
+
 
 class JsonLoader(IJsonLoader):
 
+    def __init__(
+        self,
+        engine: JsonEngine = JsonEngine.PYTHON,
+        read_size: int = 64 * 1024,
+        chunk_validator: Optional[IJsonChunkValidator] = None,
+    ) -> None:
+        self._engine = engine
+        self._read_size = read_size
+        self._chunk_validator = chunk_validator
+        self._list_adapters: dict[type, TypeAdapter[Any]] = {}
+        self._adapters_lock = Lock()
+
     def load(self, json_data: str, model: Type[T]) -> T:
+        if self._engine == JsonEngine.NATIVE:
+            return self._load_native(json_data, model, dict, model.model_validate_json)  # type: ignore
+
         data = self._load_data(json_data)
 
         return self._validate(data, dict, lambda: model(**data))  # type: ignore
 
     def load_list(self, json_data: str, model: Type[T]) -> List[T]:
+        if self._chunk_validator and os.path.isfile(json_data):
+            instances = self._load_chunked(json_data, model)
+            if instances is not None:
+                return instances
+
+        if self._engine == JsonEngine.NATIVE:
+            validate_json = self._get_list_adapter(model).validate_json
+            return self._load_native(json_data, model, list, validate_json)  # type: ignore
+
         data = self._load_data(json_data)
 
         return self._validate(data, list, lambda: [model(**item) for item in data])  # type: ignore
 
+    def iter_list(self, json_file_path: str, model: Type[T]) -> Iterator[T]:
+        with open(json_file_path, 'r') as json_file:
+            for item in self._iter_items(json_file):
+                yield self._validate_item(item, model)
+
+    def iter_batches(self, json_file_path: str, model: Type[T], batch_size: int) -> Iterator[List[T]]:
+        items = self.iter_list(json_file_path, model)
+
+        while batch := list(itertools.islice(items, batch_size)):
+            yield batch
+
+    def _iter_items(self, json_file: TextIO) -> Iterator[Any]:
+        buffer = json_file.read(self._read_size)
+
+        while buffer and not buffer.strip():
+            buffer = json_file.read(self._read_size)
+
+        if buffer.lstrip().startswith('['):
+            yield from self._iter_array_items(json_file, buffer)
+        else:
+            yield from self._iter_ndjson_items(json_file, buffer + json_file.readline())
+
+    def _iter_ndjson_items(self, json_file: TextIO, buffer: str) -> Iterator[Any]:
+        for line in itertools.chain(buffer.splitlines(), json_file):
+            if line.strip():
+                yield json.loads(line)
+
+    def _iter_array_items(self, json_file: TextIO, buffer: str) -> Iterator[Any]:
+        decoder = json.JSONDecoder()
+        position = WHITESPACE.match(buffer).end() + 1  # type: ignore
+        read_size = self._read_size
+        is_eof = False
+        is_item_expected = False
+
+        while True:
+            position = WHITESPACE.match(buffer, position).end()  # type: ignore
+
+            if position < len(buffer) and buffer[position] == ']':
+                if is_item_expected:
+                    raise json.JSONDecodeError('Expecting value', buffer, position)
+                self._check_array_end(json_file, buffer, position + 1)
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                end = WHITESPACE.match(buffer, end).end()  # type: ignore
+                if end >= len(buffer) and not is_eof:
+                    raise json.JSONDecodeError('Item delimiter not yet read', buffer, end)
+            except json.JSONDecodeError:
+                if is_eof:
+                    raise
+                chunk = json_file.read(read_size)
+                is_eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                read_size *= 2
+                continue
+
+            read_size = self._read_size
+            is_item_expected = end < len(buffer) and buffer[end] == ','
+
+            if is_item_expected:
+                position = end + 1
+            elif end < len(buffer) and buffer[end] == ']':
+                position = end
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buffer, end)
+
+            yield item
+
+    def _check_array_end(self, json_file: TextIO, buffer: str, position: int) -> None:
+        while position < len(buffer):
+            position = WHITESPACE.match(buffer, position).end()  # type: ignore
+
+            if position < len(buffer):
+                raise json.JSONDecodeError('Extra data', buffer, position)
+
+            buffer, position = json_file.read(self._read_size), 0
+
+    def _validate_item(self, item: Any, model: Type[T]) -> T:
+        return self._validate(item, dict, lambda: model(**item))  # type: ignore
+
     def _load_data(self, json_data: str) -> Any:
+        if self._engine == JsonEngine.ORJSON and orjson:
+            return orjson.loads(self._read_data(json_data))
+
         if os.path.isfile(json_data):
             with open(json_data, 'r') as json_file:
                 return json.load(json_file)
         else:
             return json.loads(json_data)
 
+    def _read_data(self, json_data: str) -> Union[str, bytes]:
+        if os.path.isfile(json_data):
+            with open(json_data, 'rb') as json_file:
+                return json_file.read()
+        else:
+            return json_data
+
+    def _load_native(
+        self, json_data: str, model: Type[T], root_type: Any, validate_json: Callable[[Union[str, bytes]], Any]
+    ) -> Union[T, List[T]]:
+        raw_data = self._read_data(json_data)
+
+        if self._get_root_type(raw_data) is not root_type:
+            return self._validate(self._parse_data(raw_data), root_type, lambda: validate_json(raw_data))
+
+        try:
+            return validate_json(raw_data)  # type: ignore
+        except ValidationError as error:
+            if any(detail['type'] == 'json_invalid' for detail in error.errors()):
+                self._parse_data(raw_data)
+            log.error('Failed to load JSON file', error=error)
+            raise error
+
+    def _load_chunked(self, json_file_path: str, model: Type[T]) -> Optional[List[T]]:
+        try:
+            return self._chunk_validator.validate_list(json_file_path, model)  # type: ignore
+        except ValidationError as error:
+            if any(detail['type'] == 'json_invalid' for detail in error.errors()):
+                self._parse_data(self._read_data(json_file_path))
+            log.error('Failed to load JSON file', error=error)
+            raise error
+
+    def _parse_data(self, raw_data: Union[str, bytes]) -> Any:
+        return json.loads(raw_data)
+
+    def _get_root_type(self, raw_data: Union[str, bytes]) -> Optional[type]:
+        start = raw_data.lstrip()[:1]
+
+        if start in ('{', b'{'):
+            return dict
+        if start in ('[', b'['):
+            return list
+
+        return None
+
+    def _get_list_adapter(self, model: Type[T]) -> TypeAdapter[Any]:
+        with self._adapters_lock:
+            adapter = self._list_adapters.get(model)
+
+            if adapter is None:
+                adapter = self._list_adapters[model] = TypeAdapter(List[model])  # type: ignore
+
+            return adapter
+
     def _validate(self, data: Any, root_type: Any, deserialize: Callable[[], Union[T, List[T]]]) -> Union[T, List[T]]:
         try:
             if isinstance(data, root_type):
@@ -51,3 +243,163 @@ class JsonLoader(IJsonLoader):
         except ValueError as error:
             log.error('Failed to load JSON file', error=error)
             raise error
+
+
+class CachedJsonLoader(IJsonLoader):
+
+    def __init__(self, json_loader: Optional[IJsonLoader] = None, max_size: int = 128, copy: bool = False) -> None:
+        self._json_loader = json_loader if json_loader else JsonLoader()
+        self._max_size = max_size
+        self._copy_instances = copy
+        self._cache: OrderedDict[Hashable, Any] = OrderedDict()
+        self._cache_lock = Lock()
+
+    def load(self, json_data: str, model: Type[T]) -> T:
+        result: T = self._load_cached(json_data, model, False, self._json_loader.load)
+        return result
+
+    def load_list(self, json_data: str, model: Type[T]) -> List[T]:
+        result: List[T] = self._load_cached(json_data, model, True, self._json_loader.load_list)
+        return result
+
+    def iter_list(self, json_file_path: str, model: Type[T]) -> Iterator[T]:
+        return self._json_loader.iter_list(json_file_path, model)
+
+    def iter_batches(self, json_file_path: str, model: Type[T], batch_size: int) -> Iterator[List[T]]:
+        return self._json_loader.iter_batches(json_file_path, model, batch_size)
+
+    def clear(self) -> None:
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _load_cached(self, json_data: str, model: Type[T], is_list: bool, load: Callable[[str, Type[T]], Any]) -> Any:
+        if not os.path.isfile(json_data):
+            return load(json_data, model)
+
+        file_stat = os.stat(json_data)
+        key = (os.path.realpath(json_data), file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size, model, is_list)
+
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._copy(self._cache[key], model)
+
+        result = load(json_data, model)
+
+        with self._cache_lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+
+        return self._copy(result, model)
+
+    def _copy(self, result: Any, model: Type[T]) -> Any:
+        is_shared = not self._copy_instances or model.model_config.get('frozen', False)
+
+        if isinstance(result, list):
+            return list(result) if is_shared else [item.model_copy(deep=True) for item in result]
+        else:
+            return result if is_shared else result.model_copy(deep=True)
+
+
+class SnapshotJsonLoader(IJsonLoader):
+
+    def __init__(
+        self,
+        snapshot_location: str,
+        json_loader: Optional[IJsonLoader] = None,
+        chunk_size: int = 1000 * 1000,
+        version: str = '',
+    ) -> None:
+        self._snapshot_location = snapshot_location
+        self._json_loader = json_loader if json_loader else JsonLoader()
+        self._chunk_size = chunk_size
+        self._version = version
+        self._schema_hashes: dict[type, Optional[str]] = {}
+        self._schema_lock = Lock()
+
+    def load(self, json_data: str, model: Type[T]) -> T:
+        result: T = self._load_snapshot(json_data, model, False, self._json_loader.load)
+        return result
+
+    def load_list(self, json_data: str, model: Type[T]) -> List[T]:
+        result: List[T] = self._load_snapshot(json_data, model, True, self._json_loader.load_list)
+        return result
+
+    def iter_list(self, json_file_path: str, model: Type[T]) -> Iterator[T]:
+        return self._json_loader.iter_list(json_file_path, model)
+
+    def iter_batches(self, json_file_path: str, model: Type[T], batch_size: int) -> Iterator[List[T]]:
+        return self._json_loader.iter_batches(json_file_path, model, batch_size)
+
+    def _load_snapshot(self, json_data: str, model: Type[T], is_list: bool, load: Callable[[str, Type[T]], Any]) -> Any:
+        schema_hash = self._get_schema_hash(model)
+
+        if not os.path.isfile(json_data) or schema_hash is None:
+            return load(json_data, model)
+
+        model_name = f'{model.__module__}.{model.__qualname__}'
+        key = (self._hash_file(json_data), schema_hash, self._version, model_name, is_list)
+        snapshot_name = hashlib.sha256(f'{os.path.realpath(json_data)}:{model_name}:{is_list}'.encode()).hexdigest()
+        snapshot_path = f'{self._snapshot_location}/{snapshot_name}.snapshot'
+
+        result = self._read_snapshot(snapshot_path, key)
+
+        if result is None:
+            result = load(json_data, model)
+            self._write_snapshot(snapshot_path, key, result)
+
+        return result
+
+    def _read_snapshot(self, snapshot_path: str, key: tuple[Any, ...]) -> Any:
+        if not os.path.isfile(snapshot_path):
+            return None
+
+        try:
+            with open(snapshot_path, 'rb') as snapshot_file:
+                if pickle.load(snapshot_file) != key:
+                    log.debug('Snapshot is outdated', snapshot=snapshot_path)
+                    return None
+                return pickle.load(snapshot_file)
+        except Exception as error:
+            log.warning('Failed to read snapshot, reloading JSON file', snapshot=snapshot_path, error=error)
+            return None
+
+    def _write_snapshot(self, snapshot_path: str, key: tuple[Any, ...], result: Any) -> None:
+        temp_path = f'{snapshot_path}.tmp'
+
+        try:
+            os.makedirs(self._snapshot_location, exist_ok=True)
+            with open(temp_path, 'wb') as snapshot_file:
+                pickle.dump(key, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(result, snapshot_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, snapshot_path)
+        except Exception as error:
+            log.warning('Failed to write snapshot', snapshot=snapshot_path, error=error)
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+
+    def _hash_file(self, file_path: str) -> str:
+        file_hash = hashlib.sha256()
+
+        with open(file_path, 'rb') as json_file:
+            while chunk := json_file.read(self._chunk_size):
+                file_hash.update(chunk)
+
+        return file_hash.hexdigest()
+
+    def _get_schema_hash(self, model: Type[T]) -> Optional[str]:
+        with self._schema_lock:
+            if model not in self._schema_hashes:
+                self._schema_hashes[model] = self._create_schema_hash(model)
+
+            return self._schema_hashes[model]
+
+    def _create_schema_hash(self, model: Type[T]) -> Optional[str]:
+        try:
+            schema = json.dumps(model.model_json_schema(), sort_keys=True)
+            return hashlib.sha256(schema.encode()).hexdigest()
+        except PydanticInvalidForJsonSchema as error:
+            log.warning('Failed to generate model schema, snapshot is disabled', model=model.__qualname__, error=error)
+            return None
@@ -0,0 +1,112 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+from contextlib import contextmanager
+from enum import Enum
+from typing import Iterable, Optional, BinaryIO, Iterator
+
+from context_logger import get_logger
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from common_utility.fileUtility import create_directory
+
+log = get_logger('JsonWriter')
+
+
+class JsonFormat(Enum):
+    ARRAY = 'array'
+    NDJSON = 'ndjson'
+
+
+class IJsonWriter(object):
+
+    def write(self, json_file_path: str, instance: BaseModel) -> None:
+        raise NotImplementedError()
+
+    def write_list(
+        self, json_file_path: str, instances: Iterable[BaseModel], json_format: JsonFormat = JsonFormat.ARRAY
+    ) -> int:
+        raise NotImplementedError()
+
+
+class JsonWriter(IJsonWriter):
+
+    def __init__(
+        self,
+        indent: Optional[int] = None,
+        exclude_none: bool = False,
+        buffer_size: int = 1000 * 1000,
+        fsync: bool = False,
+    ) -> None:
+        self._indent = indent
+        self._exclude_none = exclude_none
+        self._buffer_size = buffer_size
+        self._fsync = fsync
+
+    def write(self, json_file_path: str, instance: BaseModel) -> None:
+        with self._open(json_file_path) as json_file:
+            json_file.write(self._serialize(instance, self._indent))
+            json_file.write(b'\n')
+
+    def write_list(
+        self, json_file_path: str, instances: Iterable[BaseModel], json_format: JsonFormat = JsonFormat.ARRAY
+    ) -> int:
+        with self._open(json_file_path) as json_file:
+            if json_format == JsonFormat.NDJSON:
+                count = self._write_ndjson(json_file, instances)
+            else:
+                count = self._write_array(json_file, instances)
+
+        log.debug('Written JSON list', file=json_file_path, format=json_format.value, count=count)
+
+        return count
+
+    def _write_array(self, json_file: BinaryIO, instances: Iterable[BaseModel]) -> int:
+        separator = b',\n' if self._indent is not None else b','
+        count = 0
+
+        json_file.write(b'[\n' if self._indent is not None else b'[')
+
+        for instance in instances:
+            if count:
+                json_file.write(separator)
+            json_file.write(self._serialize(instance, self._indent))
+            count += 1
+
+        json_file.write(b'\n]\n' if self._indent is not None and count else b']\n')
+
+        return count
+
+    def _write_ndjson(self, json_file: BinaryIO, instances: Iterable[BaseModel]) -> int:
+        count = 0
+
+        for instance in instances:
+            json_file.write(self._serialize(instance, None))
+            json_file.write(b'\n')
+            count += 1
+
+        return count
+
+    def _serialize(self, instance: BaseModel, indent: Optional[int]) -> bytes:
+        return to_json(instance, indent=indent, exclude_none=self._exclude_none)
+
+    @contextmanager
+    def _open(self, json_file_path: str) -> Iterator[BinaryIO]:
+        temp_path = f'{json_file_path}.tmp'
+        create_directory(os.path.dirname(json_file_path) or '.')
+
+        try:
+            with open(temp_path, 'wb', buffering=self._buffer_size) as json_file:
+                yield json_file
+                json_file.flush()
+                if self._fsync:
+                    os.fsync(json_file.fileno())
+            os.replace(temp_path, json_file_path)
+        except BaseException as error:
+            log.error('Failed to write JSON file', file=json_file_path, error=error)
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from enum import Enum
+from threading import Lock
+from typing import Any, Iterable, Optional, Mapping
+
+from context_logger import get_logger
+
+from common_utility.reusableTimer import IReusableTimer, ReusableTimer
+
+log = get_logger('PeriodicTimer')
+
+
+class OverrunPolicy(Enum):
+    SKIP = 'skip'
+    COALESCE = 'coalesce'
+    QUEUE = 'queue'
+
+
+class PeriodicTimer(IReusableTimer):
+
+    def __init__(
+        self,
+        policy: OverrunPolicy = OverrunPolicy.SKIP,
+        executor: Optional[Executor] = None,
+        timer: Optional[IReusableTimer] = None,
+        max_queued: int = 16,
+    ) -> None:
+        self._policy = policy
+        self._executor = executor if executor else ThreadPoolExecutor(1, thread_name_prefix='PeriodicTimer')
+        self._timer = timer if timer else ReusableTimer()
+        self._max_queued = max_queued
+        self._lock = Lock()
+        self._period = 0.0
+        self._function: Any = None
+        self._args: Iterable[Any] = []
+        self._kwargs: Mapping[str, Any] = {}
+        self._generation = 0
+        self._is_armed = False
+        self._start_time = 0.0
+        self._tick = 0
+        self._active = 0
+        self._is_coalesced = False
+        self._overruns = 0
+
+    def start(
+        self,
+        interval: float,
+        function: Any,
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[Mapping[str, Any]] = None,
+    ) -> IReusableTimer:
+        with self._lock:
+            log.debug('Starting periodic timer', period=interval, function=function, policy=self._policy.value)
+            self._period = interval
+            self._function = function
+            self._args = args if args is not None else []
+            self._kwargs = kwargs if kwargs is not None else {}
+            self._arm()
+        return self
+
+    def restart(self) -> None:
+        with self._lock:
+            if self._function is not None:
+                self._arm()
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._function = None
+            self._generation += 1
+            self._is_armed = False
+            self._is_coalesced = False
+            self._timer.cancel()
+
+    def is_alive(self) -> bool:
+        with self._lock:
+            return self._is_armed or self._active > 0
+
+    def get_overruns(self) -> int:
+        with self._lock:
+            return self._overruns
+
+    def _arm(self) -> None:
+        self._generation += 1
+        self._is_armed = True
+        self._is_coalesced = False
+        self._start_time = time.monotonic()
+        self._tick = 1
+        self._timer.start(self._period, self._on_tick, args=[self._generation])
+
+    def _on_tick(self, generation: int) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+
+            now = time.monotonic()
+            missed = int((now - self._start_time) / self._period) - self._tick
+            self._tick += 1 + max(missed, 0)
+            self._timer.start(self._start_time + self._tick * self._period - now, self._on_tick, args=[generation])
+
+            if missed > 0:
+                self._overruns += missed
+                log.warning('Periodic timer missed ticks', function=self._function, missed=missed)
+
+            if self._active == 0 or (self._policy == OverrunPolicy.QUEUE and self._active < self._max_queued):
+                self._active += 1
+                call = (generation, self._function, self._args, self._kwargs)
+            else:
+                self._overruns += 1
+                self._is_coalesced = self._policy == OverrunPolicy.COALESCE
+                log.debug('Periodic timer overrun', function=self._function, policy=self._policy.value)
+                return
+
+        self._executor.submit(self._execute, *call)
+
+    def _execute(self, generation: int, function: Any, args: Iterable[Any], kwargs: Mapping[str, Any]) -> None:
+        while True:
+            try:
+                function(*args, **kwargs)
+            except Exception as error:
+                log.error('Periodic timer function failed', function=function, error=error)
+
+            with self._lock:
+                if self._is_coalesced and generation == self._generation:
+                    self._is_coalesced = False
+                    continue
+
+                self._active -= 1
+                return
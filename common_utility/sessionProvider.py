@@ -2,7 +2,14 @@
 # SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
 # SPDX-License-Identifier: MIT
 
+from threading import Lock, Thread, current_thread
+from typing import Optional, NamedTuple
+
+from context_logger import get_logger
 from requests import Session
+from requests.adapters import HTTPAdapter
+
+log = get_logger('SessionProvider')
 
 
 class ISessionProvider(object):
@@ -15,3 +22,95 @@ class SessionProvider(ISessionProvider):
 
     def get_session(self) -> Session:
         return Session()
+
+
+class SessionPoolStats(NamedTuple):
+    session_hits: int
+    session_misses: int
+    connections: int
+    requests: int
+
+
+class PooledSession(Session):
+
+    def close(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        super().close()
+
+
+class PooledSessionProvider(ISessionProvider):
+
+    def __init__(
+        self,
+        thread_local: bool = True,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        host_pool_sizes: Optional[dict[str, int]] = None,
+    ) -> None:
+        self._thread_local = thread_local
+        self._pool_connections = pool_connections
+        self._pool_maxsize = pool_maxsize
+        self._host_pool_sizes = host_pool_sizes if host_pool_sizes else dict()
+        self._sessions_lock = Lock()
+        self._sessions: dict[Optional[Thread], PooledSession] = {}
+        self._session_hits = 0
+        self._session_misses = 0
+
+    def get_session(self) -> Session:
+        owner = current_thread() if self._thread_local else None
+
+        with self._sessions_lock:
+            session = self._sessions.get(owner)
+
+            if session is not None:
+                self._session_hits += 1
+                return session
+
+            self._session_misses += 1
+            self._close_orphaned_sessions()
+            session = self._sessions[owner] = self._create_session()
+
+            return session
+
+    def get_stats(self) -> SessionPoolStats:
+        with self._sessions_lock:
+            connections = 0
+            requests = 0
+
+            for session in self._sessions.values():
+                for adapter in {id(adapter): adapter for adapter in session.adapters.values()}.values():
+                    if isinstance(adapter, HTTPAdapter):
+                        for key in adapter.poolmanager.pools.keys():
+                            pool = adapter.poolmanager.pools[key]
+                            connections += pool.num_connections
+                            requests += pool.num_requests
+
+            return SessionPoolStats(self._session_hits, self._session_misses, connections, requests)
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            log.info('Closing pooled sessions', sessions=len(self._sessions))
+
+            for session in self._sessions.values():
+                session.shutdown()
+
+            self._sessions.clear()
+
+    def _close_orphaned_sessions(self) -> None:
+        for owner in [owner for owner in self._sessions if owner is not None and not owner.is_alive()]:
+            self._sessions.pop(owner).shutdown()
+
+    def _create_session(self) -> PooledSession:
+        session = PooledSession()
+        adapter = HTTPAdapter(pool_connections=self._pool_connections, pool_maxsize=self._pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+
+        for prefix, pool_size in self._host_pool_sizes.items():
+            session.mount(prefix, HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+
+        log.debug('Created pooled session', thread_local=self._thread_local)
+
+        return session
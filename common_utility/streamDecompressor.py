@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import bz2
+import lzma
+import zlib
+from typing import Any, Callable, Iterator, Optional
+
+DECOMPRESSOR_FACTORIES: dict[str, Callable[[], Any]] = {
+    '.gz': lambda: zlib.decompressobj(wbits=zlib.MAX_WBITS | 16),
+    '.xz': lambda: lzma.LZMADecompressor(),
+    '.lzma': lambda: lzma.LZMADecompressor(),
+    '.bz2': lambda: bz2.BZ2Decompressor(),
+}
+
+
+class StreamDecompressor(object):
+
+    @staticmethod
+    def get_extension(file_name: str) -> Optional[str]:
+        for extension in DECOMPRESSOR_FACTORIES:
+            if file_name.endswith(extension):
+                return extension
+        return None
+
+    def __init__(self, extension: str, max_length: int = 1000 * 1000) -> None:
+        self._create_decompressor = DECOMPRESSOR_FACTORIES[extension]
+        self._decompressor = self._create_decompressor()
+        self._max_length = max_length
+
+    def decompress(self, data: bytes) -> Iterator[bytes]:
+        while True:
+            if self._decompressor.eof:
+                data = self._decompressor.unused_data + data
+                if not data:
+                    return
+                self._decompressor = self._create_decompressor()
+
+            output = self._decompressor.decompress(data, self._max_length)
+            data = b'' if self._decompressor.eof else getattr(self._decompressor, 'unconsumed_tail', b'')
+
+            if output:
+                yield output
+
+            if not data and not self._decompressor.eof and self._needs_input(output):
+                return
+
+    def finish(self) -> None:
+        if not self._decompressor.eof:
+            raise EOFError('Compressed stream ended before the end-of-stream marker was reached')
+
+    def _needs_input(self, output: bytes) -> bool:
+        needs_input: bool = getattr(self._decompressor, 'needs_input', len(output) < self._max_length)
+        return needs_input
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import os
+from threading import Lock
+from typing import Any, Optional, Mapping
+
+from context_logger import get_logger
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, Template
+
+log = get_logger('TemplateRenderer')
+
+
+class ITemplateRenderer(object):
+
+    def render(self, resource_root: str, template_file: str, context: Mapping[str, Any]) -> str:
+        raise NotImplementedError()
+
+    def render_files(
+        self, resource_root: str, template_file: str, contexts: Mapping[str, Mapping[str, Any]]
+    ) -> list[str]:
+        raise NotImplementedError()
+
+
+class TemplateRenderer(ITemplateRenderer):
+
+    def __init__(self, bytecode_cache_dir: Optional[str] = None, cache_size: int = 400) -> None:
+        self._bytecode_cache_dir = bytecode_cache_dir
+        self._cache_size = cache_size
+        self._environments: dict[str, Environment] = {}
+        self._environments_lock = Lock()
+
+    def render(self, resource_root: str, template_file: str, context: Mapping[str, Any]) -> str:
+        template = self._get_template(resource_root, template_file)
+        return f'{template.render(context)}\n'
+
+    def render_files(
+        self, resource_root: str, template_file: str, contexts: Mapping[str, Mapping[str, Any]]
+    ) -> list[str]:
+        template = self._get_template(resource_root, template_file)
+
+        for output_path, context in contexts.items():
+            self._write_file(template, output_path, context)
+
+        log.debug('Rendered template files', template=template_file, count=len(contexts))
+
+        return list(contexts)
+
+    def _get_template(self, resource_root: str, template_file: str) -> Template:
+        template_path = f'{resource_root}/{template_file}'
+        return self._get_environment(os.path.dirname(template_path)).get_template(os.path.basename(template_path))
+
+    def _get_environment(self, template_dir: str) -> Environment:
+        with self._environments_lock:
+            environment = self._environments.get(template_dir)
+
+            if environment is None:
+                environment = self._environments[template_dir] = Environment(
+                    loader=FileSystemLoader(template_dir),
+                    auto_reload=True,
+                    cache_size=self._cache_size,
+                    bytecode_cache=self._create_bytecode_cache(),
+                )
+                log.debug('Created template environment', directory=template_dir)
+
+            return environment
+
+    def _create_bytecode_cache(self) -> Optional[FileSystemBytecodeCache]:
+        if not self._bytecode_cache_dir:
+            return None
+
+        os.makedirs(self._bytecode_cache_dir, exist_ok=True)
+        return FileSystemBytecodeCache(self._bytecode_cache_dir)
+
+    def _write_file(self, template: Template, output_path: str, context: Mapping[str, Any]) -> None:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        temp_path = f'{output_path}.tmp'
+
+        try:
+            with open(temp_path, 'w') as output_file:
+                output_file.writelines(template.generate(context))
+                output_file.write('\n')
+            os.replace(temp_path, output_path)
+        except BaseException:
+            if os.path.isfile(temp_path):
+                os.remove(temp_path)
+            raise
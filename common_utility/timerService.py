@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2024 Ferenc Nandor Janky <ferenj@effective-range.com>
+# SPDX-FileCopyrightText: 2024 Attila Gombos <attila.gombos@effective-range.com>
+# SPDX-License-Identifier: MIT
+
+import heapq
+import itertools
+import time
+from concurrent.futures import Executor
+from threading import Condition, Thread, current_thread
+from typing import Any, Iterable, Optional, Mapping
+
+from context_logger import get_logger
+
+from common_utility.reusableTimer import IReusableTimer
+
+log = get_logger('TimerService')
+
+
+class ITimerService(object):
+
+    def create_timer(self) -> IReusableTimer:
+        raise NotImplementedError()
+
+    def shutdown(self) -> None:
+        raise NotImplementedError()
+
+
+class TimerService(ITimerService):
+
+    def __init__(self, executor: Optional[Executor] = None, compact_threshold: int = 1024) -> None:
+        self._executor = executor
+        self._compact_threshold = compact_threshold
+        self._condition = Condition()
+        self._queue: list[tuple[float, int, 'ServiceTimer', int]] = []
+        self._sequence = itertools.count()
+        self._stale_entries = 0
+        self._thread: Optional[Thread] = None
+
+    def create_timer(self) -> IReusableTimer:
+        return ServiceTimer(self)
+
+    def shutdown(self) -> None:
+        with self._condition:
+            for _, _, timer, _ in self._queue:
+                timer._deadline = timer._queued_deadline = None
+            self._queue.clear()
+            self._stale_entries = 0
+            thread, self._thread = self._thread, None
+            self._condition.notify_all()
+
+        if thread:
+            thread.join()
+            log.info('Timer service stopped')
+
+    def _schedule(self, timer: 'ServiceTimer', interval: float) -> None:
+        with self._condition:
+            timer._deadline = time.monotonic() + interval
+
+            if timer._queued_deadline is not None and timer._queued_deadline <= timer._deadline:
+                return
+
+            if timer._queued_deadline is not None:
+                self._stale_entries += 1
+
+            timer._generation += 1
+            timer._queued_deadline = timer._deadline
+            heapq.heappush(self._queue, (timer._deadline, next(self._sequence), timer, timer._generation))
+
+            if self._queue[0][2] is timer:
+                self._condition.notify()
+
+            self._compact()
+            self._start_thread()
+
+    def _unschedule(self, timer: 'ServiceTimer') -> None:
+        with self._condition:
+            timer._deadline = None
+
+    def _is_alive(self, timer: 'ServiceTimer') -> bool:
+        with self._condition:
+            return timer._deadline is not None or timer._is_firing
+
+    def _start_thread(self) -> None:
+        if self._thread is None:
+            self._thread = Thread(target=self._run, name='TimerService', daemon=True)
+            self._thread.start()
+            log.info('Timer service started')
+
+    def _compact(self) -> None:
+        if self._stale_entries > self._compact_threshold and self._stale_entries * 2 > len(self._queue):
+            self._queue = [entry for entry in self._queue if entry[3] == entry[2]._generation]
+            heapq.heapify(self._queue)
+            self._stale_entries = 0
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                timer = self._wait_for_expired()
+
+                if timer is None:
+                    return
+
+                timer._is_firing = True
+                call = (timer, timer._function, timer._args, timer._kwargs)
+
+            self._fire(*call)
+
+    def _wait_for_expired(self) -> Optional['ServiceTimer']:
+        while self._thread is current_thread():
+            if not self._queue:
+                self._condition.wait()
+                continue
+
+            deadline, _, timer, generation = self._queue[0]
+            now = time.monotonic()
+
+            if deadline > now:
+                self._condition.wait(deadline - now)
+                continue
+
+            heapq.heappop(self._queue)
+
+            if generation != timer._generation:
+                self._stale_entries -= 1
+                continue
+
+            timer._queued_deadline = None
+
+            if timer._deadline is None:
+                continue
+
+            if timer._deadline > now:
+                timer._generation += 1
+                timer._queued_deadline = timer._deadline
+                heapq.heappush(self._queue, (timer._deadline, next(self._sequence), timer, timer._generation))
+                continue
+
+            timer._deadline = None
+            return timer
+
+        return None
+
+    def _fire(self, timer: 'ServiceTimer', function: Any, args: Iterable[Any], kwargs: Mapping[str, Any]) -> None:
+        if self._executor:
+            self._executor.submit(timer._execute, function, args, kwargs)
+        else:
+            timer._execute(function, args, kwargs)
+
+
+class ServiceTimer(IReusableTimer):
+
+    def __init__(self, service: TimerService) -> None:
+        self._service = service
+        self._interval = 0.0
+        self._function: Any = None
+        self._args: Iterable[Any] = []
+        self._kwargs: Mapping[str, Any] = {}
+        self._deadline: Optional[float] = None
+        self._queued_deadline: Optional[float] = None
+        self._generation = 0
+        self._is_firing = False
+
+    def start(
+        self,
+        interval: float,
+        function: Any,
+        args: Optional[Iterable[Any]] = None,
+        kwargs: Optional[Mapping[str, Any]] = None,
+    ) -> IReusableTimer:
+        with self._service._condition:
+            self._interval = interval
+            self._function = function
+            self._args = args if args is not None else []
+            self._kwargs = kwargs if kwargs is not None else {}
+            self._service._schedule(self, interval)
+        return self
+
+    def restart(self) -> None:
+        with self._service._condition:
+            if self._function is not None:
+                self._service._schedule(self, self._interval)
+
+    def cancel(self) -> None:
+        with self._service._condition:
+            self._function = None
+            self._service._unschedule(self)
+
+    def is_alive(self) -> bool:
+        return self._service._is_alive(self)
+
+    def _execute(self, function: Any, args: Iterable[Any], kwargs: Mapping[str, Any]) -> None:
+        try:
+            function(*args, **kwargs)
+        except Exception as error:
+            log.error('Timer function failed', function=function, error=error)
+        finally:
+            with self._service._condition:
+                self._is_firing = False
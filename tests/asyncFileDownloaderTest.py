@@ -0,0 +1,195 @@
+import os
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+from time import sleep
+from unittest import IsolatedAsyncioTestCase
+
+from context_logger import setup_logging
+
+from common_utility import AsyncFileDownloader, AsyncHttpTransport
+from common_utility.fileUtility import delete_directory, create_file
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class TestRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if self.path == '/package1.deb':
+            self._send_content(b'content')
+        elif self.path == '/chunked.deb':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in [b'chunked ', b'content']:
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        elif self.path == '/redirect.deb':
+            self.send_response(302)
+            self.send_header('Location', '/package1.deb')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        elif self.path == '/stalled.deb':
+            self.send_response(200)
+            self.send_header('Content-Length', '10')
+            self.end_headers()
+            self.wfile.write(b'cont')
+            self.wfile.flush()
+            sleep(1)
+        elif self.path == '/headers.deb':
+            self._send_content(self.headers.get('header1', '').encode())
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_content(self, content: bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+
+class AsyncFileDownloaderTest(IsolatedAsyncioTestCase):
+    DOWNLOAD_LOCATION = f'{TEST_FILE_SYSTEM_ROOT}/opt/debs'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), TestRequestHandler)
+        cls.server_url = f'http://127.0.0.1:{cls.server.server_port}'
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    async def test_download_returns_downloaded_file_path(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/package1.deb')
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    async def test_download_returns_downloaded_file_path_when_file_name_specified(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/package1.deb', 'test_package1.deb')
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/test_package1.deb', result)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    async def test_download_sends_headers(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/headers.deb', headers={'header1': 'value1'})
+
+        # Then
+        with open(result, 'rb') as file:
+            self.assertEqual(b'value1', file.read())
+
+    async def test_download_reads_chunked_response(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/chunked.deb', chunk_size=4)
+
+        # Then
+        with open(result, 'rb') as file:
+            self.assertEqual(b'chunked content', file.read())
+
+    async def test_download_follows_redirect(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/redirect.deb')
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/redirect.deb', result)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    async def test_download_raises_error_when_fails_to_download_file(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        with self.assertRaises(ValueError):
+            await file_downloader.download(f'{self.server_url}/missing.deb')
+
+        # Then
+        # Exception raised
+
+    async def test_download_times_out_and_removes_part_file_when_body_stalls(self):
+        # Given
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION, AsyncHttpTransport(timeout=0.2))
+        start = time.monotonic()
+
+        # When
+        with self.assertRaises(TimeoutError):
+            await file_downloader.download(f'{self.server_url}/stalled.deb')
+
+        # Then
+        self.assertLess(time.monotonic() - start, 0.8)
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/stalled.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/stalled.deb.part'))
+
+    async def test_download_returns_downloaded_file_path_when_file_is_present(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/missing.deb', 'content')
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(f'{self.server_url}/missing.deb')
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/missing.deb', result)
+
+    async def test_download_returns_local_file_path_when_local_file_is_present(self):
+        # Given
+        file_path = f'{TEST_FILE_SYSTEM_ROOT}/tmp/package1.deb'
+        create_file(file_path)
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = await file_downloader.download(file_path)
+
+        # Then
+        self.assertEqual(file_path, result)
+
+    async def test_download_raises_error_when_local_file_is_not_present(self):
+        # Given
+        file_path = f'{TEST_FILE_SYSTEM_ROOT}/tmp/package1.deb'
+        file_downloader = AsyncFileDownloader(self.DOWNLOAD_LOCATION)
+
+        # When
+        with self.assertRaises(ValueError):
+            await file_downloader.download(file_path)
+
+        # Then
+        # Exception raised
+
+
+if __name__ == '__main__':
+    unittest.main()
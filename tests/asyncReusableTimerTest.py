@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import unittest
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+
+from common_utility import AsyncReusableTimer
+
+
+class AsyncReusableTimerTest(IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+
+    async def test_start(self):
+        # Given
+        mock = MagicMock()
+        timer = AsyncReusableTimer()
+
+        # When
+        timer.start(0.1, mock.test_method, args=[1], kwargs={'b': 2, 'c': 3})
+
+        # Then
+        self.assertTrue(timer.is_alive())
+        await asyncio.sleep(0.2)
+        mock.test_method.assert_called_once_with(1, b=2, c=3)
+        self.assertFalse(timer.is_alive())
+
+    async def test_fires_on_loop_thread(self):
+        # Given
+        loop_thread = threading.current_thread()
+        fired = asyncio.Event()
+        timer = AsyncReusableTimer()
+
+        # When
+        timer.start(0.05, lambda: fired.set() if threading.current_thread() is loop_thread else None)
+
+        # Then
+        await asyncio.wait_for(fired.wait(), 1)
+
+    async def test_restart(self):
+        # Given
+        mock = MagicMock()
+        timer = AsyncReusableTimer()
+        timer.start(0.15, mock.test_method)
+
+        # When
+        for _ in range(3):
+            await asyncio.sleep(0.1)
+            timer.restart()
+
+        # Then
+        mock.test_method.assert_not_called()
+        await asyncio.sleep(0.25)
+        mock.test_method.assert_called_once_with()
+
+    async def test_cancel(self):
+        # Given
+        mock = MagicMock()
+        timer = AsyncReusableTimer()
+        timer.start(0.1, mock.test_method)
+
+        # When
+        timer.cancel()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        await asyncio.sleep(0.2)
+        mock.test_method.assert_not_called()
+
+    async def test_restart_after_cancel_does_not_fire(self):
+        # Given
+        mock = MagicMock()
+        timer = AsyncReusableTimer()
+        timer.start(0.1, mock.test_method)
+        timer.cancel()
+
+        # When
+        timer.restart()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        await asyncio.sleep(0.2)
+        mock.test_method.assert_not_called()
+
+    async def test_runs_coroutine_callback(self):
+        # Given
+        result = []
+        timer = AsyncReusableTimer()
+
+        async def callback(value: int) -> None:
+            await asyncio.sleep(0.1)
+            result.append(value)
+
+        # When
+        timer.start(0.05, callback, args=[1])
+
+        # Then
+        await asyncio.sleep(0.1)
+        self.assertTrue(timer.is_alive())
+        await asyncio.sleep(0.15)
+        self.assertEqual([1], result)
+        self.assertFalse(timer.is_alive())
+
+    async def test_start_and_cancel_from_other_thread(self):
+        # Given
+        mock = MagicMock()
+        timer = AsyncReusableTimer()
+
+        # When
+        await asyncio.to_thread(timer.start, 0.1, mock.first_method)
+        await asyncio.to_thread(timer.start, 0.1, mock.second_method)
+        await asyncio.sleep(0.2)
+        await asyncio.to_thread(timer.restart)
+        await asyncio.to_thread(timer.cancel)
+
+        # Then
+        await asyncio.sleep(0.2)
+        mock.first_method.assert_not_called()
+        mock.second_method.assert_called_once_with()
+
+
+if __name__ == '__main__':
+    unittest.main()
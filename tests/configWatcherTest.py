@@ -0,0 +1,124 @@
+import os
+import unittest
+from time import sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+from pydantic import BaseModel
+
+from common_utility import PollingFileMonitor, delete_directory, create_file, InotifyFileMonitor
+from common_utility.configWatcher import ConfigWatcher
+from common_utility.jsonLoader import JsonLoader, IJsonLoader
+from test_utility import wait_for_assertion
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class Config(BaseModel):
+    name: str
+    value: int
+
+
+class ConfigWatcherTest(TestCase):
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/config.json'
+    TEST_LIST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/config-list.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+        create_file(self.TEST_FILE, '{"name": "config", "value": 1}')
+        create_file(self.TEST_LIST_FILE, '[{"name": "config", "value": 1}]')
+
+    def test_subscribe_returns_current_config(self):
+        # Given
+        config_watcher = ConfigWatcher(file_monitor=PollingFileMonitor(0.05))
+
+        # When
+        config = config_watcher.subscribe(self.TEST_FILE, Config, MagicMock())
+
+        # Then
+        self.assertEqual(Config(name='config', value=1), config)
+
+    def test_notifies_subscriber_once_after_burst_of_writes(self):
+        # Given
+        callback = MagicMock()
+        config_watcher = ConfigWatcher(file_monitor=InotifyFileMonitor(), debounce_interval=0.2)
+        config_watcher.subscribe(self.TEST_FILE, Config, callback)
+        config_watcher.start()
+
+        # When
+        for value in range(2, 6):
+            create_file(self.TEST_FILE, f'{{"name": "config", "value": {value}}}')
+
+        # Then
+        wait_for_assertion(2, callback.assert_called_once_with, Config(name='config', value=5))
+        config_watcher.stop()
+
+    def test_notifies_list_subscriber_with_polling_monitor(self):
+        # Given
+        callback = MagicMock()
+        config_watcher = ConfigWatcher(file_monitor=PollingFileMonitor(0.05), debounce_interval=0.05)
+        config_watcher.subscribe(self.TEST_LIST_FILE, Config, callback, is_list=True)
+        config_watcher.start()
+
+        # When
+        create_file(self.TEST_LIST_FILE, '[{"name": "config", "value": 2}, {"name": "other", "value": 3}]')
+
+        # Then
+        expected = [Config(name='config', value=2), Config(name='other', value=3)]
+        wait_for_assertion(2, callback.assert_called_once_with, expected)
+        config_watcher.stop()
+
+    def test_reloads_only_changed_file(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        config_watcher = ConfigWatcher(json_loader, InotifyFileMonitor(), debounce_interval=0.05)
+        config_watcher.subscribe(self.TEST_FILE, Config, MagicMock())
+        config_watcher.subscribe(self.TEST_LIST_FILE, Config, MagicMock(), is_list=True)
+        config_watcher.start()
+
+        # When
+        create_file(self.TEST_LIST_FILE, '[{"name": "config", "value": 2}]')
+
+        # Then
+        wait_for_assertion(2, lambda: self.assertEqual(2, json_loader.load_list.call_count))
+        self.assertEqual(1, json_loader.load.call_count)
+        config_watcher.stop()
+
+    def test_keeps_previous_config_when_changed_file_is_invalid(self):
+        # Given
+        callback = MagicMock()
+        config_watcher = ConfigWatcher(file_monitor=PollingFileMonitor(0.05), debounce_interval=0.05)
+        config_watcher.subscribe(self.TEST_FILE, Config, callback)
+        config_watcher.start()
+
+        # When
+        create_file(self.TEST_FILE, '{"name": "config", "value": "invalid"}')
+        sleep(0.3)
+
+        # Then
+        callback.assert_not_called()
+        create_file(self.TEST_FILE, '{"name": "config", "value": 7}')
+        wait_for_assertion(2, callback.assert_called_once_with, Config(name='config', value=7))
+        config_watcher.stop()
+
+    def test_unwatches_file_when_last_subscriber_unsubscribes(self):
+        # Given
+        callback = MagicMock()
+        file_monitor = MagicMock(spec=PollingFileMonitor)
+        config_watcher = ConfigWatcher(file_monitor=file_monitor)
+        config_watcher.subscribe(self.TEST_FILE, Config, callback)
+
+        # When
+        config_watcher.unsubscribe(self.TEST_FILE, callback)
+
+        # Then
+        file_monitor.unwatch.assert_called_once_with(os.path.abspath(self.TEST_FILE))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import threading
+import unittest
+from time import sleep
+from unittest import TestCase
+from unittest.mock import MagicMock, call
+
+from context_logger import setup_logging
+
+from common_utility import Debouncer, DebounceMode, TimerService
+from test_utility import wait_for_assertion
+
+
+class DebouncerTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+
+    def test_trailing_fires_once_after_restarts_stop(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer()
+        debouncer.start(0.2, mock.test_method, args=[1], kwargs={'b': 2})
+
+        # When
+        for _ in range(5):
+            sleep(0.05)
+            debouncer.restart()
+
+        # Then
+        mock.test_method.assert_not_called()
+        self.assertTrue(debouncer.is_alive())
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 1, b=2)
+        self.assertFalse(debouncer.is_alive())
+
+    def test_restart_does_not_create_threads(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer()
+        debouncer.start(0.2, mock.test_method)
+        thread_count = threading.active_count()
+
+        # When
+        for _ in range(1000):
+            debouncer.restart()
+
+        # Then
+        self.assertEqual(thread_count, threading.active_count())
+        wait_for_assertion(1, mock.test_method.assert_called_once_with)
+
+    def test_trailing_fires_with_last_arguments(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer()
+        debouncer.start(0.1, mock.test_method, args=[0])
+
+        # When
+        for index in range(1, 4):
+            debouncer.trigger([index])
+
+        # Then
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 3)
+
+    def test_trailing_fires_with_coalesced_arguments(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer(coalesce=lambda calls: ([[args[0] for args, _ in calls]], {}))
+        debouncer.start(0.1, mock.test_method, args=[0])
+
+        # When
+        for index in range(1, 4):
+            debouncer.trigger([index])
+
+        # Then
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, [0, 1, 2, 3])
+
+    def test_leading_fires_immediately_and_suppresses_burst(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer(DebounceMode.LEADING)
+
+        # When
+        debouncer.start(0.1, mock.test_method, args=[0])
+        for index in range(1, 4):
+            debouncer.trigger([index])
+
+        # Then
+        mock.test_method.assert_called_once_with(0)
+        wait_for_assertion(1, lambda: self.assertFalse(debouncer.is_alive()))
+        mock.test_method.assert_called_once_with(0)
+
+    def test_both_fires_on_leading_and_trailing_edge(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer(DebounceMode.BOTH)
+
+        # When
+        debouncer.start(0.1, mock.test_method, args=[0])
+        debouncer.trigger([1])
+        debouncer.trigger([2])
+
+        # Then
+        mock.test_method.assert_called_once_with(0)
+        wait_for_assertion(1, lambda: self.assertEqual([call(0), call(2)], mock.test_method.call_args_list))
+
+    def test_both_does_not_fire_trailing_edge_without_further_triggers(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer(DebounceMode.BOTH)
+
+        # When
+        debouncer.start(0.1, mock.test_method)
+
+        # Then
+        wait_for_assertion(1, lambda: self.assertFalse(debouncer.is_alive()))
+        mock.test_method.assert_called_once_with()
+
+    def test_max_wait_fires_during_continuous_restarts(self):
+        # Given
+        mock = MagicMock()
+        timer_service = TimerService()
+        debouncer = Debouncer(max_wait=0.25, timer=timer_service.create_timer())
+        debouncer.start(0.1, mock.test_method)
+
+        # When
+        for _ in range(12):
+            sleep(0.05)
+            debouncer.restart()
+
+        # Then
+        self.assertGreaterEqual(mock.test_method.call_count, 2)
+        self.assertTrue(debouncer.is_alive())
+        timer_service.shutdown()
+
+    def test_cancel(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer()
+        debouncer.start(0.1, mock.test_method)
+
+        # When
+        debouncer.cancel()
+
+        # Then
+        self.assertFalse(debouncer.is_alive())
+        sleep(0.2)
+        mock.test_method.assert_not_called()
+
+    def test_restart_after_cancel_does_not_fire(self):
+        # Given
+        mock = MagicMock()
+        debouncer = Debouncer(DebounceMode.BOTH)
+        debouncer.start(0.1, mock.test_method)
+        debouncer.cancel()
+        mock.reset_mock()
+
+        # When
+        debouncer.restart()
+        debouncer.trigger()
+
+        # Then
+        self.assertFalse(debouncer.is_alive())
+        sleep(0.2)
+        mock.test_method.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,185 @@
+import hashlib
+import os
+import unittest
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+
+from common_utility import DownloadCache, EvictionPolicy, IDownloadIndex, ContentStore
+from common_utility.fileUtility import delete_directory, create_file
+from tests import TEST_FILE_SYSTEM_ROOT
+
+DIGESTS = {content: hashlib.sha256(content.encode() * 10).hexdigest() for content in 'ab'}
+
+
+class DownloadCacheTest(TestCase):
+    DOWNLOAD_LOCATION = f'{TEST_FILE_SYSTEM_ROOT}/opt/debs'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_add_tracks_file_size(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 100)
+        self._create_file('package1.deb', 10)
+
+        # When
+        download_cache.add('package1.deb')
+
+        # Then
+        self.assertEqual(10, download_cache.get_size())
+        self.assertEqual(10, DownloadCache(self.DOWNLOAD_LOCATION, 100).get_size())
+
+    def test_add_evicts_least_recently_used_file(self):
+        # Given
+        download_index = MagicMock(spec=IDownloadIndex)
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25, download_index=download_index)
+        for file_name in ['package1.deb', 'package2.deb']:
+            self._create_file(file_name, 10)
+            download_cache.add(file_name)
+        download_cache.touch('package1.deb')
+        self._create_file('package3.deb', 10)
+
+        # When
+        download_cache.add('package3.deb')
+
+        # Then
+        self.assertEqual(20, download_cache.get_size())
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package2.deb'))
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package3.deb'))
+        download_index.remove.assert_called_once_with('package2.deb')
+
+    def test_add_evicts_least_frequently_used_file(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25, EvictionPolicy.LFU)
+        for file_name in ['package1.deb', 'package2.deb']:
+            self._create_file(file_name, 10)
+            download_cache.add(file_name)
+        download_cache.touch('package1.deb')
+        download_cache.touch('package1.deb')
+        download_cache.touch('package2.deb')
+        self._create_file('package3.deb', 10)
+
+        # When
+        download_cache.add('package3.deb')
+
+        # Then
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package2.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package3.deb'))
+
+    def test_add_does_not_evict_pinned_file(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 15)
+        self._create_file('package1.deb', 10)
+        download_cache.add('package1.deb')
+        self._create_file('package2.deb', 10)
+
+        # When
+        with download_cache.pinned('package1.deb'), download_cache.pinned('package2.deb'):
+            download_cache.add('package2.deb')
+
+        # Then
+        self.assertEqual(20, download_cache.get_size())
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package2.deb'))
+
+    def test_touch_does_not_evict_untracked_file_larger_than_cache(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 50)
+        self._create_file('package1.deb', 10)
+        download_cache.add('package1.deb')
+        self._create_file('big.deb', 100)
+
+        # When
+        download_cache.touch('big.deb')
+
+        # Then
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/big.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertEqual(100, download_cache.get_size())
+
+    def test_touch_persists_access_order(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25)
+        for file_name in ['package1.deb', 'package2.deb']:
+            self._create_file(file_name, 10)
+            download_cache.add(file_name)
+
+        # When
+        download_cache.touch('package1.deb')
+
+        # Then
+        reloaded_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25)
+        self._create_file('package3.deb', 10)
+        reloaded_cache.add('package3.deb')
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package2.deb'))
+
+    def test_flush_persists_throttled_access_order(self):
+        # Given
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25, flush_interval=60)
+        for file_name in ['package1.deb', 'package2.deb']:
+            self._create_file(file_name, 10)
+            download_cache.add(file_name)
+        download_cache.touch('package1.deb')
+
+        # When
+        download_cache.flush()
+
+        # Then
+        reloaded_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25)
+        self._create_file('package3.deb', 10)
+        reloaded_cache.add('package3.deb')
+        self.assertTrue(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package2.deb'))
+
+    def test_evict_removes_unreferenced_content_store_object(self):
+        # Given
+        content_store = ContentStore(f'{TEST_FILE_SYSTEM_ROOT}/objects')
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25, content_store=content_store)
+        for file_name, content in [('package1.deb', 'a'), ('package2.deb', 'b'), ('package3.deb', 'b')]:
+            self._create_file(file_name, 10, content)
+            content_store.store(f'{self.DOWNLOAD_LOCATION}/{file_name}', DIGESTS[content])
+
+        # When
+        for file_name, content in [('package1.deb', 'a'), ('package2.deb', 'b'), ('package3.deb', 'b')]:
+            download_cache.add(file_name, DIGESTS[content])
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertFalse(os.path.exists(content_store.get_object_path(DIGESTS['a'])))
+        self.assertTrue(os.path.exists(content_store.get_object_path(DIGESTS['b'])))
+
+    def test_evict_keeps_content_store_object_linked_by_other_file(self):
+        # Given
+        content_store = ContentStore(f'{TEST_FILE_SYSTEM_ROOT}/objects')
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 25, content_store=content_store)
+        for file_name in ['package1.deb', 'package2.deb']:
+            self._create_file(file_name, 10, 'b')
+            content_store.store(f'{self.DOWNLOAD_LOCATION}/{file_name}', DIGESTS['b'])
+            download_cache.add(file_name, DIGESTS['b'])
+        self._create_file('package3.deb', 10)
+
+        # When
+        download_cache.add('package3.deb')
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertTrue(
+            os.path.samefile(f'{self.DOWNLOAD_LOCATION}/package2.deb', content_store.get_object_path(DIGESTS['b']))
+        )
+
+    def _create_file(self, file_name: str, size: int, content: str = 'x') -> None:
+        create_file(f'{self.DOWNLOAD_LOCATION}/{file_name}', content * size)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+from unittest import TestCase
+
+from context_logger import setup_logging
+
+from common_utility import DownloadIndex, DownloadMetadata
+from common_utility.fileUtility import delete_directory, create_file
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class DownloadIndexTest(TestCase):
+    DOWNLOAD_LOCATION = f'{TEST_FILE_SYSTEM_ROOT}/opt/debs'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_get_returns_none_when_file_is_not_indexed(self):
+        # Given
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+
+        # When
+        result = download_index.get('package1.deb')
+
+        # Then
+        self.assertIsNone(result)
+
+    def test_put_persists_metadata(self):
+        # Given
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+        metadata = DownloadMetadata(url='http://url1/package1.deb', size=7, etag='"v1"')
+
+        # When
+        download_index.put('package1.deb', metadata)
+
+        # Then
+        self.assertEqual(metadata, download_index.get('package1.deb'))
+        self.assertEqual(metadata, DownloadIndex(self.DOWNLOAD_LOCATION).get('package1.deb'))
+
+    def test_remove_deletes_metadata(self):
+        # Given
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+        download_index.put('package1.deb', DownloadMetadata(url='http://url1/package1.deb', size=7))
+
+        # When
+        download_index.remove('package1.deb')
+
+        # Then
+        self.assertIsNone(download_index.get('package1.deb'))
+        self.assertIsNone(DownloadIndex(self.DOWNLOAD_LOCATION).get('package1.deb'))
+
+    def test_starts_empty_when_index_file_is_corrupt(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/.download-index.json', '{"files": [')
+
+        # When
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+
+        # Then
+        self.assertIsNone(download_index.get('package1.deb'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import time
+import unittest
+from threading import Thread
+from unittest import TestCase
+
+from context_logger import setup_logging
+
+from common_utility import DownloadScheduler
+from test_utility import wait_for_condition
+
+
+class DownloadSchedulerTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+
+    def test_acquire_returns_immediately_when_rate_is_unlimited(self):
+        # Given
+        scheduler = DownloadScheduler()
+        start = time.monotonic()
+
+        # When
+        for _ in range(100):
+            scheduler.acquire(1000 * 1000)
+
+        # Then
+        self.assertLess(time.monotonic() - start, 0.1)
+
+    def test_acquire_limits_transfer_rate(self):
+        # Given
+        scheduler = DownloadScheduler(bytes_per_second=1000, burst_size=100)
+        start = time.monotonic()
+
+        # When
+        for _ in range(4):
+            scheduler.acquire(100)
+
+        # Then
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+    def test_acquire_serves_higher_priority_first(self):
+        # Given
+        scheduler = DownloadScheduler(bytes_per_second=1000, burst_size=100)
+        scheduler.acquire(300)
+        order = []
+        low = Thread(target=lambda: (scheduler.acquire(100, priority=0), order.append('low')))
+        high = Thread(target=lambda: (scheduler.acquire(100, priority=10), order.append('high')))
+
+        # When
+        low.start()
+        wait_for_condition(1, lambda: len(scheduler._waiters) == 1)
+        high.start()
+        low.join()
+        high.join()
+
+        # Then
+        self.assertEqual(['high', 'low'], order)
+
+    def test_set_rate_removes_limit(self):
+        # Given
+        scheduler = DownloadScheduler(bytes_per_second=1, burst_size=1)
+        scheduler.acquire(1000)
+
+        # When
+        scheduler.set_rate(None)
+
+        # Then
+        start = time.monotonic()
+        scheduler.acquire(1000)
+        self.assertLess(time.monotonic() - start, 0.1)
+
+
+if __name__ == '__main__':
+    unittest.main()
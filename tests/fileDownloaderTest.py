@@ -1,14 +1,85 @@
+import gzip
+import hashlib
+import os
+import time
 import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Lock, Thread
+from time import sleep
+from typing import Optional
 from unittest import TestCase
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
 
 from context_logger import setup_logging
 from requests import Session, Response
 
-from common_utility import ISessionProvider, FileDownloader
+from common_utility import (
+    ISessionProvider,
+    SessionProvider,
+    PooledSessionProvider,
+    FileDownloader,
+    DownloadIndex,
+    DownloadMetadata,
+    DownloadJob,
+    DownloadResult,
+    ContentStore,
+    IDownloadScheduler,
+    IDownloadCache,
+    DownloadCache,
+)
 from common_utility.fileUtility import delete_directory, create_directory, create_file
 from tests import TEST_FILE_SYSTEM_ROOT
 
+CONTENT_DIGEST = hashlib.sha256(b'content').hexdigest()
+LARGE_CONTENT = bytes(range(256)) * 1000
+LARGE_CONTENT_DIGEST = hashlib.sha256(LARGE_CONTENT).hexdigest()
+
+
+class TestRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(LARGE_CONTENT)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == '/large.deb' and 'Range' in self.headers:
+            start, end = [int(value) for value in self.headers['Range'].removeprefix('bytes=').split('-')]
+            end += 1
+            self.send_response(206)
+            self.send_header('Content-Length', str(end - start))
+            self.end_headers()
+            self.wfile.write(LARGE_CONTENT[start:end])
+        elif self.path.startswith('/large'):
+            self._send_content(LARGE_CONTENT)
+        elif self.path == '/chunked.deb':
+            self.send_response(200)
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for chunk in [LARGE_CONTENT[:100000], LARGE_CONTENT[100000:]]:
+                self.wfile.write(f'{len(chunk):x}\r\n'.encode() + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        elif self.path == '/truncated.deb':
+            self.send_response(200)
+            self.send_header('Content-Length', '10')
+            self.end_headers()
+            self.wfile.write(b'cont')
+            self.close_connection = True
+        else:
+            self.send_error(404)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_content(self, content: bytes) -> None:
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
 
 class FileDownloaderTest(TestCase):
     DOWNLOAD_LOCATION = f'{TEST_FILE_SYSTEM_ROOT}/opt/debs'
@@ -16,6 +87,14 @@ class FileDownloaderTest(TestCase):
     @classmethod
     def setUpClass(cls):
         setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), TestRequestHandler)
+        cls.server_url = f'http://127.0.0.1:{cls.server.server_port}'
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
 
     def setUp(self):
         print()
@@ -138,12 +217,553 @@ class FileDownloaderTest(TestCase):
         # Then
         # Exception raised
 
+    def test_download_returns_downloaded_file_path_when_downloaded_in_segments(self):
+        # Given
+        session, session_provider = create_components()
+        session.head.return_value = create_response(headers={'Content-Length': '10', 'Accept-Ranges': 'bytes'})
+        session.get.side_effect = lambda url, stream, headers: create_range_response(b'0123456789', headers['Range'])
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=3, segment_min_size=1)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        self.assertEqual(3, session.get.call_count)
+        self.assertEqual(
+            ['bytes=0-3', 'bytes=4-7', 'bytes=8-9'],
+            sorted(call.kwargs['headers']['Range'] for call in session.get.call_args_list),
+        )
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb', 'rb') as file:
+            self.assertEqual(b'0123456789', file.read())
+
+    def test_download_falls_back_to_single_stream_when_ranges_not_supported(self):
+        # Given
+        session, session_provider = create_components()
+        session.head.return_value = create_response(headers={'Content-Length': '7'})
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=3, segment_min_size=1)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={})
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb', 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_raises_error_and_removes_file_when_segment_fails(self):
+        # Given
+        session, session_provider = create_components()
+        session.head.return_value = create_response(headers={'Content-Length': '10', 'Accept-Ranges': 'bytes'})
+        session.get.return_value = create_response(500, 'Internal Server Error')
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=3, segment_min_size=1)
+
+        # When
+        self.assertRaises(ValueError, file_downloader.download, 'http://url1/package1.deb')
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+
+    def test_download_aborts_running_segments_when_segment_fails(self):
+        # Given
+        session, session_provider = create_components()
+        session.head.return_value = create_response(headers={'Content-Length': '10', 'Accept-Ranges': 'bytes'})
+        slow_response = create_response(206, 'Partial Content')
+        slow_response.iter_content.return_value = slow_stream(b'56789', 0.2)
+        session.get.side_effect = lambda url, stream, headers: (
+            create_response(500, 'Internal Server Error') if headers['Range'] == 'bytes=0-4' else slow_response
+        )
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=2, segment_min_size=1)
+        start = time.monotonic()
+
+        # When
+        self.assertRaises(ValueError, file_downloader.download, 'http://url1/package1.deb')
+
+        # Then
+        self.assertLess(time.monotonic() - start, 0.6)
+        slow_response.close.assert_called_once()
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb.part'))
+
+    def test_download_resumes_partial_file(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'cont')
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part.validator', '"v1"')
+        session, session_provider = create_components(206, 'Partial Content', b'ent')
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', expected_digest=CONTENT_DIGEST)
+
+        # Then
+        session.get.assert_called_once_with(
+            'http://url1/package1.deb',
+            stream=True,
+            headers={'Range': 'bytes=4-', 'If-Range': '"v1"', 'Accept-Encoding': 'identity'},
+        )
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb.part'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb.part.validator'))
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb', 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_rewrites_partial_file_when_upstream_changed(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'old ')
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part.validator', '"v1"')
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'ETag': '"v2"'}
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', expected_digest=CONTENT_DIGEST)
+
+        # Then
+        session.get.assert_called_once_with(
+            'http://url1/package1.deb',
+            stream=True,
+            headers={'Range': 'bytes=4-', 'If-Range': '"v1"', 'Accept-Encoding': 'identity'},
+        )
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_does_not_resume_partial_file_without_validator(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'old ')
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={})
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_overwrites_partial_file_when_server_ignores_range(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'cont')
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb', 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_restarts_when_partial_file_cannot_be_resumed(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'stale content')
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb.part.validator', 'Wed, 21 Oct 2015 07:28:00 GMT')
+        session, session_provider = create_components()
+        session.get.side_effect = [create_response(416, 'Range Not Satisfiable'), create_response()]
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        self.assertEqual(2, session.get.call_count)
+        session.get.assert_called_with('http://url1/package1.deb', stream=True, headers={})
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_keeps_partial_file_and_validator_when_interrupted(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'ETag': '"v1"'}
+        session.get.return_value.iter_content.return_value = interrupted_stream(b'cont')
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        self.assertRaises(ConnectionError, file_downloader.download, 'http://url1/package1.deb')
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb.part', 'rb') as file:
+            self.assertEqual(b'cont', file.read())
+        with open(f'{self.DOWNLOAD_LOCATION}/package1.deb.part.validator') as file:
+            self.assertEqual('"v1"', file.read())
+
+    def test_download_records_validators_in_download_index(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'ETag': '"v1"', 'Last-Modified': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, download_index=download_index)
+
+        # When
+        file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        self.assertEqual(
+            DownloadMetadata(
+                url='http://url1/package1.deb',
+                size=7,
+                etag='"v1"',
+                last_modified='Wed, 21 Oct 2015 07:28:00 GMT',
+                digest=CONTENT_DIGEST,
+            ),
+            DownloadIndex(self.DOWNLOAD_LOCATION).get('package1.deb'),
+        )
+
+    def test_download_returns_cached_file_path_when_not_modified(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'ETag': '"v1"'}
+        file_downloader = FileDownloader(
+            session_provider, self.DOWNLOAD_LOCATION, download_index=DownloadIndex(self.DOWNLOAD_LOCATION)
+        )
+        file_downloader.download('http://url1/package1.deb')
+        session.reset_mock()
+        session.get.return_value = create_response(304, 'Not Modified', b'')
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', skip_if_exists=False)
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={'If-None-Match': '"v1"'})
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_replaces_cached_file_when_modified(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'ETag': '"v1"'}
+        download_index = DownloadIndex(self.DOWNLOAD_LOCATION)
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, download_index=download_index)
+        file_downloader.download('http://url1/package1.deb')
+        session.reset_mock()
+        session.get.return_value = create_response(content=b'new content', headers={'ETag': '"v2"'})
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', skip_if_exists=False)
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={'If-None-Match': '"v1"'})
+        self.assertEqual('"v2"', download_index.get('package1.deb').etag)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'new content', file.read())
+
+    def test_download_many_returns_results_in_order(self):
+        # Given
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+        jobs = [
+            DownloadJob('http://url1/package1.deb'),
+            DownloadJob('http://url2/package2.deb', 'test_package2.deb'),
+            DownloadJob('http://url1/package3.deb', headers={'header1': 'value1'}),
+        ]
+
+        # When
+        results = file_downloader.download_many(jobs, max_workers=3, max_per_host=1)
+
+        # Then
+        self.assertEqual(3, session.get.call_count)
+        self.assertEqual(
+            [
+                DownloadResult(jobs[0], f'{self.DOWNLOAD_LOCATION}/package1.deb'),
+                DownloadResult(jobs[1], f'{self.DOWNLOAD_LOCATION}/test_package2.deb'),
+                DownloadResult(jobs[2], f'{self.DOWNLOAD_LOCATION}/package3.deb'),
+            ],
+            results,
+        )
+
+    def test_download_many_returns_error_for_failed_job(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.side_effect = lambda url, stream, headers: (
+            create_response(404, 'Not Found') if 'package2' in url else create_response()
+        )
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+        jobs = [DownloadJob('http://url1/package1.deb'), DownloadJob('http://url1/package2.deb')]
+
+        # When
+        results = file_downloader.download_many(jobs)
+
+        # Then
+        self.assertEqual(DownloadResult(jobs[0], f'{self.DOWNLOAD_LOCATION}/package1.deb'), results[0])
+        self.assertIsNone(results[1].file_path)
+        self.assertIsInstance(results[1].error, ValueError)
+
+    def test_download_many_limits_per_host_without_blocking_other_hosts(self):
+        # Given
+        session, session_provider = create_components()
+        lock = Lock()
+        active = {'url1': 0, 'url2': 0}
+        peaks = {'url1': 0, 'url2': 0}
+        starts: dict[str, list[float]] = {'url1': [], 'url2': []}
+
+        def get(url: str, stream: bool, headers: dict[str, str]) -> MagicMock:
+            host = urlparse(url).netloc
+            with lock:
+                starts[host].append(time.monotonic())
+                active[host] += 1
+                peaks[host] = max(peaks[host], active[host])
+            sleep(0.1)
+            with lock:
+                active[host] -= 1
+            return create_response()
+
+        session.get.side_effect = get
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+        jobs = [DownloadJob(f'http://url1/package{index}.deb') for index in range(4)] + [
+            DownloadJob(f'http://url2/package{index}.deb') for index in range(4, 6)
+        ]
+
+        # When
+        results = file_downloader.download_many(jobs, max_workers=2, max_per_host=1)
+
+        # Then
+        self.assertEqual(6, session.get.call_count)
+        self.assertEqual([None] * 6, [result.error for result in results])
+        self.assertEqual({'url1': 1, 'url2': 1}, peaks)
+        self.assertLess(starts['url2'][0] - starts['url1'][0], 0.05)
+
+    def test_download_many_deduplicates_jobs_with_same_target(self):
+        # Given
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+        jobs = [
+            DownloadJob('http://url1/package1.deb'),
+            DownloadJob('http://url1/package1.deb'),
+            DownloadJob('http://url2/package1.deb'),
+        ]
+
+        # When
+        results = file_downloader.download_many(jobs)
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={})
+        self.assertEqual(DownloadResult(jobs[0], f'{self.DOWNLOAD_LOCATION}/package1.deb'), results[0])
+        self.assertEqual(DownloadResult(jobs[1], f'{self.DOWNLOAD_LOCATION}/package1.deb'), results[1])
+        self.assertIsNone(results[2].file_path)
+        self.assertIsInstance(results[2].error, ValueError)
+
+    def test_download_returns_downloaded_file_path_when_digest_matches(self):
+        # Given
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', expected_digest=CONTENT_DIGEST.upper())
+
+        # Then
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_raises_error_when_digest_does_not_match(self):
+        # Given
+        session, session_provider = create_components(content=b'corrupted')
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        self.assertRaises(
+            ValueError, file_downloader.download, 'http://url1/package1.deb', expected_digest=CONTENT_DIGEST
+        )
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb'))
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb.part'))
+
+    def test_download_replaces_existing_file_when_digest_does_not_match(self):
+        # Given
+        create_file(f'{self.DOWNLOAD_LOCATION}/package1.deb', 'corrupted')
+        session, session_provider = create_components()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb', expected_digest=CONTENT_DIGEST)
+
+        # Then
+        session.get.assert_called_once_with('http://url1/package1.deb', stream=True, headers={})
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_deduplicates_identical_content_in_content_store(self):
+        # Given
+        session, session_provider = create_components()
+        content_store = ContentStore(f'{self.DOWNLOAD_LOCATION}/.objects')
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, content_store=content_store)
+
+        # When
+        result1 = file_downloader.download('http://url1/package1.deb')
+        result2 = file_downloader.download('http://url2/package2.deb')
+
+        # Then
+        self.assertTrue(os.path.samefile(result1, result2))
+        self.assertTrue(os.path.samefile(result1, content_store.get_object_path(CONTENT_DIGEST)))
+
+    def test_download_decompresses_file_while_streaming(self):
+        # Given
+        compressed = gzip.compress(b'content')
+        session, session_provider = create_components()
+        session.get.return_value.iter_content.return_value = [compressed[:10], compressed[10:]]
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=3)
+
+        # When
+        result = file_downloader.download(
+            'http://url1/package1.deb.gz', decompress=True, expected_digest=CONTENT_DIGEST
+        )
+
+        # Then
+        session.head.assert_not_called()
+        self.assertEqual(f'{self.DOWNLOAD_LOCATION}/package1.deb', result)
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/package1.deb.gz'))
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_reads_body_into_reused_buffer(self):
+        # Given
+        file_downloader = FileDownloader(SessionProvider(), self.DOWNLOAD_LOCATION, read_into_buffer=True)
+
+        # When
+        with patch('urllib3.response.HTTPResponse.read') as read:
+            result = file_downloader.download(
+                f'{self.server_url}/large.deb', chunk_size=1000, expected_digest=LARGE_CONTENT_DIGEST
+            )
+
+        # Then
+        read.assert_not_called()
+        with open(result, 'rb') as file:
+            self.assertEqual(LARGE_CONTENT, file.read())
+
+    def test_download_writes_buffers_on_writer_thread(self):
+        # Given
+        file_downloader = FileDownloader(
+            SessionProvider(), self.DOWNLOAD_LOCATION, read_into_buffer=True, threaded_writes=True, write_buffer_count=2
+        )
+
+        # When
+        with patch('urllib3.response.HTTPResponse.read') as read:
+            result = file_downloader.download(
+                f'{self.server_url}/large.deb', chunk_size=1000, expected_digest=LARGE_CONTENT_DIGEST
+            )
+
+        # Then
+        read.assert_not_called()
+        with open(result, 'rb') as file:
+            self.assertEqual(LARGE_CONTENT, file.read())
+
+    def test_download_reads_chunked_body_through_iter_content(self):
+        # Given
+        file_downloader = FileDownloader(SessionProvider(), self.DOWNLOAD_LOCATION, read_into_buffer=True)
+
+        # When
+        result = file_downloader.download(f'{self.server_url}/chunked.deb', expected_digest=LARGE_CONTENT_DIGEST)
+
+        # Then
+        with open(result, 'rb') as file:
+            self.assertEqual(LARGE_CONTENT, file.read())
+
+    def test_download_raises_error_when_body_read_into_buffer_is_truncated(self):
+        # Given
+        file_downloader = FileDownloader(SessionProvider(), self.DOWNLOAD_LOCATION, read_into_buffer=True)
+
+        # When
+        self.assertRaises(ConnectionError, file_downloader.download, f'{self.server_url}/truncated.deb')
+
+        # Then
+        self.assertFalse(os.path.exists(f'{self.DOWNLOAD_LOCATION}/truncated.deb'))
+
+    def test_download_reuses_sessions_across_segmented_downloads(self):
+        # Given
+        session_provider = PooledSessionProvider()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, segment_count=2, segment_min_size=1)
+        file_downloader.download(f'{self.server_url}/large.deb', expected_digest=LARGE_CONTENT_DIGEST)
+        session_misses = session_provider.get_stats().session_misses
+
+        # When
+        for _ in range(3):
+            result = file_downloader.download(
+                f'{self.server_url}/large.deb', skip_if_exists=False, expected_digest=LARGE_CONTENT_DIGEST
+            )
+
+        # Then
+        self.assertEqual(session_misses, session_provider.get_stats().session_misses)
+        with open(result, 'rb') as file:
+            self.assertEqual(LARGE_CONTENT, file.read())
+        session_provider.close()
+
+    def test_download_many_reuses_sessions_across_batches(self):
+        # Given
+        session_provider = PooledSessionProvider()
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, max_batch_workers=2)
+        jobs = [DownloadJob(f'{self.server_url}/large{index}.deb') for index in range(4)]
+        file_downloader.download_many(jobs, max_workers=2)
+        session_misses = session_provider.get_stats().session_misses
+
+        # When
+        results = file_downloader.download_many(jobs, skip_if_exists=False, max_workers=2)
+
+        # Then
+        self.assertEqual([None] * 4, [result.error for result in results])
+        self.assertEqual(session_misses, session_provider.get_stats().session_misses)
+        session_provider.close()
+
+    def test_download_preallocates_file_from_content_length(self):
+        # Given
+        session, session_provider = create_components()
+        session.get.return_value.headers = {'Content-Length': '7'}
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, preallocate=True)
+
+        # When
+        result = file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        with open(result, 'rb') as file:
+            self.assertEqual(b'content', file.read())
+
+    def test_download_acquires_bandwidth_from_scheduler(self):
+        # Given
+        session, session_provider = create_components()
+        scheduler = MagicMock(spec=IDownloadScheduler)
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, scheduler=scheduler)
+
+        # When
+        file_downloader.download('http://url1/package1.deb', priority=5)
+
+        # Then
+        scheduler.acquire.assert_called_once_with(7, 5)
+
+    def test_download_adds_file_to_download_cache(self):
+        # Given
+        session, session_provider = create_components()
+        download_cache = MagicMock(spec=IDownloadCache)
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, download_cache=download_cache)
+
+        # When
+        file_downloader.download('http://url1/package1.deb')
+        file_downloader.download('http://url1/package1.deb')
+
+        # Then
+        download_cache.pinned.assert_called_once_with('package1.deb')
+        download_cache.add.assert_called_once_with('package1.deb', None)
+        download_cache.touch.assert_called_once_with('package1.deb')
+
+    def test_download_keeps_existing_file_larger_than_download_cache(self):
+        # Given
+        session, session_provider = create_components()
+        create_file(f'{self.DOWNLOAD_LOCATION}/big.deb', 'x' * 100)
+        download_cache = DownloadCache(self.DOWNLOAD_LOCATION, 50)
+        file_downloader = FileDownloader(session_provider, self.DOWNLOAD_LOCATION, download_cache=download_cache)
+
+        # When
+        result = file_downloader.download('http://url1/big.deb')
+
+        # Then
+        self.assertTrue(os.path.exists(result))
+        session.get.assert_not_called()
+
 
 def create_components(status_code: int = 200, reason: str = 'OK', content: bytes = b'content'):
-    response = MagicMock(spec=Response)
-    response.status_code = status_code
-    response.reason = reason
-    response.iter_content.return_value = [content]
+    response = create_response(status_code, reason, content)
     session = MagicMock(spec=Session)
     session.get.return_value = response
     session_provider = MagicMock(spec=ISessionProvider)
@@ -151,5 +771,33 @@ def create_components(status_code: int = 200, reason: str = 'OK', content: bytes
     return session, session_provider
 
 
+def create_response(
+    status_code: int = 200, reason: str = 'OK', content: bytes = b'content', headers: Optional[dict[str, str]] = None
+):
+    response = MagicMock(spec=Response)
+    response.status_code = status_code
+    response.reason = reason
+    response.headers = headers if headers else {}
+    response.iter_content.return_value = [content]
+    return response
+
+
+def create_range_response(content: bytes, range_header: str):
+    start, end = [int(value) for value in range_header.removeprefix('bytes=').split('-')]
+    end += 1
+    return create_response(206, 'Partial Content', content[start:end])
+
+
+def slow_stream(content: bytes, delay: float):
+    for byte in content:
+        sleep(delay)
+        yield bytes([byte])
+
+
+def interrupted_stream(content: bytes):
+    yield content
+    raise ConnectionError('Connection reset')
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,153 @@
+import os
+import unittest
+from time import sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+
+from common_utility import InotifyFileMonitor, PollingFileMonitor, delete_directory, create_file, IFileMonitor
+from test_utility import wait_for_assertion
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class FileMonitorTest(TestCase):
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/config.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+        create_file(self.TEST_FILE, '{}')
+
+    def test_inotify_monitor_reports_file_written_in_place(self):
+        # Given
+        self.assert_reports_change(InotifyFileMonitor(), lambda: create_file(self.TEST_FILE, '{"changed": 1}'))
+
+    def test_inotify_monitor_reports_file_replaced_atomically(self):
+        # Given
+        def replace_file() -> None:
+            create_file(f'{self.TEST_FILE}.tmp', '{"changed": 1}')
+            os.replace(f'{self.TEST_FILE}.tmp', self.TEST_FILE)
+
+        self.assert_reports_change(InotifyFileMonitor(), replace_file)
+
+    def test_inotify_monitor_reports_only_changed_file_in_directory(self):
+        # Given
+        other_file = f'{TEST_FILE_SYSTEM_ROOT}/config/other.json'
+        create_file(other_file, '{}')
+        on_change = MagicMock()
+        file_monitor = InotifyFileMonitor()
+        file_monitor.watch(self.TEST_FILE)
+        file_monitor.watch(other_file)
+        file_monitor.start(on_change)
+
+        # When
+        create_file(f'{TEST_FILE_SYSTEM_ROOT}/config/unwatched.json', '{}')
+        create_file(other_file, '{"changed": 1}')
+        wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(other_file))
+        sleep(0.1)
+
+        # Then
+        file_monitor.stop()
+        self.assertEqual({os.path.abspath(other_file)}, {call.args[0] for call in on_change.call_args_list})
+
+    def test_inotify_monitor_reports_all_watched_files_when_directory_is_moved(self):
+        # Given
+        other_file = f'{TEST_FILE_SYSTEM_ROOT}/config/other.json'
+        create_file(other_file, '{}')
+        on_change = MagicMock()
+        file_monitor = InotifyFileMonitor()
+        file_monitor.watch(self.TEST_FILE)
+        file_monitor.watch(other_file)
+        file_monitor.start(on_change)
+
+        try:
+            # When
+            os.rename(f'{TEST_FILE_SYSTEM_ROOT}/config', f'{TEST_FILE_SYSTEM_ROOT}/moved')
+
+            # Then
+            wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(self.TEST_FILE))
+            on_change.assert_any_call(os.path.abspath(other_file))
+        finally:
+            file_monitor.stop()
+
+    def test_inotify_monitor_restores_watch_when_directory_is_recreated(self):
+        # Given
+        on_change = MagicMock()
+        file_monitor = InotifyFileMonitor(retry_interval=0.05)
+        file_monitor.watch(self.TEST_FILE)
+        file_monitor.start(on_change)
+
+        try:
+            delete_directory(f'{TEST_FILE_SYSTEM_ROOT}/config')
+            wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(self.TEST_FILE))
+            sleep(0.1)
+            on_change.reset_mock()
+
+            # When
+            create_file(self.TEST_FILE, '{"changed": 1}')
+            wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(self.TEST_FILE))
+            sleep(0.1)
+            on_change.reset_mock()
+            create_file(self.TEST_FILE, '{"changed": 2}')
+
+            # Then
+            wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(self.TEST_FILE))
+        finally:
+            file_monitor.stop()
+
+    def test_polling_monitor_reports_changed_file(self):
+        # Given
+        self.assert_reports_change(PollingFileMonitor(0.05), lambda: create_file(self.TEST_FILE, '{"changed": 1}'))
+
+    def test_polling_monitor_does_not_report_unchanged_file(self):
+        # Given
+        on_change = MagicMock()
+        file_monitor = PollingFileMonitor(0.05)
+        file_monitor.watch(self.TEST_FILE)
+        file_monitor.start(on_change)
+
+        # When
+        sleep(0.2)
+        file_monitor.stop()
+
+        # Then
+        on_change.assert_not_called()
+
+    def test_monitor_does_not_report_unwatched_file(self):
+        for file_monitor in [InotifyFileMonitor(), PollingFileMonitor(0.05)]:
+            # Given
+            on_change = MagicMock()
+            file_monitor.watch(self.TEST_FILE)
+            file_monitor.unwatch(self.TEST_FILE)
+            file_monitor.start(on_change)
+
+            # When
+            create_file(self.TEST_FILE, '{"changed": 2}')
+            sleep(0.2)
+
+            # Then
+            file_monitor.stop()
+            on_change.assert_not_called()
+
+    def assert_reports_change(self, file_monitor: IFileMonitor, change_file) -> None:
+        on_change = MagicMock()
+        file_monitor.watch(self.TEST_FILE)
+        file_monitor.start(on_change)
+
+        try:
+            # When
+            change_file()
+
+            # Then
+            wait_for_assertion(1, on_change.assert_any_call, os.path.abspath(self.TEST_FILE))
+        finally:
+            file_monitor.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
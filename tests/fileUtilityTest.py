@@ -0,0 +1,264 @@
+import os
+import re
+import tracemalloc
+import unittest
+from threading import Thread
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from context_logger import setup_logging
+
+from common_utility import IReusableTimer
+from common_utility.fileUtility import (
+    FileAppender,
+    delete_directory,
+    is_file_matches_pattern,
+    match_files_pattern,
+    is_file_contains_lines,
+)
+from test_utility import wait_for_assertion
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class FileUtilityTest(TestCase):
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/etc/config.txt'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_is_file_matches_pattern_returns_same_result_as_text_search(self):
+        cases = [
+            (b'enabled=true\r\nname=test\r\n', r'^enabled=true$', True),
+            (b'a=1\rb=2\rc=3', r'^b=2$', True),
+            (b'a=1\rb=2\rc=3', r'1.b', False),
+            ('name=café\n'.encode(), r'^name=\w+$', True),
+            ('name=café\n'.encode(), r'^name=.{4}$', True),
+            ('name=café\n'.encode(), r'café', True),
+            ('name=CAFÉ\n'.encode(), r'(?i)^name=café$', True),
+            (b'enabled=true\nname=test\n', r'^name=\w+$', True),
+            (b'enabled=true\nname=test\n', r'^enabled=false$', False),
+            (b'', r'^$', True),
+            (b'', r'', True),
+            (b'a=1\r\nb=2\r\n', r'1\nb', True),
+            (b'a=1\r\nb=2\r\n', r'1\s+b', True),
+            (b'a=1\nb=2\n', r'^a=1[^=]+=2$', True),
+            (b'a=1\nb=2\n', r'\Ab=2', False),
+        ]
+
+        for content, pattern, expected in cases:
+            with self.subTest(content=content, pattern=pattern):
+                # Given
+                self._create_binary_file(self.TEST_FILE, content)
+
+                # When
+                result = is_file_matches_pattern(self.TEST_FILE, pattern)
+
+                # Then
+                self.assertEqual(expected, result)
+                self.assertEqual(self._search_text(self.TEST_FILE, pattern), result)
+
+    def test_is_file_matches_pattern_returns_same_result_as_text_search_across_line_blocks(self):
+        cases = [
+            (b'a\nb', r'^$', False),
+            (b'a\nb\n', r'^$', True),
+            (b'a\n\nb', r'^$', True),
+            (b'a\nb\n', r'b$', True),
+            (b'a\nb', r'\bb', True),
+        ]
+
+        for content, pattern, expected in cases:
+            with self.subTest(content=content, pattern=pattern), patch('common_utility.fileUtility.LINE_BLOCK_SIZE', 1):
+                # Given
+                self._create_binary_file(self.TEST_FILE, content)
+
+                # When
+                result = is_file_matches_pattern(self.TEST_FILE, pattern)
+
+                # Then
+                self.assertEqual(expected, result)
+                self.assertEqual(self._search_text(self.TEST_FILE, pattern), result)
+
+    def test_is_file_matches_pattern_stops_at_match_before_late_non_ascii_byte(self):
+        # Given
+        content = b'enabled=true\r\n' + b'key=value\r\n' * 1024 * 1024 + 'name=café\r\n'.encode()
+        self._create_binary_file(self.TEST_FILE, content)
+
+        for pattern in [r'enabled=true', r'^enabled=\w+$']:
+            with self.subTest(pattern=pattern):
+                tracemalloc.start()
+
+                # When
+                result = is_file_matches_pattern(self.TEST_FILE, pattern)
+
+                # Then
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                self.assertTrue(result)
+                self.assertLess(peak, len(content) / 16)
+
+    def test_is_file_matches_pattern_returns_false_when_file_is_missing(self):
+        # When
+        result = is_file_matches_pattern(self.TEST_FILE, r'.*')
+
+        # Then
+        self.assertFalse(result)
+
+    def test_match_files_pattern_returns_result_per_file(self):
+        # Given
+        file_paths = [f'{TEST_FILE_SYSTEM_ROOT}/etc/config{index}.txt' for index in range(4)]
+        self._create_binary_file(file_paths[0], b'enabled=true\r\n')
+        self._create_binary_file(file_paths[1], 'enabled=true\nname=café\n'.encode())
+        self._create_binary_file(file_paths[2], b'enabled=false\n')
+
+        # When
+        result = match_files_pattern(file_paths, r'^enabled=true$', max_workers=2)
+
+        # Then
+        self.assertEqual(dict(zip(file_paths, [True, True, False, False])), result)
+
+    def test_is_file_contains_lines_splits_lines_as_text(self):
+        # Given
+        self._create_binary_file(self.TEST_FILE, b'line1\r\nline2\rline3\x0cline4\n')
+
+        # When
+        result = is_file_contains_lines(self.TEST_FILE, ['line1', 'line2', 'line3', 'line4'])
+
+        # Then
+        self.assertTrue(result)
+
+    def test_is_file_contains_lines_returns_false_when_line_is_not_expected(self):
+        # Given
+        self._create_binary_file(self.TEST_FILE, b'line1\nline2\n')
+
+        # When
+        result = is_file_contains_lines(self.TEST_FILE, ['line1'])
+
+        # Then
+        self.assertFalse(result)
+
+    def _create_binary_file(self, file_path: str, content: bytes) -> None:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'wb') as file:
+            file.write(content)
+
+    def _search_text(self, file_path: str, pattern: str) -> bool:
+        with open(file_path) as file:
+            return re.search(pattern, file.read(), re.MULTILINE) is not None
+
+
+class FileAppenderTest(TestCase):
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/var/log/test.log'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_append_flushes_when_buffer_is_full(self):
+        # Given
+        file_appender = FileAppender(self.TEST_FILE, buffer_size=12, timer=MagicMock(spec=IReusableTimer))
+        file_appender.append('line1')
+        self.assertEqual('', self._read_file())
+
+        # When
+        file_appender.append('line2')
+
+        # Then
+        self.assertEqual('line1\nline2\n', self._read_file())
+        file_appender.close()
+
+    def test_append_flushes_when_flush_interval_elapses(self):
+        # Given
+        file_appender = FileAppender(self.TEST_FILE, flush_interval=0.1)
+
+        # When
+        file_appender.append('line1')
+        file_appender.append('line2')
+
+        # Then
+        self.assertEqual('', self._read_file())
+        wait_for_assertion(1, lambda: self.assertEqual('line1\nline2\n', self._read_file()))
+        file_appender.close()
+
+    def test_flush_syncs_file_when_fsync_is_enabled(self):
+        # Given
+        file_appender = FileAppender(self.TEST_FILE, fsync=True, timer=MagicMock(spec=IReusableTimer))
+        file_appender.append('line1')
+
+        with patch('common_utility.fileUtility.os.fsync') as fsync:
+            # When
+            file_appender.flush()
+            file_appender.flush()
+
+        # Then
+        fsync.assert_called_once()
+        self.assertEqual('line1\n', self._read_file())
+        file_appender.close()
+
+    def test_flush_does_not_sync_file_when_fsync_is_disabled(self):
+        # Given
+        file_appender = FileAppender(self.TEST_FILE, timer=MagicMock(spec=IReusableTimer))
+        file_appender.append('line1')
+
+        with patch('common_utility.fileUtility.os.fsync') as fsync:
+            # When
+            file_appender.flush()
+
+        # Then
+        fsync.assert_not_called()
+        file_appender.close()
+
+    def test_close_flushes_buffered_lines_and_append_raises_error(self):
+        # Given
+        timer = MagicMock(spec=IReusableTimer)
+        file_appender = FileAppender(self.TEST_FILE, timer=timer)
+        file_appender.append('line1')
+
+        # When
+        file_appender.close()
+
+        # Then
+        self.assertEqual('line1\n', self._read_file())
+        timer.cancel.assert_called_once()
+        self.assertRaises(ValueError, file_appender.append, 'line2')
+
+    def test_append_keeps_order_without_loss_when_producers_are_concurrent(self):
+        # Given
+        producer_count, line_count = 8, 500
+        file_appender = FileAppender(self.TEST_FILE, buffer_size=256, flush_interval=0.01)
+
+        def produce(producer: int) -> None:
+            for index in range(line_count):
+                file_appender.append(f'{producer}:{index}')
+
+        producers = [Thread(target=produce, args=(producer,)) for producer in range(producer_count)]
+
+        # When
+        for producer in producers:
+            producer.start()
+        for producer in producers:
+            producer.join()
+        file_appender.close()
+
+        # Then
+        lines = [line.split(':') for line in self._read_file().splitlines()]
+        self.assertEqual(producer_count * line_count, len(lines))
+        for producer in range(producer_count):
+            indexes = [int(index) for name, index in lines if name == str(producer)]
+            self.assertEqual(list(range(line_count)), indexes)
+
+    def _read_file(self) -> str:
+        with open(self.TEST_FILE) as file:
+            return file.read()
+
+
+if __name__ == '__main__':
+    unittest.main()
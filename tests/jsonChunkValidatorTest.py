@@ -0,0 +1,218 @@
+import json
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from json import JSONDecodeError
+from typing import Optional
+from unittest import TestCase
+from unittest.mock import patch
+
+from context_logger import setup_logging
+from pydantic import ValidationError, BaseModel, RootModel, create_model
+
+from common_utility.fileUtility import delete_directory, create_file
+from common_utility.jsonChunkValidator import JsonChunkValidator
+from common_utility.jsonLoader import JsonLoader
+from tests import TEST_RESOURCE_ROOT, TEST_FILE_SYSTEM_ROOT
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    tags: list[str] = []
+    parent: Optional['Item'] = None
+
+
+class ItemPair(RootModel[list[Item]]):
+    pass
+
+
+class JsonChunkValidatorTest(TestCase):
+    TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/items.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_returns_ordered_instances_when_validated_in_process_pool(self):
+        # Given
+        items = self.create_items(100)
+        validator = JsonChunkValidator(max_workers=2, chunk_size=7)
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual(items, instances)
+
+    def test_json_loader_returns_instances_when_model_cannot_be_pickled(self):
+        # Given
+        class LocalItem(BaseModel):
+            id: int
+            name: str
+
+        items = [LocalItem(id=index, name=str(index)) for index in range(100)]
+        create_file(self.TEST_FILE, json.dumps([item.model_dump() for item in items]))
+        validator = JsonChunkValidator(max_workers=2, chunk_size=256)
+
+        for model in [LocalItem, create_model('DynamicItem', id=(int, ...), name=(str, ...))]:
+            with self.subTest(model=model):
+                # When
+                instances = JsonLoader(chunk_validator=validator).load_list(self.TEST_FILE, model)
+
+                # Then
+                self.assertIsNone(validator.validate_list(self.TEST_FILE, model))
+                self.assertEqual([item.model_dump() for item in items], [item.model_dump() for item in instances])
+
+    def test_reuses_process_pool_across_calls(self):
+        # Given
+        items = self.create_items(100)
+        validator = JsonChunkValidator(max_workers=2, chunk_size=64)
+
+        with patch('common_utility.jsonChunkValidator.ProcessPoolExecutor') as executor_class:
+            executor_class.return_value = ThreadPoolExecutor(2)
+
+            # When
+            validator.validate_list(self.TEST_FILE, Item)
+            instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual(items, instances)
+        executor_class.assert_called_once_with(2)
+
+    def test_returns_instances_when_items_contain_delimiters_in_strings(self):
+        # Given
+        items = [Item(id=index, name='a,b]}[{"\\' + str(index), tags=[',', ']']) for index in range(10)]
+        items[3].parent = Item(id=100, name='[parent, "x"]')
+        create_file(self.TEST_FILE, json.dumps([item.model_dump() for item in items], indent=2))
+        validator = JsonChunkValidator(chunk_size=3, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual(items, instances)
+
+    def test_returns_instances_when_items_contain_nested_lists_of_objects(self):
+        # Given
+        items = [Item(id=index, name=str(index), parent=Item(id=index, name='parent')) for index in range(20)]
+        create_file(self.TEST_FILE, json.dumps([[item.model_dump()] * 2 for item in items]))
+        validator = JsonChunkValidator(chunk_size=16, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, ItemPair)
+
+        # Then
+        self.assertEqual([ItemPair(root=[item, item]) for item in items], instances)
+
+    def test_returns_none_when_separator_is_inside_string(self):
+        # Given
+        items = [Item(id=index, name='}, {' * index) for index in range(20)]
+        create_file(self.TEST_FILE, json.dumps([item.model_dump() for item in items]))
+        validator = JsonChunkValidator(chunk_size=16, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertIsNone(instances)
+
+    def test_json_loader_returns_instances_when_separator_is_inside_string(self):
+        # Given
+        items = [Item(id=index, name='}, {' * index) for index in range(20)]
+        create_file(self.TEST_FILE, json.dumps([item.model_dump() for item in items]))
+        json_loader = JsonLoader(chunk_validator=JsonChunkValidator(chunk_size=16, executor=ThreadPoolExecutor(2)))
+
+        # When
+        instances = json_loader.load_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual(items, instances)
+
+    def test_returns_empty_list_when_array_is_empty(self):
+        # Given
+        create_file(self.TEST_FILE, ' [ \n ] \n')
+        validator = JsonChunkValidator(chunk_size=3, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual([], instances)
+
+    def test_returns_none_when_root_is_not_an_array(self):
+        # Given
+        validator = JsonChunkValidator(chunk_size=3, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(f'{self.TEST_instance_DIR}/valid-single.json', Item)
+
+        # Then
+        self.assertIsNone(instances)
+
+    def test_returns_none_when_array_has_trailing_comma(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"id": 1, "name": "a"}, {"id": 2, "name": "b"},]')
+        validator = JsonChunkValidator(chunk_size=2, executor=ThreadPoolExecutor(2))
+
+        # When
+        instances = validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertIsNone(instances)
+
+    def test_raises_error_with_global_item_index_when_item_is_schema_invalid(self):
+        # Given
+        data = [item.model_dump() for item in self.create_items(20, write=False)]
+        data[13]['id'] = 'invalid'
+        data[17]['name'] = None
+        create_file(self.TEST_FILE, json.dumps(data))
+        validator = JsonChunkValidator(chunk_size=5, executor=ThreadPoolExecutor(2))
+
+        # When
+        with self.assertRaises(ValidationError) as context:
+            validator.validate_list(self.TEST_FILE, Item)
+
+        # Then
+        errors = context.exception.errors()
+        self.assertEqual([(13, 'id'), (17, 'name')], [error['loc'] for error in errors])
+        self.assertEqual(['int_parsing', 'string_type'], [error['type'] for error in errors])
+
+    def test_json_loader_returns_same_instances_as_serial_load_list(self):
+        # Given
+        self.create_items(10)
+        expected = JsonLoader().load_list(self.TEST_FILE, Item)
+        json_loader = JsonLoader(chunk_validator=JsonChunkValidator(chunk_size=3, executor=ThreadPoolExecutor(2)))
+
+        # When
+        instances = json_loader.load_list(self.TEST_FILE, Item)
+
+        # Then
+        self.assertEqual(expected, instances)
+
+    def test_json_loader_raises_decode_error_when_array_is_malformed(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"id": 1, "name": "a"}, {"id": 2 "name": "b"}]')
+        json_loader = JsonLoader(chunk_validator=JsonChunkValidator(chunk_size=1, executor=ThreadPoolExecutor(2)))
+
+        # When
+        self.assertRaises(JSONDecodeError, json_loader.load_list, self.TEST_FILE, Item)
+
+        # Then
+        # Exception is raised
+
+    def create_items(self, count: int, write: bool = True) -> list[Item]:
+        items = [Item(id=index, name=str(index), tags=[str(index)] * (index % 3)) for index in range(count)]
+
+        if write:
+            create_file(self.TEST_FILE, '[' + ',\n'.join(item.model_dump_json() for item in items) + ']')
+
+        return items
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,12 +1,18 @@
+import json
+import os
+import time
 import unittest
-from typing import Optional
+from json import JSONDecodeError
+from typing import Optional, Callable
 from unittest import TestCase
+from unittest.mock import MagicMock
 
 from context_logger import setup_logging
-from pydantic import ValidationError, BaseModel
+from pydantic import ValidationError, BaseModel, ConfigDict, create_model
 
-from common_utility.jsonLoader import JsonLoader
-from tests import TEST_RESOURCE_ROOT
+from common_utility.fileUtility import delete_directory, copy_file, create_file
+from common_utility.jsonLoader import JsonLoader, CachedJsonLoader, IJsonLoader, JsonEngine, SnapshotJsonLoader
+from tests import TEST_RESOURCE_ROOT, TEST_FILE_SYSTEM_ROOT
 
 
 class DeserializableClass1(BaseModel):
@@ -21,6 +27,17 @@ class DeserializableClass2(BaseModel):
     attribute2: list[DeserializableClass1]
 
 
+class CallbackClass(BaseModel):
+    attribute1: Optional[DeserializableClass1] = None
+    callback: Callable[[], None] = print
+
+
+class FrozenClass(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    attribute2: list[DeserializableClass1]
+
+
 class JsonLoaderTest(TestCase):
     TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
 
@@ -154,5 +171,494 @@ class JsonLoaderTest(TestCase):
         # Exception is raised
 
 
+class JsonEngineTest(TestCase):
+    TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+
+    def test_load_returns_same_instance_with_all_engines(self):
+        # Given
+        expected = JsonLoader().load(f'{self.TEST_instance_DIR}/valid-single.json', DeserializableClass2)
+
+        for engine in JsonEngine:
+            # When
+            instance = JsonLoader(engine).load(f'{self.TEST_instance_DIR}/valid-single.json', DeserializableClass2)
+
+            # Then
+            self.assertEqual(expected, instance, engine)
+
+    def test_load_list_returns_same_instances_with_all_engines(self):
+        # Given
+        expected = JsonLoader().load_list(f'{self.TEST_instance_DIR}/valid-list.json', DeserializableClass2)
+
+        for engine in JsonEngine:
+            # When
+            instances = JsonLoader(engine).load_list(f'{self.TEST_instance_DIR}/valid-list.json', DeserializableClass2)
+
+            # Then
+            self.assertEqual(expected, instances, engine)
+
+    def test_load_returns_instance_from_json_string_with_native_engine(self):
+        # Given
+        json_loader = JsonLoader(JsonEngine.NATIVE)
+
+        # When
+        instance = json_loader.load('{"attribute1": null, "attribute2": []}', DeserializableClass2)
+
+        # Then
+        self.assertEqual(DeserializableClass2(attribute1=None, attribute2=[]), instance)
+
+    def test_raises_error_when_json_file_is_schema_invalid_with_native_engine(self):
+        # Given
+        json_loader = JsonLoader(JsonEngine.NATIVE)
+
+        # When
+        self.assertRaises(
+            ValidationError,
+            json_loader.load_list,
+            f'{self.TEST_instance_DIR}/invalid-list.json',
+            DeserializableClass2,
+        )
+
+        # Then
+        # Exception is raised
+
+    def test_raises_error_when_root_type_is_invalid_with_native_engine(self):
+        # Given
+        json_loader = JsonLoader(JsonEngine.NATIVE)
+
+        # When
+        with self.assertRaises(ValueError) as context:
+            json_loader.load(f'{self.TEST_instance_DIR}/valid-list.json', DeserializableClass2)
+
+        # Then
+        self.assertEqual('Unexpected JSON root type: list', str(context.exception))
+
+    def test_raises_decode_error_when_json_is_malformed_with_native_engine(self):
+        # Given
+        json_loader = JsonLoader(JsonEngine.NATIVE)
+
+        # When
+        self.assertRaises(JSONDecodeError, json_loader.load, '{"attribute1": ', DeserializableClass2)
+
+        # Then
+        # Exception is raised
+
+
+class CachedJsonLoaderTest(TestCase):
+    TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/valid-single.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+        copy_file(f'{self.TEST_instance_DIR}/valid-single.json', self.TEST_FILE)
+
+    def test_load_returns_shared_cached_instance_when_file_is_unchanged(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader)
+        instance1 = cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # When
+        instance2 = cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        json_loader.load.assert_called_once_with(self.TEST_FILE, DeserializableClass2)
+        self.assertIs(instance1, instance2)
+
+    def test_load_returns_copy_of_cached_instance_when_copy_is_enabled(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader, copy=True)
+        instance1 = cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # When
+        instance2 = cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        json_loader.load.assert_called_once_with(self.TEST_FILE, DeserializableClass2)
+        self.assertEqual(instance1, instance2)
+        self.assertIsNot(instance1, instance2)
+        self.assertIsNot(instance1.attribute2, instance2.attribute2)
+
+    def test_load_list_returns_cached_instances_when_file_is_unchanged(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader)
+        file_path = f'{self.TEST_instance_DIR}/valid-list.json'
+        instance_list1 = cached_json_loader.load_list(file_path, DeserializableClass2)
+
+        # When
+        instance_list2 = cached_json_loader.load_list(file_path, DeserializableClass2)
+
+        # Then
+        json_loader.load_list.assert_called_once_with(file_path, DeserializableClass2)
+        self.assertEqual(instance_list1, instance_list2)
+        self.assertIsNot(instance_list1, instance_list2)
+        self.assertIs(instance_list1[0], instance_list2[0])
+
+    def test_load_list_returns_copied_instances_when_copy_is_enabled(self):
+        # Given
+        cached_json_loader = CachedJsonLoader(copy=True)
+        file_path = f'{self.TEST_instance_DIR}/valid-list.json'
+        instance_list1 = cached_json_loader.load_list(file_path, DeserializableClass2)
+
+        # When
+        instance_list2 = cached_json_loader.load_list(file_path, DeserializableClass2)
+
+        # Then
+        self.assertEqual(instance_list1, instance_list2)
+        self.assertIsNot(instance_list1[0], instance_list2[0])
+
+    def test_load_list_cache_hit_is_faster_than_uncached_load(self):
+        # Given
+        items = [
+            {
+                'attribute1': {'attribute1': index, 'attribute2': str(index)},
+                'attribute2': [{'attribute1': index, 'attribute2': 'x'}] * 3,
+            }
+            for index in range(20000)
+        ]
+        create_file(self.TEST_FILE, json.dumps(items))
+        cached_json_loader = CachedJsonLoader()
+        cached_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+        start = time.perf_counter()
+        expected = JsonLoader(JsonEngine.NATIVE).load_list(self.TEST_FILE, DeserializableClass2)
+        uncached_duration = time.perf_counter() - start
+
+        # When
+        start = time.perf_counter()
+        instances = cached_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+        cached_duration = time.perf_counter() - start
+
+        # Then
+        self.assertEqual(expected, instances)
+        self.assertLess(cached_duration * 10, uncached_duration)
+
+    def test_load_reloads_when_file_is_changed(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader)
+        cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+        create_file(self.TEST_FILE, '{"attribute1": null, "attribute2": []}')
+
+        # When
+        instance = cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(2, json_loader.load.call_count)
+        self.assertIsNone(instance.attribute1)
+
+    def test_load_returns_cached_instance_when_model_is_frozen(self):
+        # Given
+        cached_json_loader = CachedJsonLoader()
+        instance1 = cached_json_loader.load(self.TEST_FILE, FrozenClass)
+
+        # When
+        instance2 = cached_json_loader.load(self.TEST_FILE, FrozenClass)
+
+        # Then
+        self.assertIs(instance1, instance2)
+
+    def test_load_evicts_least_recently_used_entry(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader, max_size=1)
+        cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+        cached_json_loader.load(self.TEST_FILE, FrozenClass)
+
+        # When
+        cached_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(3, json_loader.load.call_count)
+
+    def test_load_does_not_cache_json_string(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        cached_json_loader = CachedJsonLoader(json_loader)
+        json_data = '{"attribute1": null, "attribute2": []}'
+
+        # When
+        cached_json_loader.load(json_data, DeserializableClass2)
+        cached_json_loader.load(json_data, DeserializableClass2)
+
+        # Then
+        self.assertEqual(2, json_loader.load.call_count)
+
+
+class JsonStreamingTest(TestCase):
+    TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/stream.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_iter_list_returns_same_instances_as_load_list(self):
+        # Given
+        expected = JsonLoader().load_list(f'{self.TEST_instance_DIR}/valid-list.json', DeserializableClass2)
+        json_loader = JsonLoader(read_size=7)
+
+        # When
+        instances = list(json_loader.iter_list(f'{self.TEST_instance_DIR}/valid-list.json', DeserializableClass2))
+
+        # Then
+        self.assertEqual(expected, instances)
+
+    def test_iter_list_returns_instances_from_minified_array(self):
+        # Given
+        items = [DeserializableClass1(attribute1=index, attribute2=str(index)) for index in range(100)]
+        create_file(self.TEST_FILE, '[' + ','.join(item.model_dump_json(exclude_none=True) for item in items) + ']')
+        json_loader = JsonLoader(read_size=16)
+
+        # When
+        instances = list(json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertEqual(items, instances)
+
+    def test_iter_list_returns_numbers_split_across_reads(self):
+        # Given
+        create_file(
+            self.TEST_FILE, '[{"attribute1": 12345, "attribute2": "a"}, {"attribute1": 67890, "attribute2": "b"}]'
+        )
+        json_loader = JsonLoader(read_size=1)
+
+        # When
+        instances = list(json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertEqual([12345, 67890], [instance.attribute1 for instance in instances])
+
+    def test_iter_list_returns_instances_from_ndjson(self):
+        # Given
+        create_file(self.TEST_FILE, '{"attribute1": 1, "attribute2": "a"}\n\n{"attribute1": 2, "attribute2": "b"}\n')
+        json_loader = JsonLoader(read_size=8)
+
+        # When
+        instances = list(json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertEqual([1, 2], [instance.attribute1 for instance in instances])
+
+    def test_iter_list_returns_nothing_when_array_is_empty(self):
+        # Given
+        create_file(self.TEST_FILE, ' [ ] ')
+        json_loader = JsonLoader()
+
+        # When
+        instances = list(json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertEqual([], instances)
+
+    def test_iter_list_raises_error_after_valid_items_when_item_is_schema_invalid(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"attribute1": 1, "attribute2": "a"}, {"attribute1": "x"}]')
+        json_loader = JsonLoader()
+        instances = json_loader.iter_list(self.TEST_FILE, DeserializableClass1)
+
+        # When
+        first = next(instances)
+
+        # Then
+        self.assertEqual(1, first.attribute1)
+        self.assertRaises(ValidationError, next, instances)
+
+    def test_iter_list_raises_decode_error_when_array_is_truncated(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"attribute1": 1, "attribute2": "a"}, {"attribute1": 2')
+        json_loader = JsonLoader(read_size=4)
+
+        # When
+        self.assertRaises(JSONDecodeError, list, json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        # Exception is raised
+
+    def test_iter_list_raises_decode_error_when_array_has_trailing_comma(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"attribute1": 1, "attribute2": "a"}, ]')
+        json_loader = JsonLoader(read_size=4)
+
+        # When
+        self.assertRaises(JSONDecodeError, list, json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertRaises(JSONDecodeError, json_loader.load_list, self.TEST_FILE, DeserializableClass1)
+
+    def test_iter_list_raises_decode_error_when_array_is_followed_by_extra_data(self):
+        for content in ['[{"attribute1": 1, "attribute2": "a"}] garbage', '[{"attribute1": 1, "attribute2": "a"}]]']:
+            with self.subTest(content=content):
+                # Given
+                create_file(self.TEST_FILE, content)
+                json_loader = JsonLoader(read_size=4)
+
+                # When
+                self.assertRaises(JSONDecodeError, list, json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+                # Then
+                self.assertRaises(JSONDecodeError, json_loader.load_list, self.TEST_FILE, DeserializableClass1)
+
+    def test_iter_list_returns_instances_when_array_is_followed_by_whitespace(self):
+        # Given
+        create_file(self.TEST_FILE, '[{"attribute1": 1, "attribute2": "a"}]' + ' \n' * 10)
+        json_loader = JsonLoader(read_size=4)
+
+        # When
+        instances = list(json_loader.iter_list(self.TEST_FILE, DeserializableClass1))
+
+        # Then
+        self.assertEqual([DeserializableClass1(attribute1=1, attribute2='a')], instances)
+
+    def test_iter_batches_returns_instances_in_batches(self):
+        # Given
+        items = [DeserializableClass1(attribute1=index, attribute2=str(index)) for index in range(5)]
+        create_file(self.TEST_FILE, '\n'.join(item.model_dump_json(exclude_none=True) for item in items))
+        json_loader = JsonLoader()
+
+        # When
+        batches = list(json_loader.iter_batches(self.TEST_FILE, DeserializableClass1, 2))
+
+        # Then
+        self.assertEqual([items[0:2], items[2:4], items[4:5]], batches)
+
+
+class SnapshotJsonLoaderTest(TestCase):
+    TEST_instance_DIR = f'{TEST_RESOURCE_ROOT}/config'
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/config/valid-list.json'
+    SNAPSHOT_DIR = f'{TEST_FILE_SYSTEM_ROOT}/snapshot'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+        copy_file(f'{self.TEST_instance_DIR}/valid-list.json', self.TEST_FILE)
+
+    def test_load_list_returns_snapshot_across_loader_instances(self):
+        # Given
+        expected = SnapshotJsonLoader(self.SNAPSHOT_DIR).load_list(self.TEST_FILE, DeserializableClass2)
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader)
+
+        # When
+        instances = snapshot_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(expected, instances)
+        json_loader.load_list.assert_not_called()
+
+    def test_load_returns_snapshot_separately_from_load_list(self):
+        # Given
+        copy_file(f'{self.TEST_instance_DIR}/valid-single.json', self.TEST_FILE)
+        SnapshotJsonLoader(self.SNAPSHOT_DIR).load(self.TEST_FILE, DeserializableClass2)
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader)
+
+        # When
+        instance = snapshot_json_loader.load(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(JsonLoader().load(self.TEST_FILE, DeserializableClass2), instance)
+        json_loader.load.assert_not_called()
+
+    def test_load_list_reloads_when_file_content_is_changed(self):
+        # Given
+        SnapshotJsonLoader(self.SNAPSHOT_DIR).load_list(self.TEST_FILE, DeserializableClass2)
+        create_file(self.TEST_FILE, '[{"attribute1": null, "attribute2": []}]')
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader)
+
+        # When
+        instances = snapshot_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual([DeserializableClass2(attribute1=None, attribute2=[])], instances)
+        self.assertEqual(1, json_loader.load_list.call_count)
+
+    def test_load_list_reloads_when_model_schema_is_changed(self):
+        # Given
+        SnapshotJsonLoader(self.SNAPSHOT_DIR).load_list(self.TEST_FILE, DeserializableClass2)
+        changed_model = create_model(
+            'DeserializableClass2', __module__=__name__, attribute1=(Optional[DeserializableClass1], None)
+        )
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader)
+
+        # When
+        snapshot_json_loader.load_list(self.TEST_FILE, changed_model)
+
+        # Then
+        self.assertEqual(1, json_loader.load_list.call_count)
+
+    def test_load_list_reloads_when_version_is_changed(self):
+        # Given
+        SnapshotJsonLoader(self.SNAPSHOT_DIR, version='1').load_list(self.TEST_FILE, DeserializableClass2)
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader, version='2')
+
+        # When
+        instances = snapshot_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(JsonLoader().load_list(self.TEST_FILE, DeserializableClass2), instances)
+        self.assertEqual(1, json_loader.load_list.call_count)
+
+    def test_load_list_bypasses_snapshot_when_model_schema_cannot_be_generated(self):
+        # Given
+        json_loader = MagicMock(spec=IJsonLoader, wraps=JsonLoader())
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR, json_loader)
+
+        # When
+        instances = snapshot_json_loader.load_list(self.TEST_FILE, CallbackClass)
+        snapshot_json_loader.load_list(self.TEST_FILE, CallbackClass)
+
+        # Then
+        self.assertEqual(JsonLoader().load_list(self.TEST_FILE, CallbackClass), instances)
+        self.assertEqual(2, json_loader.load_list.call_count)
+        self.assertFalse(os.path.exists(self.SNAPSHOT_DIR))
+
+    def test_load_list_reloads_when_snapshot_is_corrupted(self):
+        # Given
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR)
+        expected = snapshot_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+        for snapshot_file in os.listdir(self.SNAPSHOT_DIR):
+            create_file(f'{self.SNAPSHOT_DIR}/{snapshot_file}', 'corrupted')
+
+        # When
+        instances = snapshot_json_loader.load_list(self.TEST_FILE, DeserializableClass2)
+
+        # Then
+        self.assertEqual(expected, instances)
+
+    def test_load_does_not_snapshot_json_string(self):
+        # Given
+        snapshot_json_loader = SnapshotJsonLoader(self.SNAPSHOT_DIR)
+
+        # When
+        snapshot_json_loader.load('{"attribute1": null, "attribute2": []}', DeserializableClass2)
+
+        # Then
+        self.assertFalse(os.path.exists(self.SNAPSHOT_DIR))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,113 @@
+import json
+import os
+import unittest
+from typing import Optional, Iterator
+from unittest import TestCase
+
+from context_logger import setup_logging
+from pydantic import BaseModel
+
+from common_utility.fileUtility import delete_directory, create_file
+from common_utility.jsonLoader import JsonLoader
+from common_utility.jsonWriter import JsonWriter, JsonFormat
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+    parent: Optional['Item'] = None
+
+
+class JsonWriterTest(TestCase):
+    TEST_FILE = f'{TEST_FILE_SYSTEM_ROOT}/output/items.json'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+
+    def test_write_creates_file_loadable_by_json_loader(self):
+        # Given
+        instance = Item(id=1, name='item', parent=Item(id=0, name='parent'))
+        json_writer = JsonWriter(indent=2)
+
+        # When
+        json_writer.write(self.TEST_FILE, instance)
+
+        # Then
+        self.assertEqual(instance, JsonLoader().load(self.TEST_FILE, Item))
+
+    def test_write_list_creates_array_loadable_by_json_loader(self):
+        # Given
+        instances = [Item(id=index, name=str(index)) for index in range(10)]
+        json_writer = JsonWriter()
+
+        # When
+        count = json_writer.write_list(self.TEST_FILE, iter(instances))
+
+        # Then
+        self.assertEqual(10, count)
+        self.assertEqual(instances, JsonLoader().load_list(self.TEST_FILE, Item))
+
+    def test_write_list_creates_indented_array(self):
+        # Given
+        instances = [Item(id=index, name=str(index)) for index in range(3)]
+        json_writer = JsonWriter(indent=2, exclude_none=True)
+
+        # When
+        json_writer.write_list(self.TEST_FILE, instances)
+
+        # Then
+        with open(self.TEST_FILE) as json_file:
+            content = json_file.read()
+        self.assertEqual([item.model_dump(exclude_none=True) for item in instances], json.loads(content))
+        self.assertIn('\n  "id": 0', content)
+
+    def test_write_list_creates_empty_array(self):
+        # Given
+        json_writer = JsonWriter(indent=2)
+
+        # When
+        count = json_writer.write_list(self.TEST_FILE, [])
+
+        # Then
+        self.assertEqual(0, count)
+        self.assertEqual([], JsonLoader().load_list(self.TEST_FILE, Item))
+
+    def test_write_list_creates_ndjson(self):
+        # Given
+        instances = [Item(id=index, name=str(index)) for index in range(5)]
+        json_writer = JsonWriter(indent=2)
+
+        # When
+        json_writer.write_list(self.TEST_FILE, instances, JsonFormat.NDJSON)
+
+        # Then
+        with open(self.TEST_FILE) as json_file:
+            self.assertEqual(5, len(json_file.readlines()))
+        self.assertEqual(instances, list(JsonLoader().iter_list(self.TEST_FILE, Item)))
+
+    def test_write_list_keeps_previous_file_when_serialization_fails(self):
+        # Given
+        create_file(self.TEST_FILE, '[]')
+        json_writer = JsonWriter()
+
+        def generate_instances() -> Iterator[Item]:
+            yield Item(id=1, name='1')
+            raise ValueError('Generator failed')
+
+        # When
+        self.assertRaises(ValueError, json_writer.write_list, self.TEST_FILE, generate_instances())
+
+        # Then
+        with open(self.TEST_FILE) as json_file:
+            self.assertEqual('[]', json_file.read())
+        self.assertEqual(['items.json'], os.listdir(os.path.dirname(self.TEST_FILE)))
+
+
+if __name__ == '__main__':
+    unittest.main()
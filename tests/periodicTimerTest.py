@@ -0,0 +1,148 @@
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+
+from common_utility import PeriodicTimer, OverrunPolicy, TimerService
+from test_utility import wait_for_assertion
+
+
+class PeriodicTimerTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+
+    def test_start_fires_periodically_with_arguments(self):
+        # Given
+        mock = MagicMock()
+        timer = PeriodicTimer()
+
+        # When
+        timer.start(0.05, mock.test_method, args=[1], kwargs={'b': 2})
+
+        # Then
+        self.assertTrue(timer.is_alive())
+        wait_for_assertion(1, lambda: self.assertGreaterEqual(mock.test_method.call_count, 3))
+        mock.test_method.assert_called_with(1, b=2)
+        timer.cancel()
+
+    def test_ticks_do_not_drift_when_callback_is_slow(self):
+        # Given
+        ticks = []
+        timer = PeriodicTimer()
+
+        def on_tick() -> None:
+            ticks.append(time.monotonic())
+            sleep(0.04)
+
+        # When
+        timer.start(0.05, on_tick)
+        wait_for_assertion(2, lambda: self.assertGreaterEqual(len(ticks), 11))
+        timer.cancel()
+
+        # Then
+        self.assertAlmostEqual(0.5, ticks[10] - ticks[0], delta=0.1)
+
+    def test_skip_policy_drops_ticks_while_callback_runs(self):
+        # Given
+        mock = MagicMock(side_effect=lambda: sleep(0.12))
+        timer = PeriodicTimer(OverrunPolicy.SKIP)
+
+        # When
+        timer.start(0.05, mock)
+        sleep(0.53)
+        timer.cancel()
+
+        # Then
+        self.assertLessEqual(mock.call_count, 4)
+        self.assertGreater(timer.get_overruns(), 0)
+
+    def test_coalesce_policy_runs_once_after_overrun(self):
+        # Given
+        mock = MagicMock(side_effect=lambda: sleep(0.12))
+        timer = PeriodicTimer(OverrunPolicy.COALESCE)
+
+        # When
+        timer.start(0.05, mock)
+        sleep(0.53)
+        timer.cancel()
+
+        # Then
+        wait_for_assertion(1, lambda: self.assertFalse(timer.is_alive()))
+        self.assertIn(mock.call_count, (4, 5))
+
+    def test_queue_policy_runs_every_tick_on_executor(self):
+        # Given
+        mock = MagicMock(side_effect=lambda: sleep(0.08))
+        timer_service = TimerService()
+        timer = PeriodicTimer(OverrunPolicy.QUEUE, ThreadPoolExecutor(4), timer_service.create_timer())
+
+        # When
+        timer.start(0.05, mock)
+        sleep(0.52)
+        timer.cancel()
+
+        # Then
+        wait_for_assertion(1, lambda: self.assertFalse(timer.is_alive()))
+        self.assertGreaterEqual(mock.call_count, 9)
+        self.assertEqual(0, timer.get_overruns())
+        timer_service.shutdown()
+
+    def test_queue_policy_limits_outstanding_ticks_to_max_queued(self):
+        # Given
+        release = threading.Event()
+        mock = MagicMock(side_effect=lambda: release.wait(1))
+        timer = PeriodicTimer(OverrunPolicy.QUEUE, ThreadPoolExecutor(1), max_queued=2)
+
+        # When
+        timer.start(0.02, mock)
+        sleep(0.2)
+        timer.cancel()
+        release.set()
+
+        # Then
+        wait_for_assertion(1, lambda: self.assertFalse(timer.is_alive()))
+        self.assertEqual(2, mock.call_count)
+        self.assertGreater(timer.get_overruns(), 0)
+
+    def test_cancel(self):
+        # Given
+        mock = MagicMock()
+        timer = PeriodicTimer()
+        timer.start(0.1, mock.test_method)
+
+        # When
+        timer.cancel()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        sleep(0.2)
+        mock.test_method.assert_not_called()
+
+    def test_restart_after_cancel_does_not_fire(self):
+        # Given
+        mock = MagicMock()
+        timer = PeriodicTimer()
+        timer.start(0.1, mock.test_method)
+        timer.cancel()
+
+        # When
+        timer.restart()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        sleep(0.2)
+        mock.test_method.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from threading import Thread
+from unittest import TestCase
+
+from context_logger import setup_logging
+
+from common_utility import PooledSessionProvider, SessionPoolStats
+
+
+class TestRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '7')
+        self.end_headers()
+        self.wfile.write(b'content')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledSessionProviderTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), TestRequestHandler)
+        cls.server_url = f'http://127.0.0.1:{cls.server.server_port}'
+        Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        print()
+
+    def test_get_session_returns_same_session_in_same_thread(self):
+        # Given
+        session_provider = PooledSessionProvider()
+
+        # When
+        with session_provider.get_session() as session1:
+            pass
+        session2 = session_provider.get_session()
+
+        # Then
+        self.assertIs(session1, session2)
+        self.assertEqual(SessionPoolStats(1, 1, 0, 0), session_provider.get_stats())
+
+    def test_get_session_returns_different_session_in_other_thread(self):
+        # Given
+        session_provider = PooledSessionProvider()
+        sessions = []
+        thread = Thread(target=lambda: sessions.append(session_provider.get_session()))
+
+        # When
+        thread.start()
+        thread.join()
+        sessions.append(session_provider.get_session())
+
+        # Then
+        self.assertIsNot(sessions[0], sessions[1])
+
+    def test_get_session_returns_shared_session_when_not_thread_local(self):
+        # Given
+        session_provider = PooledSessionProvider(thread_local=False)
+        sessions = []
+        thread = Thread(target=lambda: sessions.append(session_provider.get_session()))
+
+        # When
+        thread.start()
+        thread.join()
+        sessions.append(session_provider.get_session())
+
+        # Then
+        self.assertIs(sessions[0], sessions[1])
+
+    def test_session_reuses_connection(self):
+        # Given
+        session_provider = PooledSessionProvider()
+
+        # When
+        for _ in range(3):
+            with session_provider.get_session() as session:
+                self.assertEqual(b'content', session.get(f'{self.server_url}/package1.deb').content)
+
+        # Then
+        self.assertEqual(SessionPoolStats(2, 1, 1, 3), session_provider.get_stats())
+
+    def test_close_shuts_down_sessions(self):
+        # Given
+        session_provider = PooledSessionProvider()
+        session1 = session_provider.get_session()
+
+        # When
+        session_provider.close()
+
+        # Then
+        session2 = session_provider.get_session()
+        self.assertIsNot(session1, session2)
+        self.assertEqual(SessionPoolStats(0, 2, 0, 0), session_provider.get_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import bz2
+import gzip
+import lzma
+import unittest
+from unittest import TestCase
+
+from common_utility import StreamDecompressor
+
+CONTENT = b'content' * 10000
+
+
+class StreamDecompressorTest(TestCase):
+
+    def setUp(self):
+        print()
+
+    def test_get_extension_returns_compression_extension(self):
+        self.assertEqual('.gz', StreamDecompressor.get_extension('package1.tar.gz'))
+        self.assertEqual('.xz', StreamDecompressor.get_extension('package1.tar.xz'))
+        self.assertEqual('.bz2', StreamDecompressor.get_extension('package1.tar.bz2'))
+        self.assertIsNone(StreamDecompressor.get_extension('package1.deb'))
+
+    def test_decompress_gzip_stream(self):
+        self._assert_decompressed('.gz', gzip.compress(CONTENT))
+
+    def test_decompress_xz_stream(self):
+        self._assert_decompressed('.xz', lzma.compress(CONTENT))
+
+    def test_decompress_bz2_stream(self):
+        self._assert_decompressed('.bz2', bz2.compress(CONTENT))
+
+    def test_decompress_concatenated_streams(self):
+        self._assert_decompressed('.gz', gzip.compress(CONTENT[:1000]) + gzip.compress(CONTENT[1000:]))
+
+    def test_finish_raises_error_when_stream_is_truncated(self):
+        # Given
+        decompressor = StreamDecompressor('.gz')
+        list(decompressor.decompress(gzip.compress(CONTENT)[:100]))
+
+        # When
+        self.assertRaises(EOFError, decompressor.finish)
+
+        # Then
+        # Exception raised
+
+    def _assert_decompressed(self, extension: str, compressed: bytes) -> None:
+        # Given
+        decompressor = StreamDecompressor(extension, max_length=1000)
+        output = []
+
+        # When
+        for chunk in [compressed[index:][:100] for index in range(0, len(compressed), 100)]:
+            output.extend(decompressor.decompress(chunk))
+        decompressor.finish()
+
+        # Then
+        self.assertTrue(all(len(data) <= 1000 for data in output))
+        self.assertEqual(CONTENT, b''.join(output))
+
+
+if __name__ == '__main__':
+    unittest.main()
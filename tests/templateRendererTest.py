@@ -0,0 +1,103 @@
+import os
+import unittest
+from unittest import TestCase
+
+from context_logger import setup_logging
+
+from common_utility import TemplateRenderer, delete_directory, create_file, render_template_file
+from tests import TEST_FILE_SYSTEM_ROOT
+
+
+class TemplateRendererTest(TestCase):
+    TEMPLATE_ROOT = f'{TEST_FILE_SYSTEM_ROOT}/templates'
+    OUTPUT_DIR = f'{TEST_FILE_SYSTEM_ROOT}/output'
+    BYTECODE_CACHE_DIR = f'{TEST_FILE_SYSTEM_ROOT}/cache'
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        delete_directory(TEST_FILE_SYSTEM_ROOT)
+        create_file(f'{self.TEMPLATE_ROOT}/device/config.j2', 'name={{ name }}\nport={{ port }}')
+
+    def test_render_returns_rendered_template(self):
+        # Given
+        template_renderer = TemplateRenderer()
+
+        # When
+        result = template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1', 'port': 80})
+
+        # Then
+        self.assertEqual('name=device1\nport=80\n', result)
+
+    def test_render_reuses_environment_and_compiled_template(self):
+        # Given
+        template_renderer = TemplateRenderer()
+        template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1', 'port': 80})
+        template = template_renderer._get_template(self.TEMPLATE_ROOT, 'device/config.j2')
+
+        # When
+        template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device2', 'port': 81})
+
+        # Then
+        self.assertEqual(1, len(template_renderer._environments))
+        self.assertIs(template, template_renderer._get_template(self.TEMPLATE_ROOT, 'device/config.j2'))
+
+    def test_render_reloads_changed_template(self):
+        # Given
+        template_renderer = TemplateRenderer()
+        template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1', 'port': 80})
+        template_path = f'{self.TEMPLATE_ROOT}/device/config.j2'
+        create_file(template_path, 'device={{ name }}')
+        mtime = os.path.getmtime(template_path) + 1
+        os.utime(template_path, (mtime, mtime))
+
+        # When
+        result = template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1'})
+
+        # Then
+        self.assertEqual('device=device1\n', result)
+
+    def test_render_writes_bytecode_cache(self):
+        # Given
+        template_renderer = TemplateRenderer(self.BYTECODE_CACHE_DIR)
+
+        # When
+        template_renderer.render(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1', 'port': 80})
+
+        # Then
+        self.assertEqual(1, len(os.listdir(self.BYTECODE_CACHE_DIR)))
+        result = TemplateRenderer(self.BYTECODE_CACHE_DIR).render(
+            self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device2', 'port': 81}
+        )
+        self.assertEqual('name=device2\nport=81\n', result)
+
+    def test_render_files_writes_output_per_context(self):
+        # Given
+        template_renderer = TemplateRenderer()
+        contexts = {
+            f'{self.OUTPUT_DIR}/device{index}.conf': {'name': f'device{index}', 'port': index} for index in range(3)
+        }
+
+        # When
+        output_files = template_renderer.render_files(self.TEMPLATE_ROOT, 'device/config.j2', contexts)
+
+        # Then
+        self.assertEqual(list(contexts), output_files)
+        for index in range(3):
+            with open(f'{self.OUTPUT_DIR}/device{index}.conf') as output_file:
+                self.assertEqual(f'name=device{index}\nport={index}\n', output_file.read())
+        self.assertEqual(3, len(os.listdir(self.OUTPUT_DIR)))
+
+    def test_render_template_file_returns_rendered_template(self):
+        # When
+        result = render_template_file(self.TEMPLATE_ROOT, 'device/config.j2', {'name': 'device1', 'port': 80})
+
+        # Then
+        self.assertEqual('name=device1\nport=80\n', result)
+
+
+if __name__ == '__main__':
+    unittest.main()
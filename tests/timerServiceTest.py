@@ -0,0 +1,178 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from context_logger import setup_logging
+
+from common_utility import TimerService
+from test_utility import wait_for_assertion
+
+
+class TimerServiceTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        setup_logging('python-common-utility', 'DEBUG', warn_on_overwrite=False)
+
+    def setUp(self):
+        print()
+        self.timer_service = TimerService()
+
+    def tearDown(self):
+        self.timer_service.shutdown()
+
+    def test_start(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+
+        # When
+        timer.start(0.2, mock.test_method, args=[1], kwargs={'b': 2, 'c': 3})
+
+        # Then
+        self.assertTrue(timer.is_alive())
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 1, b=2, c=3)
+        wait_for_assertion(1, lambda: self.assertFalse(timer.is_alive()))
+
+    def test_restart_after_fired(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+        timer.start(0.1, mock.test_method, args=[1])
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 1)
+        mock.reset_mock()
+
+        # When
+        timer.restart()
+
+        # Then
+        self.assertTrue(timer.is_alive())
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 1)
+
+    def test_restart_postpones_armed_timer(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+        timer.start(0.3, mock.test_method)
+
+        # When
+        for _ in range(5):
+            sleep(0.1)
+            timer.restart()
+
+        # Then
+        mock.test_method.assert_not_called()
+        wait_for_assertion(1, mock.test_method.assert_called_once_with)
+
+    def test_start_with_shorter_interval_fires_earlier(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+        timer.start(10, mock.test_method, args=['long'])
+
+        # When
+        timer.start(0.1, mock.test_method, args=['short'])
+
+        # Then
+        wait_for_assertion(1, mock.test_method.assert_called_once_with, 'short')
+
+    def test_cancel(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+        timer.start(0.2, mock.test_method)
+
+        # When
+        timer.cancel()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        sleep(0.3)
+        mock.test_method.assert_not_called()
+
+    def test_restart_after_cancel_does_not_fire(self):
+        # Given
+        mock = MagicMock()
+        timer = self.timer_service.create_timer()
+        timer.start(0.1, mock.test_method)
+        timer.cancel()
+
+        # When
+        timer.restart()
+
+        # Then
+        self.assertFalse(timer.is_alive())
+        sleep(0.2)
+        mock.test_method.assert_not_called()
+
+    def test_fires_many_timers_in_deadline_order_on_single_thread(self):
+        # Given
+        fired = []
+        threads = set()
+        thread_count = threading.active_count()
+
+        def on_fire(index: int) -> None:
+            fired.append(index)
+            threads.add(threading.current_thread())
+
+        timers = [self.timer_service.create_timer() for _ in range(50)]
+
+        # When
+        for index, timer in enumerate(timers):
+            timer.start(0.2 + (49 - index) * 0.01, on_fire, args=[index])
+
+        # Then
+        self.assertLessEqual(threading.active_count(), thread_count + 1)
+        wait_for_assertion(2, lambda: self.assertEqual(50, len(fired)))
+        self.assertEqual(list(reversed(range(50))), fired)
+        self.assertEqual(1, len(threads))
+
+    def test_dispatches_to_executor(self):
+        # Given
+        executor = ThreadPoolExecutor(1, thread_name_prefix='TimerExecutor')
+        timer_service = TimerService(executor)
+        mock = MagicMock()
+        mock.test_method.side_effect = lambda: mock.thread(threading.current_thread().name)
+        timer = timer_service.create_timer()
+
+        # When
+        timer.start(0.1, mock.test_method)
+
+        # Then
+        wait_for_assertion(1, mock.thread.assert_called_once)
+        self.assertTrue(mock.thread.call_args[0][0].startswith('TimerExecutor'))
+        timer_service.shutdown()
+        executor.shutdown()
+
+    def test_keeps_firing_when_function_fails(self):
+        # Given
+        mock = MagicMock()
+        failing_timer = self.timer_service.create_timer()
+        timer = self.timer_service.create_timer()
+
+        # When
+        failing_timer.start(0.05, MagicMock(side_effect=ValueError('Timer failed')))
+        timer.start(0.1, mock.test_method)
+
+        # Then
+        wait_for_assertion(1, mock.test_method.assert_called_once_with)
+
+    def test_compacts_stale_entries(self):
+        # Given
+        timer_service = TimerService(compact_threshold=10)
+        timer = timer_service.create_timer()
+
+        # When
+        for index in range(100):
+            timer.start(100 - index, MagicMock())
+
+        # Then
+        self.assertLess(len(timer_service._queue), 30)
+        timer_service.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()